@@ -3,4 +3,6 @@ Pycdlib is a pure python library to parse, write (master), and create ISO9660
 files.  These files are suitable for writing to a CD or USB.
 '''
 from .pycdlib import PyCdlib  # NOQA
+from .pycdlib import PyCdlibEntry  # NOQA
 from .pycdlib import PyCdlibIO  # NOQA
+from .pycdlib import PyCdlibStats  # NOQA
@@ -0,0 +1,242 @@
+# Copyright (C) 2026  Chris Lalancette <clalancette@gmail.com>
+
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation;
+# version 2.1 of the License.
+
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+
+'''
+Classes to read an ISO out of a range-read backend.
+
+A backend is any object with a read_at(offset, length) method, returning up to
+length bytes starting at byte offset (fewer only at the end of the ISO), and a
+size() method, returning the length of the ISO in bytes.
+'''
+
+from __future__ import absolute_import
+
+import collections
+import io
+import os
+
+import pycdlib.pycdlibexception as pycdlibexception
+
+
+class FileRangeReader(object):
+    '''
+    A class that implements the backend interface on top of a seekable file
+    object.
+    '''
+    __slots__ = ('_fp',)
+
+    def __init__(self, fp):
+        self._fp = fp
+
+    def read_at(self, offset, length):
+        '''
+        A method to read data from the file.
+
+        Parameters:
+         offset - The byte offset to start reading at.
+         length - The number of bytes to read.
+        Returns:
+         The data that was read.
+        '''
+        self._fp.seek(offset)
+        return self._fp.read(length)
+
+    def size(self):
+        '''
+        A method to get the length of the file.
+
+        Parameters:
+         None.
+        Returns:
+         The length of the file in bytes.
+        '''
+        self._fp.seek(0, os.SEEK_END)
+        return self._fp.tell()
+
+
+class CachedRangeFile(io.RawIOBase):
+    '''
+    A class that presents a backend as a read-only, seekable file object.
+    Data is fetched from the backend in whole blocks which are kept in a least
+    recently used cache.  When a read misses the cache at or just past the end
+    of the previous miss, the number of blocks fetched past the end of the read
+    is doubled (up to read_ahead), so that sequential reads (and reads that
+    skip forward over a few blocks at a time) turn into a few large backend
+    reads.
+    '''
+    __slots__ = ('_reader', '_block_size', '_cache_blocks', '_read_ahead',
+                 '_window', '_next_miss', '_blocks', '_size', '_pos',
+                 'backend_reads')
+
+    def __init__(self, reader, block_size=65536, cache_blocks=256,
+                 read_ahead=16):
+        super(CachedRangeFile, self).__init__()
+        if block_size < 512 or block_size & (block_size - 1):
+            raise pycdlibexception.PyCdlibInvalidInput('The block size must be a power of 2 of at least 512')
+        if cache_blocks < 1:
+            raise pycdlibexception.PyCdlibInvalidInput('The cache must hold at least one block')
+        if read_ahead < 0:
+            raise pycdlibexception.PyCdlibInvalidInput('The read ahead must not be negative')
+
+        self._reader = reader
+        self._block_size = block_size
+        self._cache_blocks = cache_blocks
+        self._read_ahead = read_ahead
+        self._window = 0
+        self._next_miss = -1
+        self._blocks = collections.OrderedDict()
+        self._size = reader.size()
+        self._pos = 0
+        self.backend_reads = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        if whence == os.SEEK_SET:
+            pos = offset
+        elif whence == os.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == os.SEEK_END:
+            pos = self._size + offset
+        else:
+            raise pycdlibexception.PyCdlibInvalidInput('Invalid value for whence (options are 0, 1, and 2)')
+
+        if pos < 0:
+            raise pycdlibexception.PyCdlibInvalidInput('Invalid offset value (must be positive)')
+
+        self._pos = pos
+        return self._pos
+
+    def tell(self):
+        return self._pos
+
+    def _fetch(self, first, last):
+        '''
+        An internal method to read a run of blocks that are missing from the
+        cache, plus any read ahead, from the backend.
+
+        Parameters:
+         first - The first block to read.
+         last - The last block to read (inclusive).
+        Returns:
+         A dictionary mapping the block numbers in first to last to their data.
+        '''
+        if 0 <= first - self._next_miss <= self._window:
+            self._window = min(max(self._window * 2, 1), self._read_ahead)
+        else:
+            self._window = 0
+
+        end_block = last + 1 + self._window
+        end = min(end_block * self._block_size, self._size)
+        data = self._reader.read_at(first * self._block_size,
+                                    end - first * self._block_size)
+        self.backend_reads += 1
+        self._next_miss = end_block
+
+        # A run that would push everything else out of the cache is handed
+        # back without being cached.
+        cache = last - first < self._cache_blocks // 2
+
+        fetched = {}
+        block = first
+        for offset in range(0, len(data), self._block_size):
+            block_data = data[offset:offset + self._block_size]
+            if block <= last:
+                fetched[block] = block_data
+            if cache and block not in self._blocks:
+                self._blocks[block] = block_data
+                if len(self._blocks) > self._cache_blocks:
+                    self._blocks.popitem(last=False)
+            block += 1
+
+        return fetched
+
+    def read_at(self, offset, length):
+        '''
+        A method to read data through the cache without moving the file
+        position.
+
+        Parameters:
+         offset - The byte offset to start reading at.
+         length - The number of bytes to read.
+        Returns:
+         The data that was read, which is shorter than length only at the
+         end of the ISO.
+        '''
+        length = min(length, self._size - offset)
+        if length <= 0:
+            return b''
+
+        first = offset // self._block_size
+        last = (offset + length - 1) // self._block_size
+
+        # Take the cached blocks up front, since fetching a missing run can
+        # push the cached blocks after it out of the cache.
+        cached = {}
+        for block in range(first, last + 1):
+            block_data = self._blocks.pop(block, None)
+            if block_data is not None:
+                self._blocks[block] = block_data
+                cached[block] = block_data
+
+        pieces = []
+        missing_start = None
+        for block in range(first, last + 2):
+            if block <= last and block not in cached:
+                if missing_start is None:
+                    missing_start = block
+                continue
+
+            if missing_start is not None:
+                fetched = self._fetch(missing_start, block - 1)
+                for missed in range(missing_start, block):
+                    pieces.append(fetched.get(missed, b''))
+                missing_start = None
+
+            if block <= last:
+                pieces.append(cached[block])
+
+        # Only the parts of the first and last blocks that were asked for are
+        # copied, and nothing is joined when the read fits in one block.
+        start = offset - first * self._block_size
+        if first == last:
+            return pieces[0][start:start + length]
+        pieces[0] = pieces[0][start:]
+        pieces[-1] = pieces[-1][:offset + length - last * self._block_size]
+        return b''.join(pieces)
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = self._size - self._pos
+        data = self.read_at(self._pos, size)
+        self._pos += len(data)
+        return data
+
+    def readall(self):
+        return self.read()
+
+    def readinto(self, b):
+        data = self.read(len(b))
+        b[:len(data)] = data
+        return len(data)
+
+    def close(self):
+        self._blocks.clear()
+        super(CachedRangeFile, self).close()
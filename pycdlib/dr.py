@@ -108,6 +108,35 @@ class XARecord(object):
         return 14
 
 
+def _collation_key(file_ident):
+    '''
+    An internal function to compute the key that a Directory Record with the
+    given identifier sorts by within its parent.  Here we use the ISO9660
+    sorting order which is essentially:
+
+    1.  The \\x00 is always the 'dot' record, and is always first.
+    2.  The \\x01 is always the 'dotdot' record, and is always second.
+    3.  Other entries are sorted lexically; this does not exactly match
+        the sorting method specified in Ecma-119, but does OK for now.
+
+    Ecma-119 Section 9.3 specifies that we need to pad out the shorter of
+    the two files with 0x20 (spaces), then compare byte-by-byte until
+    they differ.  However, we can more easily just do the string equality
+    comparison, since it will always be the case that 0x20 will be less
+    than any of the other allowed characters in the strings.
+
+    Parameters:
+     file_ident - The identifier of the Directory Record.
+    Returns:
+     A tuple that compares in the ISO9660 sorting order.
+    '''
+    if file_ident == b'\x00':
+        return (0, b'')
+    if file_ident == b'\x01':
+        return (1, b'')
+    return (2, file_ident)
+
+
 class DirectoryRecord(object):
     '''
     A class that represents an ISO9660 directory record.
@@ -118,7 +147,9 @@ class DirectoryRecord(object):
                  'index_in_parent', 'dr_len', 'xattr_len', 'file_flags',
                  'file_unit_size', 'interleave_gap_size', 'len_fi', 'isdir',
                  'orig_extent_loc', 'data_length', 'seqnum', 'is_root',
-                 'parent', 'rock_ridge', 'xa_record', 'file_ident')
+                 'parent', 'rock_ridge', 'xa_record', 'file_ident',
+                 'name_index', 'rr_name_index', 'sort_key', 'child_keys',
+                 'rr_child_names')
 
     FILE_FLAG_EXISTENCE_BIT = 0
     FILE_FLAG_DIRECTORY_BIT = 1
@@ -139,6 +170,11 @@ class DirectoryRecord(object):
         self.data_continuation = None
         self.children = []
         self.rr_children = []
+        self.name_index = None
+        self.rr_name_index = None
+        self.sort_key = None
+        self.child_keys = None
+        self.rr_child_names = None
         self.index_in_parent = None
         self.is_root = False
         self.isdir = False
@@ -215,9 +251,11 @@ class DirectoryRecord(object):
             if self.file_ident != b'\x00':
                 self.file_ident = b'\x00'
             self.isdir = True
+            self.sort_key = _collation_key(self.file_ident)
         else:
             record_offset = 33
             self.file_ident = record[record_offset:record_offset + self.len_fi]
+            self.sort_key = _collation_key(self.file_ident)
             record_offset += self.len_fi
             if self.file_flags & (1 << self.FILE_FLAG_DIRECTORY_BIT):
                 self.isdir = True
@@ -368,6 +406,7 @@ class DirectoryRecord(object):
         self.data_length = length
 
         self.file_ident = name
+        self.sort_key = _collation_key(name)
 
         self.isdir = isdir
 
@@ -642,7 +681,9 @@ class DirectoryRecord(object):
         # of a duplicate child.  Thus, to check for duplicates we only need to
         # see if the child to be added is a duplicate with the entry that
         # bisect_left returned.
-        index = bisect.bisect_left(self.children, child)
+        if self.child_keys is None:
+            self.child_keys = [c.sort_key for c in self.children]
+        index = bisect.bisect_left(self.child_keys, child.sort_key)
         if index != len(self.children) and self.children[index].file_ident == child.file_ident:
             if not self.children[index].is_associated_file() and not child.is_associated_file():
                 if not (self.rock_ridge is not None and self.file_identifier() == b'RR_MOVED'):
@@ -652,19 +693,25 @@ class DirectoryRecord(object):
                         self.children[index].data_continuation = child
                         index += 1
         self.children.insert(index, child)
+        self.child_keys.insert(index, child.sort_key)
+
+        # Keep the name index (if it has been built) pointing at the first
+        # child with each name, which is what a binary search would find.
+        if self.name_index is not None and index >= 2:
+            if self.children[index - 1].file_ident != child.file_ident:
+                self.name_index[child.file_ident] = child
 
         if child.rock_ridge is not None and not child.is_dot() and not child.is_dotdot():
-            lo = 0
-            hi = len(self.rr_children)
-            while lo < hi:
-                mid = (lo + hi) // 2
-                if self.rr_children[mid].rock_ridge.name() < child.rock_ridge.name():
-                    lo = mid + 1
-                else:
-                    hi = mid
-            rr_index = lo
+            if self.rr_child_names is None:
+                self.rr_child_names = [c.rock_ridge.name() for c in self.rr_children]
+            rr_name = child.rock_ridge.name()
+            rr_index = bisect.bisect_left(self.rr_child_names, rr_name)
 
             self.rr_children.insert(rr_index, child)
+            self.rr_child_names.insert(rr_index, rr_name)
+
+            if self.rr_name_index is not None:
+                self.rr_name_index[rr_name] = child
 
         # We now have to check if we need to add another logical block.
         # We have to iterate over the entire list again, because where we
@@ -674,10 +721,29 @@ class DirectoryRecord(object):
                                                                            logical_block_size)
 
         overflowed = False
-        if check_overflow and (num_extents * logical_block_size > self.data_length):
-            overflowed = True
+        if check_overflow:
+            overflowed = self._extend_data_length(num_extents, logical_block_size) > 0
+
+        return overflowed
+
+    def _extend_data_length(self, num_extents, logical_block_size):
+        '''
+        Internal method to grow this directory record until it is large enough
+        to hold the given number of extents of children.
+
+        Parameters:
+         num_extents - The number of extents that the children need.
+         logical_block_size - The size of a logical block for this volume descriptor.
+        Returns:
+         The number of extents that the directory record grew by.
+        '''
+        num_added = 0
+        while num_extents * logical_block_size > self.data_length:
             # When we overflow our data length, we always add a full block.
             self.data_length += logical_block_size
+            num_added += 1
+
+        if num_added > 0:
             # We also have to make sure to update the length of the dot child,
             # as that should always reflect the length.
             self.children[0].data_length = self.data_length
@@ -694,7 +760,7 @@ class DirectoryRecord(object):
                 if len(c.children) > 1:
                     c.children[1].data_length = self.data_length
 
-        return overflowed
+        return num_added
 
     def add_child(self, child, logical_block_size, allow_duplicate=False):
         '''
@@ -714,6 +780,72 @@ class DirectoryRecord(object):
 
         return self._add_child(child, logical_block_size, allow_duplicate, True)
 
+    def add_children(self, children, logical_block_size):
+        '''
+        A method to add many new file children to this directory record at
+        once.  The children are merged into the sorted lists of children with
+        a single sort, and their extents and offsets are calculated in a single
+        pass, rather than once per child as add_child() does.  A child may only
+        have the same name as the child before it if it holds the rest of that
+        child's data (that is, it is that child's data continuation).
+
+        Parameters:
+         children - The list of new child directory record objects, in order.
+         logical_block_size - The size of a logical block for this volume descriptor.
+        Returns:
+         The number of extents that this directory record grew by to fit the
+         new children.
+        '''
+        if not self._initialized:
+            raise pycdlibexception.PyCdlibInternalError('Directory Record not yet initialized')
+
+        if not self.isdir:
+            raise pycdlibexception.PyCdlibInvalidInput('Trying to add a child to a record that is not a directory')
+
+        if not children:
+            return 0
+
+        # The sort is stable, so children with the same name stay in the order
+        # they were added in, after any existing child with that name.
+        merged = self.children + children
+        merged.sort(key=lambda c: c.sort_key)
+
+        new_ids = set([id(c) for c in children])
+        first_new = None
+        for index, child in enumerate(merged):
+            if id(child) not in new_ids:
+                continue
+            if first_new is None:
+                first_new = index
+            prev = merged[index - 1]
+            if prev.file_ident != child.file_ident or prev.data_continuation is child:
+                continue
+            if prev.is_associated_file() or child.is_associated_file():
+                continue
+            if self.rock_ridge is not None and self.file_identifier() == b'RR_MOVED':
+                continue
+            raise pycdlibexception.PyCdlibInvalidInput('Failed adding duplicate name to parent')
+
+        self.children[:] = merged
+        self.child_keys = [c.sort_key for c in self.children]
+        self.name_index = None
+
+        new_rr_children = [c for c in children if c.rock_ridge is not None]
+        if new_rr_children:
+            if self.rr_child_names is None:
+                self.rr_child_names = [c.rock_ridge.name() for c in self.rr_children]
+            records = self.rr_children + new_rr_children
+            names = self.rr_child_names + [c.rock_ridge.name() for c in new_rr_children]
+            order = sorted(range(len(records)), key=names.__getitem__)
+            self.rr_children[:] = [records[i] for i in order]
+            self.rr_child_names = [names[i] for i in order]
+            self.rr_name_index = None
+
+        num_extents, offset_unused = self._recalculate_extents_and_offsets(first_new,
+                                                                           logical_block_size)
+
+        return self._extend_data_length(num_extents, logical_block_size)
+
     def track_child(self, child, logical_block_size, allow_duplicate=False):
         '''
         A method to track an existing child of this directory record.
@@ -761,6 +893,33 @@ class DirectoryRecord(object):
                     self.children[0].rock_ridge.remove_from_file_links()
 
         del self.children[index]
+        if self.child_keys is not None:
+            del self.child_keys[index]
+
+        if self.name_index is not None and self.name_index.get(child.file_ident) is child:
+            if index < len(self.children) and self.children[index].file_ident == child.file_ident:
+                self.name_index[child.file_ident] = self.children[index]
+            else:
+                del self.name_index[child.file_ident]
+
+        if child.rock_ridge is not None and not child.is_dot() and not child.is_dotdot():
+            if self.rr_child_names is None:
+                self.rr_child_names = [c.rock_ridge.name() for c in self.rr_children]
+            # Children with the same Rock Ridge name are next to each other, so
+            # only those have to be checked for the one being removed.
+            rr_name = child.rock_ridge.name()
+            rr_index = bisect.bisect_left(self.rr_child_names, rr_name)
+            while rr_index < len(self.rr_children) and self.rr_child_names[rr_index] == rr_name:
+                if self.rr_children[rr_index] is child:
+                    del self.rr_children[rr_index]
+                    del self.rr_child_names[rr_index]
+                    if self.rr_name_index is not None and self.rr_name_index.get(rr_name) is child:
+                        if rr_index < len(self.rr_children) and self.rr_child_names[rr_index] == rr_name:
+                            self.rr_name_index[rr_name] = self.rr_children[rr_index]
+                        else:
+                            del self.rr_name_index[rr_name]
+                    break
+                rr_index += 1
 
         # We now have to check if we need to remove a logical block.
         # We have to iterate over the entire list again, because where we
@@ -792,6 +951,50 @@ class DirectoryRecord(object):
 
         return underflow
 
+    def lookup_child(self, name):
+        '''
+        A method to find the child of this Directory Record with the given
+        file identifier.  The first time this is called, an index of the
+        children by name is built; after that, the index is kept up to date as
+        children are added and removed.
+
+        Parameters:
+         name - The file identifier to look for.
+        Returns:
+         The first child (other than dot and dotdot) with this file identifier,
+         or None if there is no such child.
+        '''
+        if self.name_index is None:
+            name_index = {}
+            for child in self.children[2:]:
+                if child.file_ident not in name_index:
+                    name_index[child.file_ident] = child
+            self.name_index = name_index
+
+        return self.name_index.get(name)
+
+    def lookup_rr_child(self, name):
+        '''
+        A method to find the child of this Directory Record with the given
+        Rock Ridge name.  As with lookup_child(), an index is built the first
+        time this is called and kept up to date after that.
+
+        Parameters:
+         name - The Rock Ridge name to look for.
+        Returns:
+         The first child with this Rock Ridge name, or None if there is no such
+         child.
+        '''
+        if self.rr_name_index is None:
+            rr_name_index = {}
+            for child in self.rr_children:
+                rr_name = child.rock_ridge.name()
+                if rr_name not in rr_name_index:
+                    rr_name_index[rr_name] = child
+            self.rr_name_index = rr_name_index
+
+        return self.rr_name_index.get(name)
+
     def is_dir(self):
         '''
         A method to determine whether this Directory Record is a directory.
@@ -1070,34 +1273,10 @@ class DirectoryRecord(object):
     def __lt__(self, other):
         # This method is used for the bisect.insort_left() when adding a child.
         # It needs to return whether self is less than other.  Here we use the
-        # ISO9660 sorting order which is essentially:
-        #
-        # 1.  The \x00 is always the 'dot' record, and is always first.
-        # 2.  The \x01 is always the 'dotdot' record, and is always second.
-        # 3.  Other entries are sorted lexically; this does not exactly match
-        #     the sorting method specified in Ecma-119, but does OK for now.
-        #
-        # Ecma-119 Section 9.3 specifies that we need to pad out the shorter of
-        # the two files with 0x20 (spaces), then compare byte-by-byte until
-        # they differ.  However, we can more easily just do the string equality
-        # comparison, since it will always be the case that 0x20 will be less
-        # than any of the other allowed characters in the strings.
-        if self.file_ident == b'\x00':
-            if other.file_ident == b'\x00':
-                return False
-            return True
-        if other.file_ident == b'\x00':
-            return False
-
-        if self.file_ident == b'\x01':
-            if other.file_ident == b'\x00':
-                return False
-            return True
-
-        if other.file_ident == b'\x01':
-            # If self.file_ident was '\x00', it would have been caught above.
-            return False
-        return self.file_ident < other.file_ident
+        # ISO9660 sorting order; see _collation_key() for the details.  The
+        # key is computed once when the identifier is set, so that the
+        # directory code can compare the keys directly.
+        return self.sort_key < other.sort_key
 
     def __ne__(self, other):
         # Note that we very specifically do not check the extent_location when comparing
@@ -0,0 +1,271 @@
+# Copyright (C) 2026  Chris Lalancette <clalancette@gmail.com>
+
+# This library is free software; you can redistribute it and/or
+# modify it under the terms of the GNU Lesser General Public
+# License as published by the Free Software Foundation;
+# version 2.1 of the License.
+
+# This library is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+
+# You should have received a copy of the GNU Lesser General Public
+# License along with this library; if not, write to the Free Software
+# Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston, MA  02110-1301  USA
+
+'''
+Functions to build flat listings of the contents of many ISOs at once.
+'''
+
+from __future__ import absolute_import
+
+import collections
+import multiprocessing
+import os
+import sys
+
+import pycdlib.pycdlib as pycdlibmod
+import pycdlib.pycdlibexception as pycdlibexception
+import pycdlib.utils as utils
+
+# One entry in the listing of an ISO.  The namespace is one of 'iso9660',
+# 'rr' (the ISO9660 tree of a Rock Ridge ISO, listed with the Rock Ridge
+# names), 'joliet', or 'udf'.  The path is the absolute path in that
+# namespace, extent is the extent of the data (or directory) on the ISO, mode
+# is the POSIX mode (None for the 'iso9660' and 'joliet' namespaces), and mtime
+# is the modification time in seconds since the epoch (None if unknown).
+IndexEntry = collections.namedtuple('IndexEntry',
+                                    ['namespace', 'path', 'is_dir', 'size',
+                                     'extent', 'mode', 'mtime'])
+
+# The listing of one ISO.  If the ISO could not be opened, entries is empty and
+# error holds a description of the problem; otherwise error is None.
+ISOIndex = collections.namedtuple('ISOIndex',
+                                  ['filename', 'size', 'entries', 'error'])
+
+
+def _decode_name(name, encoding):
+    '''
+    An internal function to decode a file identifier into a native string.
+    Bytes that are not valid in the encoding are replaced rather than
+    failing the listing of the whole ISO.
+
+    Parameters:
+     name - The file identifier to decode.
+     encoding - The encoding that the file identifier is in.
+    Returns:
+     The decoded name.
+    '''
+    if sys.version_info >= (3, 0):
+        return name.decode(encoding, 'replace')
+    return name.decode(encoding, 'replace').encode('utf-8')
+
+
+def _index_dirrecords(root, namespace, encoding):
+    '''
+    An internal function to list the entries below an ISO9660 or Joliet root
+    Directory Record.
+
+    Parameters:
+     root - The root Directory Record.
+     namespace - The namespace to record in the entries.
+     encoding - The encoding of the file identifiers.
+    Returns:
+     A list of IndexEntry objects.
+    '''
+    use_rr = namespace == 'rr'
+    entries = []
+    dirs = collections.deque([('', root)])
+    while dirs:
+        (dirpath, dir_record) = dirs.popleft()
+
+        last = None
+        for child in dir_record.children:
+            if child.is_dot() or child.is_dotdot():
+                continue
+
+            fi = child.file_identifier()
+            if fi == last:
+                # A file larger than 4GB is stored as several Directory Records
+                # with the same name, one for each extent.
+                entry = entries[-1]
+                entries[-1] = entry._replace(size=entry.size + child.get_data_length())
+                continue
+            last = fi
+
+            rr = child.rock_ridge if use_rr else None
+            if rr is not None and rr.child_link_record_exists() and rr.cl_to_moved_dr is not None:
+                # This directory was relocated; list the directory it was
+                # relocated to in its place, as walk() does.
+                child = rr.cl_to_moved_dr
+
+            name = fi
+            mode = None
+            if rr is not None:
+                name = child.rock_ridge.name()
+                try:
+                    mode = child.rock_ridge.get_file_mode()
+                except pycdlibexception.PyCdlibInvalidInput:
+                    pass
+
+            path = dirpath + '/' + _decode_name(name, encoding)
+            is_dir = child.is_dir()
+            entries.append(IndexEntry(namespace, path, is_dir,
+                                      child.get_data_length(),
+                                      child.extent_location(), mode,
+                                      utils.dr_date_to_epoch(child.date)))
+            if is_dir:
+                dirs.append((path, child))
+
+    return entries
+
+
+def _index_udf(root):
+    '''
+    An internal function to list the entries below the UDF root File Entry.
+
+    Parameters:
+     root - The root UDFFileEntry.
+    Returns:
+     A list of IndexEntry objects.
+    '''
+    entries = []
+    dirs = collections.deque([('', root)])
+    while dirs:
+        (dirpath, file_entry) = dirs.popleft()
+
+        for fi_desc in file_entry.fi_descs:
+            child = fi_desc.file_entry
+            if fi_desc.is_parent() or child is None:
+                continue
+
+            path = dirpath + '/' + _decode_name(fi_desc.fi, fi_desc.encoding)
+            is_dir = child.is_dir()
+            if child.inode is not None:
+                extent = child.inode.extent_location()
+            else:
+                extent = child.extent_location()
+            entries.append(IndexEntry('udf', path, is_dir,
+                                      child.get_data_length(), extent,
+                                      utils.udf_file_entry_mode(child),
+                                      utils.udf_timestamp_to_epoch(child.mod_time)))
+            if is_dir:
+                dirs.append((path, child))
+
+    return entries
+
+
+def index_iso(filename, namespaces=None, verify_redundant=True):
+    '''
+    Build a flat listing of the contents of an ISO.
+
+    Parameters:
+     filename - The filename of the ISO to list.
+     namespaces - An iterable of the namespaces to list, from 'iso9660'
+                  (listed as 'rr' on a Rock Ridge ISO), 'joliet', and 'udf';
+                  None (the default) lists all of them.
+     verify_redundant - As for PyCdlib.open().
+    Returns:
+     An ISOIndex object.
+    '''
+    try:
+        with open(filename, 'rb') as fp:
+            fp.seek(0, os.SEEK_END)
+            size = fp.tell()
+
+            iso = pycdlibmod.PyCdlib()
+            iso.open_fp(fp, namespaces=namespaces,
+                        verify_redundant=verify_redundant)
+            if namespaces is None:
+                namespaces = ('iso9660', 'joliet', 'udf')
+            try:
+                entries = []
+                if 'iso9660' in namespaces:
+                    if iso.rock_ridge is not None:
+                        entries.extend(_index_dirrecords(iso.pvd.root_directory_record(),
+                                                         'rr', 'utf-8'))
+                    else:
+                        entries.extend(_index_dirrecords(iso.pvd.root_directory_record(),
+                                                         'iso9660', 'utf-8'))
+                if iso.joliet_vd is not None and 'joliet' in namespaces:
+                    entries.extend(_index_dirrecords(iso.joliet_vd.root_directory_record(),
+                                                     'joliet', 'utf-16_be'))
+                if iso.udf_root is not None and 'udf' in namespaces:
+                    entries.extend(_index_udf(iso.udf_root))
+            finally:
+                iso.close()
+    except (pycdlibexception.PyCdlibException, IOError, OSError) as e:
+        return ISOIndex(filename, None, (), str(e))
+
+    return ISOIndex(filename, size, tuple(entries), None)
+
+
+def _index_iso_star(args):
+    '''
+    An internal function to call index_iso() with a tuple of arguments, since
+    Pool.imap() only passes one.
+
+    Parameters:
+     args - The tuple of arguments to index_iso().
+    Returns:
+     An ISOIndex object.
+    '''
+    return index_iso(*args)
+
+
+def _index_many(args, processes, chunksize):
+    '''
+    An internal function to call index_iso() for each tuple of arguments,
+    spreading the calls over a pool of processes.
+
+    Parameters:
+     args - An iterable of tuples of arguments to index_iso().
+     processes - The number of processes to use, or None for one per CPU.
+     chunksize - The number of ISOs to hand to a process at a time.
+    Yields:
+     An ISOIndex object for each tuple of arguments, in order.
+    Returns:
+     Nothing.
+    '''
+    if processes == 1:
+        for arg in args:
+            yield _index_iso_star(arg)
+        return
+
+    pool = multiprocessing.Pool(processes)
+    try:
+        for result in pool.imap(_index_iso_star, args, chunksize):
+            yield result
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+def index_many(filenames, processes=None, chunksize=1, namespaces=None,
+               verify_redundant=True):
+    '''
+    Build flat listings of the contents of many ISOs, spreading the work over
+    a pool of processes.  Each process opens, lists, and closes its ISOs, and
+    only the listings are sent back.  An ISO that cannot be opened does not
+    stop the others; its ISOIndex has the error filled in instead.
+
+    Parameters:
+     filenames - An iterable of the filenames of the ISOs to list.
+     processes - The number of processes to use; None (the default) uses one
+                 per CPU, and 1 lists the ISOs in this process.
+     chunksize - The number of ISOs to hand to a process at a time.
+     namespaces - As for index_iso().
+     verify_redundant - As for PyCdlib.open().
+    Returns:
+     An iterator over an ISOIndex object for each ISO, in the same order as
+     filenames.
+    '''
+    if processes is not None and processes < 1:
+        raise pycdlibexception.PyCdlibInvalidInput('The number of processes must be at least 1')
+
+    if namespaces is not None:
+        namespaces = tuple(namespaces)
+    args = ((filename, namespaces, verify_redundant) for filename in filenames)
+
+    return _index_many(args, processes, chunksize)
@@ -22,20 +22,26 @@ from __future__ import absolute_import
 
 import bisect
 import collections
+import fnmatch
+import functools
+import gc
+import hashlib
 import inspect
 import io
 import os
+import pickle
+import re
 import struct
 import sys
-try:
-    from functools import lru_cache
-except ImportError:
-    from pycdlib.backport_functools import lru_cache
+import threading
+import time
 try:
     from cStringIO import StringIO as BytesIO
 except ImportError:
     from io import BytesIO  # pylint: disable=ungrouped-imports
 
+import pycdlib.backend as backend
+import pycdlib.dates as dates
 import pycdlib.dr as dr
 import pycdlib.eltorito as eltorito
 import pycdlib.headervd as headervd
@@ -43,6 +49,7 @@ import pycdlib.inode as inode
 import pycdlib.isohybrid as isohybrid
 import pycdlib.path_table_record as path_table_record
 import pycdlib.pycdlibexception as pycdlibexception
+import pycdlib.rockridge as rockridge
 import pycdlib.udf as udfmod
 import pycdlib.utils as utils
 
@@ -388,6 +395,137 @@ def _check_path_depth(iso_path):
         raise pycdlibexception.PyCdlibInvalidInput('Directory levels too deep (maximum is 7)')
 
 
+def _mangle_iso9660_basename(basename, interchange_level, is_dir, ext=''):
+    '''
+    A function to truncate a local name and replace the characters in it that
+    ISO9660 does not allow, as the interchange level requires.
+
+    Parameters:
+     basename - The local name to mangle.
+     interchange_level - The ISO9660 interchange level to conform to.
+     is_dir - Whether this is the name of a directory.
+     ext - The extension that will follow the name of a file, which counts
+           towards the length limit of interchange levels 2 and 3.
+    Returns:
+     The mangled name.
+    '''
+    if interchange_level == 4:
+        # Interchange level 4 allows anything but the version separator.
+        return basename.replace(';', '_')
+
+    if interchange_level == 1:
+        maxlen = 8
+    else:
+        maxlen = 31 if is_dir else 30 - len(ext)
+
+    return re.sub('[^A-Z0-9_]', '_', basename[:maxlen].upper())
+
+
+def _mangle_iso9660_name(name, interchange_level, is_dir, used_names):
+    '''
+    A function to make up an ISO9660 name for a local file or directory.  The
+    name is mangled to conform to the interchange level (see
+    _mangle_iso9660_basename()), and if that clashes with a name in
+    used_names, the first five characters are kept and a three digit number is
+    added to them.  This is the same scheme that pycdlib-genisoimage uses.
+
+    Parameters:
+     name - The local name of the file or directory.
+     interchange_level - The ISO9660 interchange level to conform to.
+     is_dir - Whether this is a directory.
+     used_names - The set of names already used in the ISO9660 directory; the
+                  new name is added to it.
+    Returns:
+     The ISO9660 name (with the version for a file), or None if no free name
+     could be found.
+    '''
+    ext = ''
+    if is_dir:
+        mangled = _mangle_iso9660_basename(name, interchange_level, True)
+    else:
+        basename = name
+        (head, sep, tail) = name.rpartition('.')
+        if sep:
+            if interchange_level == 4:
+                (basename, ext) = (head, tail.replace(';', '_'))
+            elif 0 < len(tail) <= 3 and re.match('^[A-Za-z0-9_]*$', tail):
+                # Only use the extension if it is valid ISO9660 as it is;
+                # otherwise it stays part of the name.
+                (basename, ext) = (head, tail.upper())
+        mangled = _mangle_iso9660_basename(basename, interchange_level, False,
+                                           ext)
+        if not mangled and not ext:
+            mangled = '_'
+        mangled = '%s.%s;1' % (mangled, ext)
+
+    if mangled in used_names:
+        prefix = mangled.split('.')[0][:5]
+        for num in range(1000):
+            if is_dir:
+                candidate = '%s%03d' % (prefix, num)
+            else:
+                candidate = '%s%03d.%s;1' % (prefix, num, ext)
+            if candidate not in used_names:
+                mangled = candidate
+                break
+        else:
+            return None
+
+    used_names.add(mangled)
+    return mangled
+
+
+def _list_local_dir(path):
+    '''
+    A function to list the regular files and directories in a local
+    directory.  Symbolic links and special files are left out.
+
+    Parameters:
+     path - The local directory to list.
+    Returns:
+     A list of tuples of (name, is_dir, size), sorted by name.
+    '''
+    entries = []
+    scandir = getattr(os, 'scandir', None)
+    if scandir is not None:
+        for entry in scandir(path):
+            if entry.is_dir(follow_symlinks=False):
+                entries.append((entry.name, True, 0))
+            elif entry.is_file(follow_symlinks=False):
+                entries.append((entry.name, False,
+                                entry.stat(follow_symlinks=False).st_size))
+    else:
+        # Python 2 has no os.scandir().
+        for name in os.listdir(path):
+            fullpath = os.path.join(path, name)
+            if os.path.islink(fullpath):
+                continue
+            if os.path.isdir(fullpath):
+                entries.append((name, True, 0))
+            elif os.path.isfile(fullpath):
+                entries.append((name, False, os.stat(fullpath).st_size))
+
+    entries.sort()
+    return entries
+
+
+def _is_volume_descriptor(desc_type, ident):
+    '''
+    A function to determine whether the type and identifier at the start of an
+    extent belong to one of the volume descriptors that PyCdlib understands.
+
+    Parameters:
+     desc_type - The descriptor type byte.
+     ident - The five byte standard identifier.
+    Returns:
+     True if this is a volume descriptor, False otherwise.
+    '''
+    return desc_type in (headervd.VOLUME_DESCRIPTOR_TYPE_PRIMARY,
+                         headervd.VOLUME_DESCRIPTOR_TYPE_SET_TERMINATOR,
+                         headervd.VOLUME_DESCRIPTOR_TYPE_BOOT_RECORD,
+                         headervd.VOLUME_DESCRIPTOR_TYPE_SUPPLEMENTARY) and ident in (b'CD001', b'BEA01', b'NSR02', b'TEA01')
+
+
 def _yield_children(rec):
     '''
     An internal function to gather and yield all of the children of a Directory
@@ -431,6 +569,33 @@ def _yield_children(rec):
         yield child
 
 
+def _coalesce_ranges(ranges, max_gap, max_length):
+    '''
+    A function to merge a set of byte ranges into as few larger ranges as
+    possible, in ascending order.  Two ranges are merged if the hole between
+    them is no larger than max_gap, and the merged range would be no longer
+    than max_length.
+
+    Parameters:
+     ranges - An iterable of (offset, length) tuples.
+     max_gap - The largest hole (in bytes) to read through.
+     max_length - The longest range (in bytes) to create by merging.
+    Returns:
+     A list of (offset, length) tuples.
+    '''
+    merged = []
+    for offset, length in sorted(ranges):
+        if merged:
+            last_offset, last_length = merged[-1]
+            end = max(last_offset + last_length, offset + length)
+            if offset - (last_offset + last_length) <= max_gap and end - last_offset <= max_length:
+                merged[-1] = (last_offset, end - last_offset)
+                continue
+        merged.append((offset, length))
+
+    return merged
+
+
 def _assign_udf_desc_extents(descs, start_extent):
     '''
     An internal function to assign a consecutive sequence of extents for the
@@ -688,12 +853,953 @@ class PyCdlibIO(io.RawIOBase):
         self._ctxt.__exit__()
 
 
+class PyCdlibEntry(object):
+    '''
+    A class to represent one entry found while walking an ISO, in the style of
+    os.DirEntry.  The attributes are filled in when the entry is created, so
+    reading them does not look anything up on the ISO.
+
+    The name is the name of the entry in the namespace being walked, path is
+    the absolute path to it, and record is the dr.DirectoryRecord (or
+    udf.UDFFileEntry) that it came from.  The size is the length of the data in
+    bytes, mode is the POSIX mode (None unless it came from Rock Ridge or UDF),
+    mtime is the modification time in seconds since the epoch (None if not
+    valid), inode is the inode.Inode holding the data (shared by hard links;
+    None if there is no data), and extent is the extent of the data, or of the
+    directory, on the ISO.  The uid, gid, and nlink are the owner, group, and
+    number of links from Rock Ridge or UDF (None if not known), and
+    symlink_target is the target of a Rock Ridge symlink (None otherwise; the
+    target of a UDF symlink is in its data, so it is not read here).
+    '''
+    __slots__ = ('name', 'path', 'record', 'size', 'mode', 'mtime', 'inode',
+                 'extent', 'uid', 'gid', 'nlink', 'symlink_target', '_is_dir',
+                 '_is_symlink')
+
+    # The names of the attributes, in the order used for columnar output.
+    FIELDS = ('name', 'path', 'record', 'size', 'mode', 'mtime', 'inode',
+              'extent', 'uid', 'gid', 'nlink', 'symlink_target')
+
+    def __init__(self, name, path, record, is_dir, is_symlink, size, mode,
+                 mtime, inode, extent, uid=None, gid=None, nlink=None,
+                 symlink_target=None):
+        self.name = name
+        self.path = path
+        self.record = record
+        self._is_dir = is_dir
+        self._is_symlink = is_symlink
+        self.size = size
+        self.mode = mode
+        self.mtime = mtime
+        self.inode = inode
+        self.extent = extent
+        self.uid = uid
+        self.gid = gid
+        self.nlink = nlink
+        self.symlink_target = symlink_target
+
+    def is_dir(self):
+        '''
+        Determine whether this entry is a directory.
+
+        Parameters:
+         None.
+        Returns:
+         True if this entry is a directory, False otherwise.
+        '''
+        return self._is_dir
+
+    def is_file(self):
+        '''
+        Determine whether this entry is a regular file.
+
+        Parameters:
+         None.
+        Returns:
+         True if this entry is neither a directory nor a symlink, False
+         otherwise.
+        '''
+        return not self._is_dir and not self._is_symlink
+
+    def is_symlink(self):
+        '''
+        Determine whether this entry is a symlink.
+
+        Parameters:
+         None.
+        Returns:
+         True if this entry is a Rock Ridge or UDF symlink, False otherwise.
+        '''
+        return self._is_symlink
+
+    def __repr__(self):
+        return '<PyCdlibEntry %r>' % (self.path)
+
+
+def _decode_ident(ident, encoding):
+    '''
+    An internal function to decode a name from the ISO into a native string.
+
+    Parameters:
+     ident - The name to decode.
+     encoding - The encoding that the name is in.
+    Returns:
+     The decoded name.
+    '''
+    if sys.version_info >= (3, 0):
+        return ident.decode(encoding)
+    return ident.decode(encoding).encode('utf-8')
+
+
+def _dr_entry(child, name, path):
+    '''
+    An internal function to create a PyCdlibEntry for a Directory Record.
+
+    Parameters:
+     child - The Directory Record.
+     name - The decoded name of the Directory Record.
+     path - The absolute path to the Directory Record.
+    Returns:
+     A PyCdlibEntry object.
+    '''
+    # A file larger than 4GB is stored as several Directory Records, one for
+    # each extent.
+    size = 0
+    rec = child
+    while rec is not None:
+        size += rec.get_data_length()
+        rec = rec.data_continuation
+
+    mode = None
+    uid = None
+    gid = None
+    nlink = None
+    is_symlink = False
+    target = None
+    rr = child.rock_ridge
+    if rr is not None:
+        px = rr.dr_entries.px_record
+        if px is None:
+            px = rr.ce_entries.px_record
+        if px is not None:
+            mode = px.posix_file_mode
+            uid = px.posix_user_id
+            gid = px.posix_group_id
+            nlink = px.posix_file_links
+        is_symlink = rr.is_symlink()
+        if is_symlink:
+            target = _decode_ident(rr.symlink_path(), 'utf-8')
+
+    return PyCdlibEntry(name, path, child, child.is_dir(), is_symlink, size,
+                        mode, utils.dr_date_to_epoch(child.date), child.inode,
+                        child.extent_location(), uid, gid, nlink, target)
+
+
+def _udf_entry(file_entry, name, path):
+    '''
+    An internal function to create a PyCdlibEntry for a UDF File Entry.
+
+    Parameters:
+     file_entry - The UDF File Entry.
+     name - The decoded name of the UDF File Entry.
+     path - The absolute path to the UDF File Entry.
+    Returns:
+     A PyCdlibEntry object.
+    '''
+    if file_entry.inode is not None:
+        extent = file_entry.inode.extent_location()
+    else:
+        extent = file_entry.extent_location()
+
+    # An ID of all ones means that it is not set.
+    uid = None
+    if file_entry.uid != 4294967295:
+        uid = file_entry.uid
+    gid = None
+    if file_entry.gid != 4294967295:
+        gid = file_entry.gid
+
+    return PyCdlibEntry(name, path, file_entry, file_entry.is_dir(),
+                        file_entry.is_symlink(), file_entry.get_data_length(),
+                        utils.udf_file_entry_mode(file_entry),
+                        utils.udf_timestamp_to_epoch(file_entry.mod_time),
+                        file_entry.inode, extent, uid, gid,
+                        file_entry.file_link_count)
+
+
+class PyCdlibStats(object):
+    '''
+    A class to collect statistics about the work that a PyCdlib object does.
+    To turn collection on, pass an instance as the stats argument when creating
+    the PyCdlib object; the statistics then add up over every open, reshuffle,
+    and write until reset() is called.
+
+    The phases dictionary maps the name of each phase to the total number of
+    seconds spent in it.  The phases are 'snapshot_load', 'volume_descriptors',
+    'path_tables', 'walk_iso9660', 'walk_joliet', 'udf_descriptors',
+    'walk_udf', 'eltorito', and 'snapshot_save' while opening an ISO;
+    'reshuffle' for the assignment of extents; and 'write' for writing out an
+    ISO (which includes any reshuffle that it does).  The time spent reading
+    Rock Ridge continuation areas is also added up under 'rock_ridge_ce', and
+    is part of the walk phases.
+
+    The counters are the number of seeks, reads, and bytes read on the ISO
+    file object, the number of directory records and UDF File Entries parsed,
+    and the number of Inodes created.
+    '''
+    __slots__ = ('callback', 'phases', 'seeks', 'reads', 'bytes_read',
+                 'records_parsed', 'inodes_created')
+
+    def __init__(self, callback=None):
+        '''
+        Create a new statistics object.
+
+        Parameters:
+         callback - If not None, a function to call each time a phase
+                    finishes.  The callback function must have a signature of:
+                    def func(phase, seconds).
+        Returns:
+         Nothing.
+        '''
+        self.callback = callback
+        self.reset()
+
+    def reset(self):
+        '''
+        Reset all of the statistics to zero.
+
+        Parameters:
+         None.
+        Returns:
+         Nothing.
+        '''
+        self.phases = collections.OrderedDict()
+        self.seeks = 0
+        self.reads = 0
+        self.bytes_read = 0
+        self.records_parsed = 0
+        self.inodes_created = 0
+
+    def add_time(self, phase, seconds):
+        '''
+        Add time to a phase without calling the callback.
+
+        Parameters:
+         phase - The name of the phase.
+         seconds - The number of seconds to add.
+        Returns:
+         Nothing.
+        '''
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def finish_phase(self, phase, seconds):
+        '''
+        Add the time for a phase that just finished, and call the callback.
+
+        Parameters:
+         phase - The name of the phase.
+         seconds - The number of seconds that the phase took.
+        Returns:
+         Nothing.
+        '''
+        self.add_time(phase, seconds)
+        if self.callback is not None:
+            self.callback(phase, seconds)
+
+
+class _StatsPhase(object):
+    '''
+    A context manager that times a phase into a PyCdlibStats object.
+    '''
+    __slots__ = ('_stats', '_phase', '_start')
+
+    def __init__(self, stats, phase):
+        self._stats = stats
+        self._phase = phase
+        self._start = None
+
+    def __enter__(self):
+        self._start = time.time()
+        return self
+
+    def __exit__(self, *args):
+        self._stats.finish_phase(self._phase, time.time() - self._start)
+
+
+class _NullPhase(object):
+    '''
+    A context manager that does nothing, used in place of _StatsPhase when no
+    statistics are being collected.
+    '''
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class _StatsFile(object):
+    '''
+    A wrapper around the ISO file object that counts the seeks and reads made
+    on it into a PyCdlibStats object.  Everything else is passed through to the
+    wrapped file object.
+    '''
+    __slots__ = ('_fp', '_stats')
+
+    def __init__(self, fp, stats):
+        self._fp = fp
+        self._stats = stats
+
+    def seek(self, *args):
+        self._stats.seeks += 1
+        return self._fp.seek(*args)
+
+    def read(self, *args):
+        data = self._fp.read(*args)
+        self._stats.reads += 1
+        self._stats.bytes_read += len(data)
+        return data
+
+    def readinto(self, b):
+        n = self._fp.readinto(b)
+        self._stats.reads += 1
+        self._stats.bytes_read += n or 0
+        return n
+
+    def __getattr__(self, name):
+        return getattr(self._fp, name)
+
+
+PathIndexInfo = collections.namedtuple('PathIndexInfo',
+                                       ['hits', 'misses', 'maxsize', 'currsize'])
+
+RecordResult = collections.namedtuple('RecordResult', ['path', 'record', 'error'])
+
+ExtentOwner = collections.namedtuple('ExtentOwner', ['start', 'end', 'kind', 'owner'])
+
+ChildrenBatch = collections.namedtuple('ChildrenBatch', ['children', 'next_offset'])
+
+
+class _PathIndex(object):
+    '''
+    A class to map the full paths that have been looked up on an ISO to the
+    records they resolved to, one namespace at a time.  Rather than being
+    thrown away whenever anything changes, the index is kept up to date by
+    dropping just the paths that lead to a record when the record is removed.
+    If maxsize is not None, the index holds at most that many paths, and the
+    least recently used ones are dropped first.
+    '''
+    __slots__ = ('maxsize', 'hits', 'misses', '_entries', '_keys_by_record')
+
+    def __init__(self, maxsize=None):
+        self.maxsize = maxsize
+        self.clear()
+
+    def clear(self):
+        '''
+        Drop all of the paths in the index, and reset the statistics.
+
+        Parameters:
+         None.
+        Returns:
+         Nothing.
+        '''
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+        self._keys_by_record = {}
+
+    def get(self, namespace, path):
+        '''
+        Look up a path in the index.
+
+        Parameters:
+         namespace - The namespace that the path is in.
+         path - The path to look up.
+        Returns:
+         The value stored for the path, or None if the path is not indexed.
+        '''
+        key = (namespace, path)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        if self.maxsize is not None:
+            # Move the path to the most recently used end.
+            del self._entries[key]
+            self._entries[key] = entry
+        return entry[1]
+
+    def add(self, namespace, path, record, value):
+        '''
+        Add a path to the index.
+
+        Parameters:
+         namespace - The namespace that the path is in.
+         path - The path to add.
+         record - The record that the path leads to; this is what is passed to
+                  discard() when the record is removed.
+         value - The value to return from get() for this path.
+        Returns:
+         Nothing.
+        '''
+        if self.maxsize is not None and self.maxsize <= 0:
+            return
+
+        key = (namespace, path)
+        if key in self._entries:
+            self._remove_key(key)
+        self._entries[key] = (record, value)
+        self._keys_by_record.setdefault(id(record), []).append(key)
+
+        if self.maxsize is not None and len(self._entries) > self.maxsize:
+            self._remove_key(next(iter(self._entries)))
+
+    def discard(self, record):
+        '''
+        Drop all of the paths that lead to a record, because the record is being
+        removed.  If the record is a directory, the paths underneath it are
+        dropped too.
+
+        Parameters:
+         record - The record being removed.
+        Returns:
+         Nothing.
+        '''
+        keys = self._keys_by_record.get(id(record))
+        if keys is None:
+            return
+
+        for key in list(keys):
+            self._remove_key(key)
+
+        if record.is_dir():
+            # This walks the whole index, but removing a directory that still
+            # has children is rare.
+            prefixes = [(namespace, path + b'/') for namespace, path in keys]
+            for key in list(self._entries):
+                for namespace, prefix in prefixes:
+                    if key[0] == namespace and key[1].startswith(prefix):
+                        self._remove_key(key)
+                        break
+
+    def _remove_key(self, key):
+        '''
+        Remove one path from the index.
+
+        Parameters:
+         key - The (namespace, path) tuple to remove.
+        Returns:
+         Nothing.
+        '''
+        record = self._entries.pop(key)[0]
+        keys = self._keys_by_record[id(record)]
+        keys.remove(key)
+        if not keys:
+            del self._keys_by_record[id(record)]
+
+    def info(self):
+        '''
+        Get the statistics for the index.
+
+        Parameters:
+         None.
+        Returns:
+         A PathIndexInfo tuple of the hits, misses, maximum size and current
+         size of the index.
+        '''
+        return PathIndexInfo(self.hits, self.misses, self.maxsize,
+                             len(self._entries))
+
+
+class _NameIndex(object):
+    '''
+    A class to find the records in one namespace of an ISO by their names.  The
+    distinct names are kept sorted, so that a pattern that starts with some
+    literal characters only has to be matched against the names that start
+    with them.
+    '''
+    __slots__ = ('_names', '_records', '_name_of')
+
+    def __init__(self):
+        self._names = []
+        self._records = {}
+        self._name_of = {}
+
+    def add(self, name, record):
+        '''
+        Add a record to the index.
+
+        Parameters:
+         name - The decoded name of the record.
+         record - The record to add.
+        Returns:
+         Nothing.
+        '''
+        records = self._records.get(name)
+        if records is None:
+            bisect.insort(self._names, name)
+            records = []
+            self._records[name] = records
+        records.append(record)
+        self._name_of[id(record)] = name
+
+    def discard(self, record):
+        '''
+        Remove a record from the index, if it is in it.
+
+        Parameters:
+         record - The record to remove.
+        Returns:
+         Nothing.
+        '''
+        name = self._name_of.pop(id(record), None)
+        if name is None:
+            return
+
+        records = self._records[name]
+        for index, rec in enumerate(records):
+            if rec is record:
+                del records[index]
+                break
+        if not records:
+            del self._records[name]
+            del self._names[bisect.bisect_left(self._names, name)]
+
+    def match(self, pattern):
+        '''
+        Find the records whose names match a shell-style pattern.
+
+        Parameters:
+         pattern - The pattern to match, as for fnmatch.fnmatchcase().
+        Returns:
+         A list of the matching records, in the order of their names.
+        '''
+        for index, char in enumerate(pattern):
+            if char in '*?[':
+                prefix = pattern[:index]
+                break
+        else:
+            # No wildcards, so this can only be one name.
+            return list(self._records.get(pattern, ()))
+
+        ret = []
+        index = bisect.bisect_left(self._names, prefix)
+        while index < len(self._names):
+            name = self._names[index]
+            if not name.startswith(prefix):
+                break
+            if fnmatch.fnmatchcase(name, pattern):
+                ret.extend(self._records[name])
+            index += 1
+        return ret
+
+
+class _ExtentIndex(object):
+    '''
+    A class to find the structures of an ISO that occupy a range of extents.
+    The structures are kept sorted by their starting extent, along with the
+    largest ending extent seen so far, so that a lookup only has to step back
+    over the structures that actually reach into the range.
+    '''
+    __slots__ = ('_owners', '_starts', '_max_ends')
+
+    def __init__(self, owners):
+        self._owners = sorted(owners, key=lambda owner: (owner.start, owner.end))
+        self._starts = [owner.start for owner in self._owners]
+        self._max_ends = []
+        max_end = 0
+        for owner in self._owners:
+            max_end = max(max_end, owner.end)
+            self._max_ends.append(max_end)
+
+    def owners_in_range(self, start, end):
+        '''
+        Find the structures that occupy any of a range of extents.
+
+        Parameters:
+         start - The first extent of the range.
+         end - The extent just past the end of the range.
+        Returns:
+         A list of the ExtentOwner tuples that overlap the range, in extent
+         order.
+        '''
+        ret = []
+        if start >= end:
+            return ret
+
+        index = bisect.bisect_left(self._starts, end)
+        while index > 0 and self._max_ends[index - 1] > start:
+            index -= 1
+            if self._owners[index].end > start:
+                ret.append(self._owners[index])
+        ret.reverse()
+        return ret
+
+
+class _ExtentAllocator(object):
+    '''
+    A class to hand out extents for file data on an ISO that has already been
+    laid out, without laying it out again.  Extents come from the ranges that
+    have been given back (first fit), or else from past the end of the ISO.
+    The free ranges are kept sorted by their starting extent, and neighboring
+    ranges are merged.
+    '''
+    __slots__ = ('end', '_free_starts', '_free_lengths')
+
+    def __init__(self, end):
+        self.end = end
+        self._free_starts = []
+        self._free_lengths = []
+
+    def allocate(self, num_extents):
+        '''
+        Allocate a range of extents.
+
+        Parameters:
+         num_extents - The number of extents to allocate.
+        Returns:
+         The first extent of the range.
+        '''
+        for index, length in enumerate(self._free_lengths):
+            if length >= num_extents:
+                start = self._free_starts[index]
+                if length == num_extents:
+                    del self._free_starts[index]
+                    del self._free_lengths[index]
+                else:
+                    self._free_starts[index] += num_extents
+                    self._free_lengths[index] -= num_extents
+                return start
+
+        start = self.end
+        self.end += num_extents
+        return start
+
+    def free(self, start, num_extents):
+        '''
+        Give back a range of extents, so that it can be allocated again.
+
+        Parameters:
+         start - The first extent of the range.
+         num_extents - The number of extents in the range.
+        Returns:
+         Nothing.
+        '''
+        if num_extents == 0:
+            return
+
+        index = bisect.bisect_left(self._free_starts, start)
+        if index < len(self._free_starts) and start + num_extents == self._free_starts[index]:
+            self._free_starts[index] = start
+            self._free_lengths[index] += num_extents
+        else:
+            self._free_starts.insert(index, start)
+            self._free_lengths.insert(index, num_extents)
+
+        if index > 0 and self._free_starts[index - 1] + self._free_lengths[index - 1] == start:
+            self._free_lengths[index - 1] += self._free_lengths[index]
+            del self._free_starts[index]
+            del self._free_lengths[index]
+
+        if self._free_starts and self._free_starts[-1] + self._free_lengths[-1] == self.end:
+            self.end = self._free_starts.pop()
+            self._free_lengths.pop()
+
+
+def _timed_phase(phase):
+    '''
+    A decorator for PyCdlib methods that times each call to the method as a
+    phase, if the object is collecting statistics.
+
+    Parameters:
+     phase - The name of the phase.
+    Returns:
+     The decorator.
+    '''
+    def decorator(func):
+        '''
+        The decorator itself.
+        '''
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            '''
+            The wrapper around the method.
+            '''
+            if self._stats is None:
+                return func(self, *args, **kwargs)
+            with _StatsPhase(self._stats, phase):
+                return func(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# When reading ahead during a directory walk, holes of up to this many bytes
+# between two wanted ranges are read through rather than seeked over, and no
+# single read is made longer than the maximum.
+_READ_AHEAD_MAX_GAP = 16 * 2048
+_READ_AHEAD_MAX_LENGTH = 1024 * 1024
+
+# On a lazy open the read-ahead cache of each walk lives as long as the
+# object, so it holds at most this many bytes; the chunks used least recently
+# are dropped first.
+_LAZY_READ_AHEAD_MAX_BYTES = 4 * 1024 * 1024
+
+# When decoding a directory straight from its extents, this many blocks are
+# read at a time.
+_DIRECTORY_CHUNK_BLOCKS = 16
+
+# The namespaces that can be selected when opening an ISO.
+_NAMESPACES = ('iso9660', 'joliet', 'udf')
+
+# The namespaces that paths can be in, and the keyword each is passed as.
+_NAMESPACE_PATH_KEYS = {
+    'iso9660': 'iso_path',
+    'rr': 'rr_path',
+    'joliet': 'joliet_path',
+    'udf': 'udf_path',
+}
+
+# The format of the snapshot files written by PyCdlib.open(snapshot=...).  The
+# version must be bumped whenever the layout of any of the parsed objects
+# changes, so that stale snapshots are ignored rather than loaded.
+_SNAPSHOT_MAGIC = b'pycdlib-snapshot'
+_SNAPSHOT_VERSION = 4
+
+# The PyCdlib attributes that are not part of the parsed metadata, and hence
+# are not stored in a snapshot.
+_SNAPSHOT_EXCLUDED_ATTRS = ('_initialized', '_cdfp', '_managing_fp',
+                            '_always_consistent', '_track_writes', '_lazy',
+                            '_stats', '_path_index',
+                            '_name_indices', '_extent_index', '_full_paths',
+                            '_extent_allocator', '_incremental_layout',
+                            '_batch', '_data_lock')
+
+
+class _SnapshotPickler(pickle.Pickler):
+    '''
+    A pickler that writes out a reference to the ISO file object instead of
+    the file object itself.
+    '''
+    def __init__(self, outfp, iso_fp):
+        pickle.Pickler.__init__(self, outfp, pickle.HIGHEST_PROTOCOL)
+        self._iso_fp = iso_fp
+
+    def persistent_id(self, obj):  # pylint: disable=method-hidden
+        '''
+        Return the persistent ID for the ISO file object, and None for
+        everything else.
+        '''
+        if obj is self._iso_fp:
+            return 'iso'
+        return None
+
+
+# The modules whose classes make up the parsed metadata of an ISO; a snapshot
+# may not refer to anything else.
+_SNAPSHOT_MODULES = frozenset([
+    'pycdlib.dates', 'pycdlib.dr', 'pycdlib.eltorito', 'pycdlib.headervd',
+    'pycdlib.inode', 'pycdlib.isohybrid', 'pycdlib.path_table_record',
+    'pycdlib.rockridge', 'pycdlib.udf',
+])
+
+
+class _SnapshotUnpickler(pickle.Unpickler):
+    '''
+    An unpickler that resolves the reference written by _SnapshotPickler to
+    the ISO file object that is being opened, and that only allows the
+    classes of the parsed metadata to be loaded.
+    '''
+    def __init__(self, infp, iso_fp):
+        pickle.Unpickler.__init__(self, infp)
+        self._iso_fp = iso_fp
+
+    def persistent_load(self, pid):  # pylint: disable=method-hidden
+        '''
+        Return the ISO file object for its persistent ID.
+        '''
+        if pid != 'iso':
+            raise pickle.UnpicklingError('Unknown persistent ID in snapshot')
+        return self._iso_fp
+
+    def find_class(self, module, name):
+        '''
+        Return the class for a name in a snapshot, as long as it is one of the
+        classes of the parsed metadata.
+        '''
+        if module in _SNAPSHOT_MODULES:
+            cls = pickle.Unpickler.find_class(self, module, name)
+            if isinstance(cls, type) and cls.__module__ in _SNAPSHOT_MODULES:
+                return cls
+        raise pickle.UnpicklingError("'%s.%s' is not allowed in a snapshot" % (module, name))
+
+
+# The types of objects that are never changed once they have been built, so
+# that a copy of the parsed metadata can share them with the original: dates,
+# UDF identifiers, and UDF ICB tags are replaced rather than changed, and the
+# Rock Ridge records other than PX, CE, CL, and PL are only changed while they
+# are being built.  Tuples are shared too, as they only ever hold values like
+# these.
+_COPY_SHARED_TYPES = frozenset([
+    bytes, str, int, float, bool, type(None), type, tuple, frozenset,
+    dates.DirectoryRecordDate, dates.VolumeDescriptorDate,
+    udfmod.UDFTimestamp, udfmod.UDFEntityID, udfmod.UDFICBTag,
+    rockridge.RRSPRecord, rockridge.RRRRRecord, rockridge.RRERRecord,
+    rockridge.RRESRecord, rockridge.RRPNRecord, rockridge.RRSLRecord,
+    rockridge.RRNMRecord, rockridge.RRTFRecord, rockridge.RRSFRecord,
+    rockridge.RRRERecord, rockridge.RRSTRecord, rockridge.RRPDRecord,
+])
+if sys.version_info < (3, 0):
+    _COPY_SHARED_TYPES |= frozenset([unicode, long])  # pylint: disable=undefined-variable
+
+# The attributes that hold file objects, which a copy shares with the original.
+_COPY_SHARED_ATTRS = {
+    inode.Inode: frozenset(['data_fp']),
+}
+
+_COPY_SLOTS = {}
+
+
+def _copy_slots(cls):
+    '''
+    A function to get the names of all of the slots of a class, including the
+    ones of its base classes.
+
+    Parameters:
+     cls - The class to get the slots of.
+    Returns:
+     A tuple of the names of the slots.
+    '''
+    slots = _COPY_SLOTS.get(cls)
+    if slots is None:
+        if '__dict__' in dir(cls):
+            raise pycdlibexception.PyCdlibInternalError('Cannot copy an object of type %s' % (cls.__name__))
+        names = []
+        for klass in reversed(cls.__mro__):
+            klass_slots = klass.__dict__.get('__slots__', ())
+            if isinstance(klass_slots, str):
+                klass_slots = (klass_slots,)
+            names.extend([name for name in klass_slots if name != '__weakref__'])
+        slots = tuple(names)
+        _COPY_SLOTS[cls] = slots
+
+    return slots
+
+
+def _copy_metadata(state, files=None):
+    '''
+    A function to make a deep copy of the parsed metadata of an ISO, as
+    collected by PyCdlib._snapshot_state().  The objects that are never changed
+    once built, and the file objects, are shared with the original.  The
+    copy is made with a work list rather than by recursion, so that deep trees
+    don't run into the recursion limit, and with the garbage collector paused,
+    since none of the many objects made are garbage.
+
+    Parameters:
+     state - The dictionary mapping attribute names to their values.
+     files - A dictionary mapping the ids of file objects to the file objects
+             that the copy should use in their place, or None.
+    Returns:
+     A copy of the dictionary.
+    '''
+    if files is None:
+        files = {}
+    shared = _COPY_SHARED_TYPES
+    missing = object()
+    memo = {}
+    work = []
+
+    def _shell(obj):
+        '''
+        Make an empty copy of an object, to be filled in from the work list.
+        '''
+        cls = type(obj)
+        if cls is list:
+            new = []
+        elif cls is dict:
+            new = {}
+        else:
+            _copy_slots(cls)
+            new = cls.__new__(cls)
+        memo[id(obj)] = new
+        work.append((obj, new))
+        return new
+
+    def _copy_of(obj):
+        '''
+        Get the copy of an object, making an empty one if there isn't one yet.
+        '''
+        new = memo.get(id(obj))
+        if new is None:
+            new = _shell(obj)
+        return new
+
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        new_state = _shell(state)
+        while work:
+            (obj, new) = work.pop()
+            cls = type(obj)
+            if cls is list:
+                new.extend([x if type(x) in shared else _copy_of(x) for x in obj])
+            elif cls is dict:
+                for key, value in obj.items():
+                    if type(value) not in shared:
+                        value = _copy_of(value)
+                    new[key] = value
+            else:
+                keep = _COPY_SHARED_ATTRS.get(cls, ())
+                for name in _COPY_SLOTS[cls]:
+                    value = getattr(obj, name, missing)
+                    if value is missing:
+                        continue
+                    if name in keep:
+                        value = files.get(id(value), value)
+                    elif type(value) not in shared:
+                        value = _copy_of(value)
+                    setattr(new, name, value)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    return new_state
+
+
+class _Batch(object):
+    '''
+    A context manager for a batch of changes to a PyCdlib object; see
+    PyCdlib.batch().
+    '''
+    __slots__ = ('_iso', '_rollback')
+
+    def __init__(self, iso, rollback):
+        self._iso = iso
+        self._rollback = rollback
+
+    def __enter__(self):
+        self._iso._begin_batch(self._rollback)  # pylint: disable=protected-access
+        return self._iso
+
+    def __exit__(self, exc_type, *args):
+        self._iso._end_batch(exc_type is not None)  # pylint: disable=protected-access
+
+
 class PyCdlib(object):
     '''
-    The main class for manipulating ISOs.
+    The main class for manipulating ISOs.  To collect statistics about the
+    time and I/O that the object spends, pass a PyCdlibStats object as the
+    stats argument when creating it.  The paths that are looked up are kept in
+    an index; to bound the number of paths it holds, pass path_index_size.
     '''
     __slots__ = ('_initialized', '_cdfp', 'pvds', 'svds', 'vdsts', 'brs', 'pvd',
-                 '_tmpdr', 'rock_ridge', '_always_consistent',
+                 'rock_ridge', '_always_consistent',
                  'eltorito_boot_catalog', 'isohybrid_mbr', 'xa', '_managing_fp',
                  '_needs_reshuffle', '_rr_moved_record', '_rr_moved_name',
                  '_rr_moved_rr_name', 'enhanced_vd', 'joliet_vd', 'version_vd',
@@ -702,7 +1808,11 @@ class PyCdlib(object):
                  'udf_main_descs', 'udf_reserve_descs',
                  'udf_logical_volume_integrity',
                  'udf_logical_volume_integrity_terminator', 'udf_root',
-                 'udf_file_set', 'udf_file_set_terminator', 'inodes')
+                 'udf_file_set', 'udf_file_set_terminator', 'inodes', '_lazy',
+                 '_skipped_namespaces', '_read_only', '_stats',
+                 '_path_index', '_name_indices',
+                 '_extent_index', '_full_paths', '_extent_allocator',
+                 '_incremental_layout', '_batch', '_data_lock')
 
     class _UDFDescriptors(object):
         '''
@@ -719,6 +1829,139 @@ class PyCdlib(object):
             self.unallocated_space = None
             self.terminator = None
 
+    class _DirWalkState(object):
+        '''
+        A class to hold the state needed while parsing the directory records
+        belonging to a single volume descriptor.
+        '''
+        __slots__ = ('vd', 'extent_to_ptr', 'extent_to_inode',
+                     'path_table_records', 'iso_file_length',
+                     'all_extent_to_dr', 'interchange_level', 'lastbyte',
+                     'read_ahead')
+
+        def __init__(self, vd, extent_to_ptr, extent_to_inode,
+                     path_table_records, iso_file_length,
+                     read_ahead_max_bytes=None):
+            self.vd = vd
+            self.extent_to_ptr = extent_to_ptr
+            self.extent_to_inode = extent_to_inode
+            self.path_table_records = path_table_records
+            self.iso_file_length = iso_file_length
+            self.all_extent_to_dr = {}
+            self.interchange_level = 1
+            self.lastbyte = 0
+            self.read_ahead = PyCdlib._ReadAheadCache(read_ahead_max_bytes)
+
+    class _ReadAheadCache(object):
+        '''
+        A class to hold data that was read off of the ISO before it was needed,
+        so that many small reads can be served out of a few large ones.  If
+        max_bytes is not None, the chunks used least recently are dropped
+        whenever the cache holds more than that many bytes (the newest chunk
+        is always kept).
+        '''
+        __slots__ = ('_offsets', '_chunks', '_max_bytes', '_size', '_lru')
+
+        def __init__(self, max_bytes=None):
+            self._offsets = []
+            self._chunks = []
+            self._max_bytes = max_bytes
+            self._size = 0
+            self._lru = collections.OrderedDict()
+
+        def add(self, offset, data):
+            '''
+            Add a chunk of data read from the ISO to the cache.
+
+            Parameters:
+             offset - The byte offset on the ISO the data was read from.
+             data - The data that was read.
+            Returns:
+             Nothing.
+            '''
+            index = bisect.bisect_left(self._offsets, offset)
+            if index < len(self._offsets) and self._offsets[index] == offset:
+                self._size -= len(self._chunks[index])
+                self._chunks[index] = data
+                del self._lru[offset]
+            else:
+                self._offsets.insert(index, offset)
+                self._chunks.insert(index, data)
+            self._size += len(data)
+            self._lru[offset] = None
+
+            if self._max_bytes is None:
+                return
+            while self._size > self._max_bytes and len(self._lru) > 1:
+                oldest, unused = self._lru.popitem(last=False)
+                index = bisect.bisect_left(self._offsets, oldest)
+                self._size -= len(self._chunks[index])
+                del self._offsets[index]
+                del self._chunks[index]
+
+        def size(self):
+            '''
+            Get the number of bytes held in the cache.
+
+            Parameters:
+             None.
+            Returns:
+             The number of bytes held in the cache.
+            '''
+            return self._size
+
+        def get(self, offset, length):
+            '''
+            Look up a range of the ISO in the cache.
+
+            Parameters:
+             offset - The byte offset on the ISO to start at.
+             length - The number of bytes wanted.
+            Returns:
+             The data if the whole range is in a single cached chunk, None
+             otherwise.
+            '''
+            index = bisect.bisect_right(self._offsets, offset) - 1
+            if index < 0:
+                return None
+            start = offset - self._offsets[index]
+            chunk = self._chunks[index]
+            if start + length > len(chunk):
+                return None
+            if self._max_bytes is not None:
+                key = self._offsets[index]
+                self._lru[key] = self._lru.pop(key)
+            return chunk[start:start + length]
+
+    class _BatchState(object):
+        '''
+        A class to keep track of a batch of changes to the ISO: the size
+        accounting that has not yet been applied, and for the batch and each
+        batch started inside of it, the state to go back to if it fails (None
+        if it can't be rolled back).
+        '''
+        __slots__ = ('space_extents', 'partition_extents', 'changed',
+                     'savepoints')
+
+        def __init__(self):
+            self.space_extents = 0
+            self.partition_extents = 0
+            self.changed = False
+            self.savepoints = []
+
+    class _LazyParseState(object):
+        '''
+        A class to keep track of the directories that have not yet been read
+        off of the ISO when it was opened lazily.
+        '''
+        __slots__ = ('walk_states', 'dirs', 'udf_dirs', 'extent_to_inode')
+
+        def __init__(self, extent_to_inode):
+            self.walk_states = []
+            self.dirs = {}
+            self.udf_dirs = {}
+            self.extent_to_inode = extent_to_inode
+
     def _parse_volume_descriptors(self):
         '''
         An internal method to parse the volume descriptors on an ISO.
@@ -744,10 +1987,7 @@ class PyCdlib(object):
             if len(vd) != 2048:
                 raise pycdlibexception.PyCdlibInvalidISO('Failed to read entire volume descriptor')
             (desc_type, ident) = struct.unpack_from('=B5s', vd, 0)
-            if desc_type not in (headervd.VOLUME_DESCRIPTOR_TYPE_PRIMARY,
-                                 headervd.VOLUME_DESCRIPTOR_TYPE_SET_TERMINATOR,
-                                 headervd.VOLUME_DESCRIPTOR_TYPE_BOOT_RECORD,
-                                 headervd.VOLUME_DESCRIPTOR_TYPE_SUPPLEMENTARY) or ident not in (b'CD001', b'BEA01', b'NSR02', b'TEA01'):
+            if not _is_volume_descriptor(desc_type, ident):
                 # We read the next extent, and it wasn't a descriptor.  Abort
                 # the loop, remembering to back up the input file descriptor.
                 self._cdfp.seek(-2048, os.SEEK_CUR)
@@ -810,6 +2050,20 @@ class PyCdlib(object):
         if len(self.vdsts) < 1:
             raise pycdlibexception.PyCdlibInvalidISO('Valid ISO9660 filesystems must have at least one Volume Descriptor Set Terminator')
 
+    def _phase(self, phase):
+        '''
+        An internal method to get a context manager that times a phase, if
+        this object is collecting statistics.
+
+        Parameters:
+         phase - The name of the phase.
+        Returns:
+         A context manager.
+        '''
+        if self._stats is None:
+            return _NULL_PHASE
+        return _StatsPhase(self._stats, phase)
+
     def _seek_to_extent(self, extent):
         '''
         An internal method to seek to a particular extent on the input ISO.
@@ -821,6 +2075,21 @@ class PyCdlib(object):
         '''
         self._cdfp.seek(extent * self.pvd.logical_block_size())
 
+    def _read_data(self, offset, length):
+        '''
+        An internal method to read data from the input ISO.  Note that the
+        position of the file object is not defined after this call.
+
+        Parameters:
+         offset - The byte offset on the ISO to start reading at.
+         length - The number of bytes to read.
+        Returns:
+         The data (which may be shorter than length if the end of the ISO was
+         reached).
+        '''
+        self._cdfp.seek(offset)
+        return self._cdfp.read(length)
+
     def _find_record(self, **kwargs):
         '''
         An internal method to find an directory record on the ISO given an ISO,
@@ -835,69 +2104,10 @@ class PyCdlib(object):
         Returns:
          The directory record entry representing the entry on the ISO.
         '''
-        def normal_lt(child, path):
-            '''
-            Internal method to see whether a directory record is less than the
-            path.
-
-            Parameters:
-             child - The directory record to check.
-             path - The path to check.
-            Returns:
-             -1 if the directory record is less than the path, 0 if they are
-             equal, and 1 if the directory record is greater than the path.
-            '''
-            self._tmpdr.file_ident = path
-            return child < self._tmpdr
-
-        def normal_eq(child, path):
-            '''
-            Internal method to see whether a directory record equals the path.
-
-            Parameters:
-             child - The directory record to check.
-             path - The path to check.
-            Returns:
-             True if the directory record name equals the path, False otherwise.
-            '''
-            return child.file_ident == path
-
-        def rr_lt(child, path):
-            '''
-            Internal method to see whether a Rock Ridge directory record
-            is less than the path.
-
-            Parameters:
-             child - The directory record to check.
-             path - The path to check.
-            Returns:
-             -1 if the directory record is less than the path, 0 if they
-             are equal, and 1 if the directory record is greater than the
-             path.
-            '''
-            return child.rock_ridge.name() < path
-
-        def rr_eq(child, path):
-            '''
-            Internal method to see whether a Rock Ridge directory record
-            equals the path.
-
-            Parameters:
-             child - The directory record to check.
-             path - The path to check.
-            Returns:
-             True if the directory record name equals the path, False otherwise.
-            '''
-            return child.rock_ridge.name() == path
-
         path = None
         num_paths = 0
         encoding = 'utf-8'
-        self._tmpdr = dr.DirectoryRecord()
-        lt_func = normal_lt
-        eq_func = normal_eq
-        start_offset = 2
-        child_list = 'children'
+        rr = False
         root_dir_record = self.pvd.root_directory_record()
         for key in kwargs:
             if key == 'iso_path' and kwargs[key] is not None:
@@ -905,10 +2115,7 @@ class PyCdlib(object):
                 num_paths += 1
             elif key == 'rr_path' and kwargs[key] is not None:
                 path = kwargs[key]
-                lt_func = rr_lt
-                eq_func = rr_eq
-                start_offset = 0
-                child_list = 'rr_children'
+                rr = True
                 num_paths += 1
             elif key == 'joliet_path' and kwargs[key] is not None:
                 path = kwargs[key]
@@ -921,6 +2128,11 @@ class PyCdlib(object):
         if num_paths != 1:
             raise pycdlibexception.PyCdlibInvalidInput('Exactly one of iso_path, rr_path, or joliet_path must be passed')
 
+        if encoding == 'utf-8':
+            self._check_namespace_parsed('iso9660')
+        else:
+            self._check_namespace_parsed('joliet')
+
         if not utils.starts_with_slash(path):
             raise pycdlibexception.PyCdlibInvalidInput('Must be a path starting with /')
 
@@ -937,31 +2149,13 @@ class PyCdlib(object):
         entry = root_dir_record
 
         while True:
-            child = None
-
-            thelist = getattr(entry, child_list)
-            lo = start_offset
-            hi = len(thelist)
-            while lo < hi:
-                mid = (lo + hi) // 2
-                if lt_func(thelist[mid], currpath):
-                    lo = mid + 1
-                else:
-                    hi = mid
-            index = lo
-            if index != len(thelist) and eq_func(thelist[index], currpath):
-                child = thelist[index]
+            child = self._find_child(entry, currpath, rr)
 
             if child is None:
                 # We failed to find this component of the path, so break out of the
                 # loop and fail
                 break
 
-            if child.rock_ridge is not None and child.rock_ridge.child_link_record_exists():
-                # Here, the rock ridge extension has a child link, so we
-                # need to follow it.
-                child = child.rock_ridge.cl_to_moved_dr
-
             # We found the child, and it is the last one we are looking for;
             # return it.
             if not splitpath:
@@ -972,9 +2166,34 @@ class PyCdlib(object):
                 entry = child
                 currpath = splitpath.pop(0).decode('utf-8').encode(encoding)
 
-        raise pycdlibexception.PyCdlibInvalidInput('Could not find path')
+        raise pycdlibexception.PyCdlibInvalidInput('Could not find path')
+
+    def _find_child(self, entry, name, rr):
+        '''
+        An internal method to find one component of a path in a directory.
+
+        Parameters:
+         entry - The directory record of the directory to look in.
+         name - The name to look for, encoded for the namespace of the
+                directory.
+         rr - Whether to look the name up as a Rock Ridge name.
+        Returns:
+         The directory record of the child (after following any Rock Ridge
+         child link), or None if there is no child with this name.
+        '''
+        self._load_directory(entry)
+        if rr:
+            child = entry.lookup_rr_child(name)
+        else:
+            child = entry.lookup_child(name)
+
+        if child is not None and child.rock_ridge is not None and child.rock_ridge.child_link_record_exists():
+            # Here, the rock ridge extension has a child link, so we need to
+            # follow it.
+            child = child.rock_ridge.cl_to_moved_dr
+
+        return child
 
-    @lru_cache(maxsize=256)
     def _find_iso_record(self, iso_path):
         '''
         An internal method to find an directory record on the ISO given an ISO
@@ -987,9 +2206,12 @@ class PyCdlib(object):
         Returns:
          The directory record entry representing the entry on the ISO.
         '''
-        return self._find_record(iso_path=iso_path)
+        rec = self._path_index.get('iso9660', iso_path)
+        if rec is None:
+            rec = self._find_record(iso_path=iso_path)
+            self._path_index.add('iso9660', iso_path, rec, rec)
+        return rec
 
-    @lru_cache(maxsize=256)
     def _find_rr_record(self, rr_path):
         '''
         An internal method to find an directory record on the ISO given a Rock
@@ -1002,9 +2224,12 @@ class PyCdlib(object):
         Returns:
          The directory record entry representing the entry on the ISO.
         '''
-        return self._find_record(rr_path=rr_path)
+        rec = self._path_index.get('rr', rr_path)
+        if rec is None:
+            rec = self._find_record(rr_path=rr_path)
+            self._path_index.add('rr', rr_path, rec, rec)
+        return rec
 
-    @lru_cache(maxsize=256)
     def _find_joliet_record(self, joliet_path):
         '''
         An internal method to find an directory record on the ISO given a Joliet
@@ -1017,9 +2242,12 @@ class PyCdlib(object):
         Returns:
          The directory record entry representing the entry on the ISO.
         '''
-        return self._find_record(joliet_path=joliet_path)
+        rec = self._path_index.get('joliet', joliet_path)
+        if rec is None:
+            rec = self._find_record(joliet_path=joliet_path)
+            self._path_index.add('joliet', joliet_path, rec, rec)
+        return rec
 
-    @lru_cache(maxsize=256)
     def _find_udf_record(self, udf_path):
         '''
         An internal method to find an directory record on the ISO given a UDF
@@ -1032,6 +2260,30 @@ class PyCdlib(object):
         Returns:
          The UDF File Entry representing the entry on the ISO.
         '''
+        found = self._path_index.get('udf', udf_path)
+        if found is None:
+            found = self._walk_udf_path(udf_path)
+            if found[0] is None:
+                self._path_index.add('udf', udf_path, found[1], found)
+            else:
+                self._path_index.add('udf', udf_path, found[0], found)
+        return found
+
+    def _walk_udf_path(self, udf_path):
+        '''
+        An internal method to find the UDF File Identifier Descriptor and UDF
+        File Entry for a UDF path by walking down the directory tree.  If the
+        entry could not be found, a pycdlibexception.PyCdlibInvalidInput is
+        raised.
+
+        Parameters:
+         udf_path - The UDF path to lookup.
+        Returns:
+         A tuple of the UDF File Identifier Descriptor (None for the root) and
+         the UDF File Entry representing the entry on the ISO.
+        '''
+        self._check_namespace_parsed('udf')
+
         # If the path is just the slash, we just want the root directory, so
         # get the child there and quit.
         if udf_path == b'/':
@@ -1045,6 +2297,7 @@ class PyCdlib(object):
         entry = self.udf_root
 
         while True:
+            self._load_directory(entry)
             child = entry.find_file_ident_desc_by_name(currpath)
 
             if child is None:
@@ -1124,6 +2377,9 @@ class PyCdlib(object):
         # None, we upgrade it to whatever version we were given.  Once we have
         # seen a particular version, we only allow records of that version or
         # None (to account for dotdot records which have no Rock Ridge).
+        if rr is None:
+            return
+
         if self.rock_ridge is None:
             self.rock_ridge = rr
         else:
@@ -1132,204 +2388,515 @@ class PyCdlib(object):
                     if rr is not None and rr != ver:
                         raise pycdlibexception.PyCdlibInvalidISO('Inconsistent Rock Ridge versions on the ISO!')
 
-    def _walk_directories(self, vd, extent_to_ptr, extent_to_inode, path_table_records):
+    def _iso_file_length(self):
         '''
-        An internal method to walk the directory records in a volume descriptor,
-        starting with the root.  For each child in the directory record,
-        we create a new dr.DirectoryRecord object and append it to the parent.
+        An internal method to determine the length of the input ISO, in bytes.
 
         Parameters:
-         vd - The volume descriptor to walk.
-         extent_to_ptr - A dictionary mapping extents to PTRs.
-         extent_to_inode - A dictionary mapping extents to Inodes.
-         path_table_records - The list of path table records.
+         None.
         Returns:
-         The interchange level that this ISO conforms to.
+         The length of the input ISO in bytes.
         '''
-        cdfp = self._cdfp
-        old_loc = cdfp.tell()
-        cdfp.seek(0, os.SEEK_END)
-        iso_file_length = cdfp.tell()
-        cdfp.seek(old_loc)
+        old_loc = self._cdfp.tell()
+        self._cdfp.seek(0, os.SEEK_END)
+        iso_file_length = self._cdfp.tell()
+        self._cdfp.seek(old_loc)
 
-        all_extent_to_dr = {}
-        is_pvd = vd.is_pvd()
-        root_dir_record = vd.root_directory_record()
-        root_dir_record.set_ptr(path_table_records[0])
-        interchange_level = 1
-        block_size = vd.logical_block_size()
-        parent_links = []
-        child_links = []
-        lastbyte = 0
-        dirs = collections.deque([root_dir_record])
-        while dirs:
-            dir_record = dirs.popleft()
+        return iso_file_length
 
-            self._seek_to_extent(dir_record.extent_location())
-            length = dir_record.get_data_length()
-            offset = 0
-            last_record = None
-            data = cdfp.read(length)
-            while offset < length:
-                if offset > (len(data) - 1):
+    def _directory_records(self, state, dir_record, offset, chunk_blocks):
+        '''
+        An internal method to decode the directory records in the extent(s)
+        belonging to a single directory, starting at a byte offset into the
+        directory.  The padding after the last record in each block must be
+        all zero.  The Rock Ridge continuation areas of the records are not
+        read here; see _parse_ce_data().
+
+        Parameters:
+         state - The _DirWalkState object for the volume descriptor that the
+                 directory is in.
+         dir_record - The directory record to decode the children of.
+         offset - The byte offset into the directory to start at.
+         chunk_blocks - The number of blocks to read at a time, or None to
+                        read the whole directory at once.
+        Yields:
+         Tuples of the byte offset of each record into the directory, the new
+         dr.DirectoryRecord object, and the version of Rock Ridge that the
+         record uses (or None).
+        Returns:
+         Nothing.
+        '''
+        block_size = state.vd.logical_block_size()
+        length = dir_record.get_data_length()
+        base = dir_record.extent_location() * block_size
+        chunk_length = length
+        if chunk_blocks is not None:
+            chunk_length = chunk_blocks * block_size
+
+        while offset < length:
+            chunk_start = offset - (offset % block_size)
+            wanted = min(chunk_length, length - chunk_start)
+            data = self._read_walk_data(state, base + chunk_start, wanted)
+            pos = offset - chunk_start
+            while pos < wanted:
+                if pos > (len(data) - 1):
                     # The data we read off of the ISO was shorter than what we
                     # expected.  The ISO is corrupt, throw an error.
                     raise pycdlibexception.PyCdlibInvalidISO('Invalid directory record')
-                lenbyte = bytearray([data[offset]])[0]
+                lenbyte = bytearray([data[pos]])[0]
                 if lenbyte == 0:
                     # If we saw a zero length, this is probably the padding for
                     # the end of this extent.  Move the offset to the start of
                     # the next extent.
-                    padsize = block_size - (offset % block_size)
-                    if data[offset:offset + padsize] != b'\x00' * padsize:
+                    padsize = block_size - (pos % block_size)
+                    if data[pos:pos + padsize] != b'\x00' * padsize:
                         # For now we are pedantic, and if the padding bytes
                         # are not all zero we throw an Exception.  Depending
                         # one what we see in the wild, we may have to loosen
                         # this check.
                         raise pycdlibexception.PyCdlibInvalidISO('Invalid padding on ISO')
 
-                    offset = offset + padsize
+                    pos += padsize
                     continue
 
                 new_record = dr.DirectoryRecord()
-                rr = new_record.parse(vd, data[offset:offset + lenbyte],
+                rr = new_record.parse(state.vd, data[pos:pos + lenbyte],
                                       dir_record)
-                offset += lenbyte
-
-                # The parse method of dr.DirectoryRecord returns None if this
-                # record doesn't have Rock Ridge extensions, or the version of
-                # the Rock Ridge extension (as detected for this directory record).
-                self._set_rock_ridge(rr)
-
-                # Cache some properties of this record for later use.
-                is_symlink = new_record.rock_ridge is not None and new_record.rock_ridge.is_symlink()
-                dots = new_record.is_dot() or new_record.is_dotdot()
-                rr_cl = new_record.rock_ridge is not None and new_record.rock_ridge.child_link_record_exists()
-                is_dir = new_record.is_dir()
-                data_length = new_record.get_data_length()
-                new_extent_loc = new_record.extent_location()
-
-                if is_pvd and not dots and not rr_cl and not is_symlink and new_extent_loc not in all_extent_to_dr:
-                    all_extent_to_dr[new_extent_loc] = new_record
-
-                # ISO generation programs sometimes use random extent locations
-                # for zero-length files.  Thus, it is not valid for us to link
-                # zero-length files to other files, as the linkage will be
-                # essentially random.  Make sure we ignore zero-length files
-                # (which includes symlinks) for linkage.  Similarly, we don't
-                # do the lastbyte calculation on zero-length files for the same
-                # reason.
-                if not is_dir:
-                    len_to_use = data_length
-                    extent_to_use = new_extent_loc
-                    # An important side-effect of this is that zero-length files
-                    # or symlinks get an inode, but it is always set to length 0
-                    # and location 0 and not actually written out.  This is so
-                    # that we can 'link' everything through the Inode.
-                    if len_to_use == 0 or is_symlink:
-                        len_to_use = 0
-                        extent_to_use = 0
-
-                    # Directory Records that point to the El Torito Boot Catalog
-                    # do not get Inodes since all of that is handled in-memory.
-                    if self.eltorito_boot_catalog is not None and extent_to_use == self.eltorito_boot_catalog.extent_location():
-                        self.eltorito_boot_catalog.add_dirrecord(new_record)
-                    else:
-                        # For all real files, we create an inode that points to
-                        # the location on disk.
-                        if extent_to_use in extent_to_inode:
-                            ino = extent_to_inode[extent_to_use]
-                        else:
-                            ino = inode.Inode()
-                            ino.parse(extent_to_use, len_to_use, cdfp,
-                                      block_size)
-                            extent_to_inode[extent_to_use] = ino
-                            self.inodes.append(ino)
+                if self._stats is not None:
+                    self._stats.records_parsed += 1
 
-                        ino.linked_records.append(new_record)
-                        new_record.inode = ino
-
-                    new_end = extent_to_use * block_size + len_to_use
-                    if new_end > iso_file_length:
-                        # In this case, the end of the file is beyond the size
-                        # of the file.  Since this can't possibly work, truncate
-                        # the file size.
-                        new_record.inode.data_length = iso_file_length - extent_to_use * block_size
-                        for rec in new_record.inode.linked_records:
-                            rec.data_length = new_end
-                    else:
-                        # In this case, the new end is still within the file
-                        # size, but the PVD size is wrong.  Set the lastbyte
-                        # appropriately, which will eventually be used to fix
-                        # the PVD size.
-                        lastbyte = max(lastbyte, new_end)
-
-                if new_record.rock_ridge is not None and new_record.rock_ridge.dr_entries.ce_record is not None:
-                    ce_record = new_record.rock_ridge.dr_entries.ce_record
-                    orig_pos = cdfp.tell()
-                    self._seek_to_extent(ce_record.bl_cont_area)
-                    cdfp.seek(ce_record.offset_cont_area, os.SEEK_CUR)
-                    con_block = cdfp.read(ce_record.len_cont_area)
-                    new_record.rock_ridge.parse(con_block, False,
-                                                new_record.rock_ridge.bytes_to_skip,
-                                                True)
-                    cdfp.seek(orig_pos)
-                    block = self.pvd.track_rr_ce_entry(ce_record.bl_cont_area,
-                                                       ce_record.offset_cont_area,
-                                                       ce_record.len_cont_area)
-                    new_record.rock_ridge.update_ce_block(block)
-
-                if rr_cl:
-                    child_links.append(new_record)
+                yield chunk_start + pos, new_record, rr
+                pos += lenbyte
 
-                if is_dir:
-                    if new_record.rock_ridge is not None and new_record.rock_ridge.relocated_record():
-                        self._rr_moved_record = new_record
-
-                    if new_record.is_dotdot() and new_record.rock_ridge is not None and new_record.rock_ridge.parent_link_record_exists():
-                        # If this is the dotdot record, and it has a parent
-                        # link record, make sure to link up the parent link
-                        # directory record.
-                        parent_links.append(new_record)
-                    if not dots and not rr_cl:
-                        dirs.append(new_record)
-                        new_record.set_ptr(extent_to_ptr[new_extent_loc])
-
-                try_long_entry = False
-                try:
-                    new_record.parent.track_child(new_record, block_size)
-                except pycdlibexception.PyCdlibInvalidInput:
-                    # dir_record.track_child() may throw a PyCdlibInvalidInput if it
-                    # saw a duplicate child.  However, we allow duplicate children
-                    # iff this record is a file and the last child has the same name;
-                    # this means we have a very long entry.  If that is not the case,
-                    # re-raise the error, otherwise pass through to try with the
-                    # allow_duplicates flag set to True.
-                    if new_record.is_dir() or last_record is None or last_record.file_identifier() != new_record.file_identifier():
-                        raise
-                    else:
-                        try_long_entry = True
+            offset = chunk_start + pos
+
+    def _parse_ce_data(self, state, new_record):
+        '''
+        An internal method to read and parse the Rock Ridge continuation area
+        of a directory record, if it has one.
+
+        Parameters:
+         state - The _DirWalkState object for the volume descriptor that the
+                 record is in.
+         new_record - The dr.DirectoryRecord object to parse the continuation
+                      area of.
+        Returns:
+         The Rock Ridge CE record if the record has one, None otherwise.
+        '''
+        if new_record.rock_ridge is None or new_record.rock_ridge.dr_entries.ce_record is None:
+            return None
 
-                if try_long_entry:
-                    new_record.parent.track_child(new_record, block_size, True)
+        ce_record = new_record.rock_ridge.dr_entries.ce_record
+        con_block = self._read_ce_data(state, ce_record)
+        new_record.rock_ridge.parse(con_block, False,
+                                    new_record.rock_ridge.bytes_to_skip, True)
+        return ce_record
 
-                if is_pvd:
-                    if new_record.is_dir():
-                        new_level = _interchange_level_from_directory(new_record.file_identifier())
+    def _parse_directory_extent(self, state, dir_record, parent_links,
+                                child_links):
+        '''
+        An internal method to read the extent(s) belonging to a single
+        directory off of the ISO and create a dr.DirectoryRecord object for
+        each of the entries in it.  Each of the new records is tracked as a
+        child of the directory.
+
+        Parameters:
+         state - The _DirWalkState object for the volume descriptor being
+                 walked.
+         dir_record - The directory record to read the children of.
+         parent_links - A list to append directory records with Rock Ridge
+                        parent links to.
+         child_links - A list to append directory records with Rock Ridge
+                       child links to.
+        Returns:
+         A list of the subdirectories of this directory that still need to be
+         walked.
+        '''
+        cdfp = self._cdfp
+        vd = state.vd
+        is_pvd = vd.is_pvd()
+        block_size = vd.logical_block_size()
+        subdirs = []
+
+        last_record = None
+        for offset_unused, new_record, rr in self._directory_records(state, dir_record, 0, None):
+            # The parse method of dr.DirectoryRecord returns None if this
+            # record doesn't have Rock Ridge extensions, or the version of
+            # the Rock Ridge extension (as detected for this directory record).
+            self._set_rock_ridge(rr)
+
+            # Cache some properties of this record for later use.
+            is_symlink = new_record.rock_ridge is not None and new_record.rock_ridge.is_symlink()
+            dots = new_record.is_dot() or new_record.is_dotdot()
+            rr_cl = new_record.rock_ridge is not None and new_record.rock_ridge.child_link_record_exists()
+            is_dir = new_record.is_dir()
+            data_length = new_record.get_data_length()
+            new_extent_loc = new_record.extent_location()
+
+            if is_pvd and not dots and not rr_cl and not is_symlink and new_extent_loc not in state.all_extent_to_dr:
+                state.all_extent_to_dr[new_extent_loc] = new_record
+
+            # ISO generation programs sometimes use random extent locations
+            # for zero-length files.  Thus, it is not valid for us to link
+            # zero-length files to other files, as the linkage will be
+            # essentially random.  Make sure we ignore zero-length files
+            # (which includes symlinks) for linkage.  Similarly, we don't
+            # do the lastbyte calculation on zero-length files for the same
+            # reason.
+            if not is_dir:
+                len_to_use = data_length
+                extent_to_use = new_extent_loc
+                # An important side-effect of this is that zero-length files
+                # or symlinks get an inode, but it is always set to length 0
+                # and location 0 and not actually written out.  This is so
+                # that we can 'link' everything through the Inode.
+                if len_to_use == 0 or is_symlink:
+                    len_to_use = 0
+                    extent_to_use = 0
+
+                # Directory Records that point to the El Torito Boot Catalog
+                # do not get Inodes since all of that is handled in-memory.
+                if self.eltorito_boot_catalog is not None and extent_to_use == self.eltorito_boot_catalog.extent_location():
+                    self.eltorito_boot_catalog.add_dirrecord(new_record)
+                else:
+                    # For all real files, we create an inode that points to
+                    # the location on disk.
+                    if extent_to_use in state.extent_to_inode:
+                        ino = state.extent_to_inode[extent_to_use]
+                        self._claim_lazy_eltorito_inode(ino, len_to_use)
                     else:
-                        new_level = _interchange_level_from_filename(new_record.file_identifier())
-                    interchange_level = max(interchange_level, new_level)
+                        ino = inode.Inode()
+                        ino.parse(extent_to_use, len_to_use, cdfp,
+                                  block_size)
+                        state.extent_to_inode[extent_to_use] = ino
+                        self.inodes.append(ino)
+                        if self._stats is not None:
+                            self._stats.inodes_created += 1
+
+                    ino.linked_records.append(new_record)
+                    new_record.inode = ino
+
+                new_end = extent_to_use * block_size + len_to_use
+                if new_end > state.iso_file_length:
+                    # In this case, the end of the file is beyond the size
+                    # of the file.  Since this can't possibly work, truncate
+                    # the file size.
+                    new_record.inode.data_length = state.iso_file_length - extent_to_use * block_size
+                    for rec in new_record.inode.linked_records:
+                        rec.data_length = new_end
+                else:
+                    # In this case, the new end is still within the file
+                    # size, but the PVD size is wrong.  Set the lastbyte
+                    # appropriately, which will eventually be used to fix
+                    # the PVD size.
+                    state.lastbyte = max(state.lastbyte, new_end)
+
+            ce_record = self._parse_ce_data(state, new_record)
+            if ce_record is not None:
+                block = self.pvd.track_rr_ce_entry(ce_record.bl_cont_area,
+                                                   ce_record.offset_cont_area,
+                                                   ce_record.len_cont_area)
+                new_record.rock_ridge.update_ce_block(block)
+
+            if rr_cl:
+                child_links.append(new_record)
+
+            if is_dir:
+                if new_record.rock_ridge is not None and new_record.rock_ridge.relocated_record():
+                    self._rr_moved_record = new_record
+
+                if new_record.is_dotdot() and new_record.rock_ridge is not None and new_record.rock_ridge.parent_link_record_exists():
+                    # If this is the dotdot record, and it has a parent
+                    # link record, make sure to link up the parent link
+                    # directory record.
+                    parent_links.append(new_record)
+                if not dots and not rr_cl:
+                    subdirs.append(new_record)
+                    new_record.set_ptr(state.extent_to_ptr[new_extent_loc])
+
+            try_long_entry = False
+            try:
+                new_record.parent.track_child(new_record, block_size)
+            except pycdlibexception.PyCdlibInvalidInput:
+                # dir_record.track_child() may throw a PyCdlibInvalidInput if it
+                # saw a duplicate child.  However, we allow duplicate children
+                # iff this record is a file and the last child has the same name;
+                # this means we have a very long entry.  If that is not the case,
+                # re-raise the error, otherwise pass through to try with the
+                # allow_duplicates flag set to True.
+                if new_record.is_dir() or last_record is None or last_record.file_identifier() != new_record.file_identifier():
+                    raise
+                else:
+                    try_long_entry = True
+
+            if try_long_entry:
+                new_record.parent.track_child(new_record, block_size, True)
+
+            if is_pvd:
+                if new_record.is_dir():
+                    new_level = _interchange_level_from_directory(new_record.file_identifier())
+                else:
+                    new_level = _interchange_level_from_filename(new_record.file_identifier())
+                state.interchange_level = max(state.interchange_level, new_level)
+
+            last_record = new_record
+
+        return subdirs
+
+    def _read_ahead(self, state, ranges):
+        '''
+        An internal method to read a set of ranges of the ISO into the
+        read-ahead cache of a walk, merging nearby ranges so that the ISO is
+        read with a few large, ascending reads instead of many small, random
+        ones.
+
+        Parameters:
+         state - The _DirWalkState object to cache the data in.
+         ranges - An iterable of (offset, length) tuples to read.
+        Returns:
+         Nothing.
+        '''
+        for offset, length in _coalesce_ranges(ranges, _READ_AHEAD_MAX_GAP,
+                                               _READ_AHEAD_MAX_LENGTH):
+            state.read_ahead.add(offset, self._read_data(offset, length))
+
+    def _read_walk_data(self, state, offset, length):
+        '''
+        An internal method to read data for a directory walk, using the
+        read-ahead cache of the walk if the data is already there.
+
+        Parameters:
+         state - The _DirWalkState object for the walk.
+         offset - The byte offset on the ISO to start reading at.
+         length - The number of bytes to read.
+        Returns:
+         A bytes-like object containing the data.
+        '''
+        data = state.read_ahead.get(offset, length)
+        if data is None:
+            data = self._read_data(offset, length)
+        return data
+
+    def _read_ce_data(self, state, ce_record):
+        '''
+        An internal method to read the Rock Ridge continuation area pointed to
+        by a CE record.  Continuation areas are small and many records tend to
+        share a single block, so if the area hasn't already been read ahead,
+        the whole of the block(s) it is in are, and later continuation areas
+        in those blocks are served from the read-ahead cache.
+
+        Parameters:
+         state - The _DirWalkState object for the walk.
+         ce_record - The Rock Ridge CE record to read the area of.
+        Returns:
+         A bytes-like object containing the continuation area.
+        '''
+        log_block_size = self.pvd.logical_block_size()
+        offset = ce_record.bl_cont_area * log_block_size + ce_record.offset_cont_area
+        data = state.read_ahead.get(offset, ce_record.len_cont_area)
+        if data is None:
+            if self._stats is not None:
+                start = time.time()
+            num_blocks = utils.ceiling_div(ce_record.offset_cont_area + ce_record.len_cont_area,
+                                           log_block_size)
+            self._read_ahead(state, [(ce_record.bl_cont_area * log_block_size,
+                                      num_blocks * log_block_size)])
+            data = self._read_walk_data(state, offset, ce_record.len_cont_area)
+            if self._stats is not None:
+                self._stats.add_time('rock_ridge_ce', time.time() - start)
+        return data
+
+    def _walk_directories(self, vd, extent_to_ptr, extent_to_inode, path_table_records):
+        '''
+        An internal method to walk the directory records in a volume descriptor,
+        starting with the root.  For each child in the directory record,
+        we create a new dr.DirectoryRecord object and append it to the parent.
+
+        Parameters:
+         vd - The volume descriptor to walk.
+         extent_to_ptr - A dictionary mapping extents to PTRs.
+         extent_to_inode - A dictionary mapping extents to Inodes.
+         path_table_records - The list of path table records.
+        Returns:
+         The interchange level that this ISO conforms to.
+        '''
+        state = self._DirWalkState(vd, extent_to_ptr, extent_to_inode,
+                                   path_table_records, self._iso_file_length())
+
+        # The path table has the location of every directory, so read them
+        # all in extent order up front.  We don't know how long each directory
+        # is yet, but the holes between neighboring directories are read
+        # through, which covers the multi-extent ones in the common case.
+        block_size = vd.logical_block_size()
+        self._read_ahead(state, [(ptr.extent_location * block_size, block_size) for ptr in path_table_records])
+
+        root_dir_record = vd.root_directory_record()
+        root_dir_record.set_ptr(path_table_records[0])
+        parent_links = []
+        child_links = []
+        dirs = collections.deque([root_dir_record])
+        while dirs:
+            dirs.extend(self._parse_directory_extent(state, dirs.popleft(),
+                                                     parent_links,
+                                                     child_links))
+
+        for pl in parent_links:
+            pl.rock_ridge.parent_link = state.all_extent_to_dr[pl.rock_ridge.parent_link_extent()]
+
+        for cl in child_links:
+            cl.rock_ridge.cl_to_moved_dr = state.all_extent_to_dr[cl.rock_ridge.child_link_extent()]
+            cl.rock_ridge.cl_to_moved_dr.rock_ridge.moved_to_cl_dr = cl
+
+        return state.interchange_level, state.lastbyte
+
+    def _start_lazy_walk(self, vd, extent_to_ptr, path_table_records):
+        '''
+        An internal method to prepare a volume descriptor for lazy walking.
+        Only the root directory record is set up here; the directories
+        themselves are read from the ISO the first time they are needed.
+
+        Parameters:
+         vd - The volume descriptor to prepare.
+         extent_to_ptr - A dictionary mapping extents to PTRs.
+         path_table_records - The list of path table records.
+        Returns:
+         Nothing.
+        '''
+        state = self._DirWalkState(vd, extent_to_ptr,
+                                   self._lazy.extent_to_inode,
+                                   path_table_records, self._iso_file_length(),
+                                   _LAZY_READ_AHEAD_MAX_BYTES)
+        self._lazy.walk_states.append(state)
+
+        root_dir_record = vd.root_directory_record()
+        root_dir_record.set_ptr(path_table_records[0])
+        self._lazy.dirs[id(root_dir_record)] = state
+
+    def _lazy_dr_from_extent(self, state, extent):
+        '''
+        An internal method to find the directory record of the directory
+        living at a particular extent, reading in the parents of that
+        directory as necessary.  The path table is used to figure out which
+        parents need to be read.
+
+        Parameters:
+         state - The _DirWalkState object for the volume descriptor.
+         extent - The extent of the directory to find.
+        Returns:
+         The directory record for the directory at the given extent.
+        '''
+        if extent not in state.all_extent_to_dr:
+            if extent not in state.extent_to_ptr:
+                raise pycdlibexception.PyCdlibInvalidISO('Rock Ridge link to a directory not in the path table')
+            ptr = state.extent_to_ptr[extent]
+            parent_extent = state.path_table_records[ptr.parent_directory_num - 1].extent_location
+            root_dir_record = state.vd.root_directory_record()
+            if parent_extent == root_dir_record.extent_location():
+                parent = root_dir_record
+            else:
+                parent = self._lazy_dr_from_extent(state, parent_extent)
+            self._load_directory(parent)
+
+        return state.all_extent_to_dr[extent]
+
+    def _load_directory(self, rec):
+        '''
+        An internal method to make sure that the children of a directory
+        record have been read off of the ISO.  This is a no-op unless the ISO
+        was opened lazily and the directory has not yet been read.
+
+        Parameters:
+         rec - The directory record (or UDF File Entry) to load.
+        Returns:
+         Nothing.
+        '''
+        if self._lazy is None:
+            return
+
+        if isinstance(rec, udfmod.UDFFileEntry):
+            if self._lazy.udf_dirs.pop(id(rec), None) is not None:
+                for next_entry in self._parse_udf_directory(rec, self._lazy.extent_to_inode):
+                    self._lazy.udf_dirs[id(next_entry)] = next_entry
+            return
+
+        state = self._lazy.dirs.pop(id(rec), None)
+        if state is None:
+            return
 
-                last_record = new_record
+        parent_links = []
+        child_links = []
+        for subdir in self._parse_directory_extent(state, rec, parent_links,
+                                                   child_links):
+            self._lazy.dirs[id(subdir)] = state
 
         for pl in parent_links:
-            pl.rock_ridge.parent_link = all_extent_to_dr[pl.rock_ridge.parent_link_extent()]
+            pl.rock_ridge.parent_link = self._lazy_dr_from_extent(state, pl.rock_ridge.parent_link_extent())
 
         for cl in child_links:
-            cl.rock_ridge.cl_to_moved_dr = all_extent_to_dr[cl.rock_ridge.child_link_extent()]
+            cl.rock_ridge.cl_to_moved_dr = self._lazy_dr_from_extent(state, cl.rock_ridge.child_link_extent())
             cl.rock_ridge.cl_to_moved_dr.rock_ridge.moved_to_cl_dr = cl
 
-        return interchange_level, lastbyte
+    def _check_namespace_parsed(self, namespace):
+        '''
+        An internal method to make sure that a namespace was parsed when the
+        ISO was opened.
+
+        Parameters:
+         namespace - The namespace to check ('iso9660', 'joliet', or 'udf').
+        Returns:
+         Nothing.
+        '''
+        if namespace in self._skipped_namespaces:
+            raise pycdlibexception.PyCdlibInvalidInput("The '%s' namespace was not parsed when this ISO was opened" % (namespace))
+
+    def _materialize_directories(self):
+        '''
+        An internal method to read all of the directories that have not yet
+        been read off of an ISO that was opened lazily.  Once this is done, the
+        object is indistinguishable from one that was opened normally.  This
+        must be called before any operation that modifies or writes out the
+        ISO, so it also refuses to continue if parts of the ISO were skipped
+        when it was opened.
+
+        Parameters:
+         None.
+        Returns:
+         Nothing.
+        '''
+        if self._read_only:
+            raise pycdlibexception.PyCdlibInvalidInput('This ISO was opened without parsing all of it, so it cannot be modified or written out')
+
+        if self._lazy is None:
+            return
+
+        lastbyte = 0
+        for state in self._lazy.walk_states:
+            dirs = collections.deque([state.vd.root_directory_record()])
+            while dirs:
+                dir_record = dirs.popleft()
+                self._load_directory(dir_record)
+                for child in dir_record.children:
+                    if child.is_dir() and not child.is_dot() and not child.is_dotdot():
+                        if child.rock_ridge is None or not child.rock_ridge.child_link_record_exists():
+                            dirs.append(child)
+
+            if state.vd.is_pvd():
+                self.interchange_level = max(self.interchange_level,
+                                             state.interchange_level)
+                lastbyte = state.lastbyte
+
+        if self.udf_root is not None:
+            udf_file_entries = collections.deque([self.udf_root])
+            while udf_file_entries:
+                udf_file_entry = udf_file_entries.popleft()
+                self._load_directory(udf_file_entry)
+                for fi_desc in udf_file_entry.fi_descs:
+                    if not fi_desc.is_parent() and fi_desc.is_dir():
+                        udf_file_entries.append(fi_desc.file_entry)
+
+        self._lazy = None
+
+        self._fix_space_size_from_lastbyte(lastbyte)
 
     def _initialize(self):
         '''
@@ -1364,18 +2931,182 @@ class PyCdlib(object):
         self.udf_root = None
         self.udf_file_set = None
         self._needs_reshuffle = False
+        self._extent_allocator = None
+        self._incremental_layout = False
+        self._batch = None
+        self._data_lock = None
         self._rr_moved_record = None
         self._rr_moved_name = None
         self._rr_moved_rr_name = None
         self.enhanced_vd = None
         self.joliet_vd = None
-        self._find_iso_record.cache_clear()  # pylint: disable=no-member
-        self._find_rr_record.cache_clear()  # pylint: disable=no-member
-        self._find_joliet_record.cache_clear()  # pylint: disable=no-member
-        self._find_udf_record.cache_clear()  # pylint: disable=no-member
+        self._path_index.clear()
+        self._name_indices = {}
+        self._extent_index = None
+        self._full_paths = {}
         self._write_check_list = []
         self.version_vd = None
         self.inodes = []
+        self._lazy = None
+        self._skipped_namespaces = frozenset()
+        self._read_only = False
+
+    def _snapshot_key(self):
+        '''
+        An internal method to compute the key that ties a snapshot to the ISO
+        it was taken from.  The key covers the raw bytes of the volume
+        descriptors (which include the modification date and the root
+        directory record) as well as the size of the ISO.
+
+        Parameters:
+         None.
+        Returns:
+         A string containing the key.
+        '''
+        sha = hashlib.sha256()
+        offset = 16 * 2048
+        while True:
+            vd = self._read_data(offset, 2048)
+            if len(vd) != 2048:
+                break
+            (desc_type, ident) = struct.unpack_from('=B5s', vd, 0)
+            if not _is_volume_descriptor(desc_type, ident):
+                break
+            sha.update(vd)
+            offset += 2048
+
+        return '%d:%s' % (self._iso_file_length(), sha.hexdigest())
+
+    def _snapshot_state(self):
+        '''
+        An internal method to collect the parsed metadata of the ISO, in a form
+        that can be pickled.
+
+        Parameters:
+         None.
+        Returns:
+         A dictionary mapping attribute names to their values.
+        '''
+        state = {}
+        for name in self.__slots__:
+            if name in _SNAPSHOT_EXCLUDED_ATTRS or not hasattr(self, name):
+                continue
+            value = getattr(self, name)
+            if isinstance(value, self._UDFDescriptors):
+                # Nested classes can't be pickled on Python 2, so store the
+                # descriptors themselves instead.
+                value = [getattr(value, attr) for attr in self._UDFDescriptors.__slots__]
+            state[name] = value
+
+        return state
+
+    def _restore_snapshot_state(self, state):
+        '''
+        An internal method to put back the parsed metadata of the ISO, as
+        collected by _snapshot_state().
+
+        Parameters:
+         state - The dictionary mapping attribute names to their values.
+        Returns:
+         Nothing.
+        '''
+        for name, value in state.items():
+            if name in ('udf_main_descs', 'udf_reserve_descs') and value is not None:
+                descs = self._UDFDescriptors()
+                for attr, desc in zip(self._UDFDescriptors.__slots__, value):
+                    setattr(descs, attr, desc)
+                value = descs
+            setattr(self, name, value)
+
+    def _save_snapshot(self, filename, key):
+        '''
+        An internal method to save the parsed metadata of the ISO to a
+        snapshot file.  The snapshot is written to a temporary file and then
+        renamed into place, so a reader never sees a partial snapshot.  Since
+        the snapshot is only a cache, failing to write it is not an error;
+        this includes metadata that can't be pickled, and trees that are too
+        deep to pickle within the recursion limit (which in practice only
+        happens with very deep UDF trees).
+
+        Parameters:
+         filename - The name of the snapshot file to write.
+         key - The key of the ISO, as returned by _snapshot_key.
+        Returns:
+         Nothing.
+        '''
+        state = self._snapshot_state()
+
+        tmpname = '%s.tmp%d' % (filename, os.getpid())
+        try:
+            with open(tmpname, 'wb') as outfp:
+                pickler = _SnapshotPickler(outfp, self._cdfp)
+                pickler.dump((_SNAPSHOT_MAGIC, _SNAPSHOT_VERSION, key))
+                pickler.dump(state)
+            getattr(os, 'replace', os.rename)(tmpname, filename)
+        except (IOError, OSError, RuntimeError, pickle.PicklingError,
+                TypeError, AttributeError):
+            if os.path.exists(tmpname):
+                os.remove(tmpname)
+
+    def _load_snapshot(self, filename, key):
+        '''
+        An internal method to load the parsed metadata of the ISO from a
+        snapshot file, if the snapshot exists and was taken from this ISO.  A
+        snapshot that refers to anything other than the classes of the parsed
+        metadata is not loaded.
+
+        Parameters:
+         filename - The name of the snapshot file to read.
+         key - The key of the ISO, as returned by _snapshot_key.
+        Returns:
+         True if the snapshot was loaded, False otherwise.
+        '''
+        try:
+            with open(filename, 'rb') as infp:
+                unpickler = _SnapshotUnpickler(infp, self._cdfp)
+                if unpickler.load() != (_SNAPSHOT_MAGIC, _SNAPSHOT_VERSION, key):
+                    return False
+                state = unpickler.load()
+        except (IOError, OSError, EOFError, pickle.UnpicklingError,
+                AttributeError, ImportError, IndexError, KeyError, TypeError,
+                ValueError):
+            # A missing, truncated, or otherwise unreadable snapshot just
+            # means that we have to parse the ISO.
+            return False
+
+        if not isinstance(state, dict):
+            return False
+
+        self._restore_snapshot_state(state)
+
+        return True
+
+    def _parse_path_table_pair(self, vd, verify_be, mismatch_msg):
+        '''
+        An internal method to parse the little-endian path table of a volume
+        descriptor, and optionally check that the big-endian one agrees with
+        it.
+
+        Parameters:
+         vd - The volume descriptor to parse the path tables of.
+         verify_be - Whether to parse and check the big-endian path table.
+         mismatch_msg - The message to raise if the path tables disagree.
+        Returns:
+         A tuple containing the list of little-endian path table records and
+         a dictionary mapping extents to path table records.
+        '''
+        le_ptrs, extent_to_ptr = self._parse_path_table(vd.path_table_size(),
+                                                        vd.path_table_location_le)
+
+        if verify_be:
+            tmp_be_ptrs, e_unused = self._parse_path_table(vd.path_table_size(),
+                                                           vd.path_table_location_be)
+
+            for index, ptr in enumerate(le_ptrs):
+                if not ptr.equal_to_be(tmp_be_ptrs[index]):
+                    raise pycdlibexception.PyCdlibInvalidISO(mismatch_msg)
+
+        return le_ptrs, extent_to_ptr
 
     def _parse_path_table(self, ptr_size, extent):
         '''
@@ -1390,8 +3121,7 @@ class PyCdlib(object):
         Returns:
          Nothing.
         '''
-        self._seek_to_extent(extent)
-        data = self._cdfp.read(ptr_size)
+        data = self._read_data(extent * self.pvd.logical_block_size(), ptr_size)
         offset = 0
         out = []
         extent_to_ptr = {}
@@ -1437,13 +3167,13 @@ class PyCdlib(object):
         self.eltorito_boot_catalog = eltorito.EltoritoBootCatalog(br)
         eltorito_boot_catalog_extent, = struct.unpack_from('=L', br.boot_system_use[:4], 0)
 
-        old = self._cdfp.tell()
-        self._cdfp.seek(eltorito_boot_catalog_extent * self.pvd.logical_block_size())
-        data = self._cdfp.read(32)
+        offset = eltorito_boot_catalog_extent * self.pvd.logical_block_size()
+        data = self._read_data(offset, 32)
         while not self.eltorito_boot_catalog.parse(data):
-            data = self._cdfp.read(32)
-        self._cdfp.seek(old)
+            offset += 32
+            data = self._read_data(offset, 32)
 
+    @_timed_phase('reshuffle')
     def _reshuffle_extents(self):
         '''
         An internal method that is one of the keys of PyCdlib's ability to keep
@@ -1466,6 +3196,9 @@ class PyCdlib(object):
         Returns:
          Nothing.
         '''
+        if self._batch is not None:
+            self._apply_batch_accounting()
+
         current_extent = 16
         for pvd in self.pvds:
             pvd.new_extent_loc = current_extent
@@ -1745,6 +3478,9 @@ class PyCdlib(object):
             raise pycdlibexception.PyCdlibInternalError('Assigned an extent beyond the ISO (%d > %d)' % (current_extent, self.pvd.space_size))
 
         self._needs_reshuffle = False
+        self._extent_index = None
+        self._extent_allocator = _ExtentAllocator(current_extent)
+        self._incremental_layout = False
 
     def _add_child_to_dr(self, child, logical_block_size):
         '''
@@ -1774,6 +3510,9 @@ class PyCdlib(object):
         if try_long_entry:
             ret = child.parent.add_child(child, logical_block_size, True)
 
+        if self._name_indices:
+            self._name_index_add_dr(child)
+
         # The add_child() method returns True if the parent needs another extent
         # in order to fit the directory record for this child.  Add another
         # extent as appropriate here.
@@ -1795,9 +3534,10 @@ class PyCdlib(object):
          The number of bytes to remove for this directory record (this may be zero).
         '''
 
-        self._find_iso_record.cache_clear()  # pylint: disable=no-member
-        self._find_rr_record.cache_clear()  # pylint: disable=no-member
-        self._find_joliet_record.cache_clear()  # pylint: disable=no-member
+        self._path_index.discard(child)
+        self._discard_full_paths(child)
+        for name_index in self._name_indices.values():
+            name_index.discard(child)
 
         # The remove_child() method returns True if the parent no longer needs
         # the extent that the directory record for this child was on.  Remove
@@ -1953,7 +3693,36 @@ class PyCdlib(object):
                 if csum == bi_table.csum:
                     ino.add_boot_info_table(bi_table)
 
-        self._cdfp.seek(orig)
+        self._cdfp.seek(orig)
+
+    def _claim_lazy_eltorito_inode(self, ino, length):
+        '''
+        An internal method to hand an Inode that was created for a 'hidden'
+        El Torito entry over to the first directory record that is found for
+        it.  On a lazy open the El Torito entries are linked before most of
+        the directories are read, so the Inode was sized from the El Torito
+        sector count rather than from the directory record as an eager open
+        would have done; fix the length and re-check for a boot info table.
+
+        Parameters:
+         ino - The Inode that the directory record is being linked to.
+         length - The data length from the directory record.
+        Returns:
+         Nothing.
+        '''
+        if self._lazy is None or not ino.linked_records:
+            return
+
+        for rec in ino.linked_records:
+            if not isinstance(rec, eltorito.EltoritoEntry):
+                return
+
+        if ino.data_length == length:
+            return
+
+        ino.data_length = length
+        ino.boot_info_table = None
+        self._check_for_eltorito_boot_info_table(ino)
 
     def _check_rr_name(self, rr_name):
         '''
@@ -2005,7 +3774,8 @@ class PyCdlib(object):
         '''
         An internal method to link the El Torito entries into their
         corresponding Directory Records, creating new ones if they are
-        'hidden'.  Should only be called on an El Torito ISO.
+        'hidden', and then check whether the boot entries have boot info
+        tables.  Should only be called on an El Torito ISO.
 
         Parameters:
          extent_to_inode - The map that maps extents to Inodes.
@@ -2029,10 +3799,17 @@ class PyCdlib(object):
                           log_block_size)
                 extent_to_inode[entry_extent] = ino
                 self.inodes.append(ino)
+                if self._stats is not None:
+                    self._stats.inodes_created += 1
 
             ino.linked_records.append(entry)
             entry.set_inode(ino)
 
+        # Now that everything has a dirrecord, see if we have a boot info
+        # table.
+        for entry in entries_to_assign:
+            self._check_for_eltorito_boot_info_table(entry.inode)
+
     def _parse_udf_vol_descs(self, extent, length, descs):
         '''
         An internal method to parse a set of UDF Volume Descriptors.
@@ -2045,8 +3822,7 @@ class PyCdlib(object):
          Nothing.
         '''
         # Read in the Volume Descriptor Sequence
-        self._seek_to_extent(extent)
-        vd_data = self._cdfp.read(length)
+        vd_data = self._read_data(extent * self.pvd.logical_block_size(), length)
 
         # And parse it.  Since the sequence doesn't have to be in any set order,
         # and since some of the entries may be missing, we parse the Descriptor
@@ -2098,14 +3874,15 @@ class PyCdlib(object):
             offset += block_size
             current_extent += 1
 
-    def _parse_udf_descriptors(self):
+    def _parse_udf_descriptors(self, parse_reserve=True):
         '''
         An internal method to parse the UDF descriptors on the ISO.  This should
         only be called if it the ISO has a valid UDF Volume Recognition Sequence
         at the beginning of the ISO.
 
         Parameters:
-         None.
+         parse_reserve - Whether to parse the Reserve Volume Descriptor
+                         Sequence.
         Returns:
          Nothing.
         '''
@@ -2131,13 +3908,14 @@ class PyCdlib(object):
                                   self.udf_main_descs)
 
         # Parse the Reserve Volume Descriptor Sequence
-        self._parse_udf_vol_descs(self.udf_anchors[0].reserve_vd_extent,
-                                  self.udf_anchors[0].reserve_vd_length,
-                                  self.udf_reserve_descs)
+        if parse_reserve:
+            self._parse_udf_vol_descs(self.udf_anchors[0].reserve_vd_extent,
+                                      self.udf_anchors[0].reserve_vd_length,
+                                      self.udf_reserve_descs)
 
         # Parse the Logical Volume Integrity Sequence
-        self._seek_to_extent(self.udf_main_descs.logical_volume.integrity_sequence_extent)
-        integrity_data = self._cdfp.read(self.udf_main_descs.logical_volume.integrity_sequence_length)
+        integrity_data = self._read_data(self.udf_main_descs.logical_volume.integrity_sequence_extent * block_size,
+                                         self.udf_main_descs.logical_volume.integrity_sequence_length)
 
         offset = 0
         current_extent = self.udf_main_descs.logical_volume.integrity_sequence_extent
@@ -2159,9 +3937,9 @@ class PyCdlib(object):
 
         # Now look for the File Set Descriptor
         current_extent = self.udf_main_descs.partition.part_start_location
-        self._seek_to_extent(current_extent)
         # Read the data for the File Set and File Terminator together
-        file_set_and_term_data = self._cdfp.read(2 * block_size)
+        file_set_and_term_data = self._read_data(current_extent * block_size,
+                                                 2 * block_size)
 
         desc_tag = udfmod.UDFTag()
         desc_tag.parse(file_set_and_term_data[:block_size], 0)
@@ -2192,8 +3970,8 @@ class PyCdlib(object):
         Returns:
          A UDF File Entry object corresponding to the on-disk File Entry.
         '''
-        self._seek_to_extent(abs_file_entry_extent)
-        icbdata = self._cdfp.read(icb.extent_length)
+        icbdata = self._read_data(abs_file_entry_extent * self.pvd.logical_block_size(),
+                                  icb.extent_length)
 
         if all(v == 0 for v in bytearray(icbdata)):
             # We have seen ISOs in the wild (Windows 2008 Datacenter Enterprise
@@ -2212,13 +3990,105 @@ class PyCdlib(object):
 
         return file_entry
 
-    def _walk_udf_directories(self, extent_to_inode):
+    def _parse_udf_directory(self, udf_file_entry, extent_to_inode):
         '''
-        An internal method to walk a UDF filesystem and add all the metadata
-        to this object.
+        An internal method to read the File Identifier Descriptors of a single
+        UDF directory off of the ISO, along with the UDF File Entries that they
+        point to.
 
         Parameters:
+         udf_file_entry - The UDF File Entry of the directory to read.
          extent_to_inode - A map from extent numbers to Inodes.
+        Returns:
+         A list of the UDF File Entries of the subdirectories of this directory.
+        '''
+        part_start = self.udf_main_descs.partition.part_start_location
+        log_block_size = self.pvd.logical_block_size()
+        subdirs = []
+
+        for desc_len, desc_pos in udf_file_entry.alloc_descs:
+            abs_file_ident_extent = part_start + desc_pos
+            data = self._read_data(abs_file_ident_extent * log_block_size,
+                                   desc_len)
+            offset = 0
+            while offset < len(data):
+                current_extent = (abs_file_ident_extent * log_block_size + offset) // log_block_size
+
+                desc_tag = udfmod.UDFTag()
+                desc_tag.parse(data[offset:], current_extent - part_start)
+                if desc_tag.tag_ident != 257:
+                    raise pycdlibexception.PyCdlibInvalidISO('UDF File Identifier Tag identifier not 257')
+                file_ident = udfmod.UDFFileIdentifierDescriptor()
+                offset += file_ident.parse(data[offset:],
+                                           current_extent,
+                                           desc_tag,
+                                           udf_file_entry)
+                if file_ident.is_parent():
+                    # For a parent, no further work to do.
+                    udf_file_entry.track_file_ident_desc(file_ident)
+                    continue
+
+                abs_file_entry_extent = part_start + file_ident.icb.log_block_num
+                next_entry = self._parse_udf_file_entry(abs_file_entry_extent,
+                                                        file_ident.icb,
+                                                        udf_file_entry)
+
+                # For a non-parent, we delay adding this to the list of
+                # fi_descs until after we check whether this is a valid
+                # entry or not.
+                udf_file_entry.track_file_ident_desc(file_ident)
+
+                if self._stats is not None and next_entry is not None:
+                    self._stats.records_parsed += 1
+
+                if next_entry is None:
+                    if file_ident.is_dir():
+                        raise pycdlibexception.PyCdlibInvalidISO('Empty UDF File Entry for directories are not allowed')
+                    else:
+                        # If the next_entry is None, then we just skip the
+                        # rest of the code dealing with the entry and the
+                        # Inode.
+                        continue
+
+                file_ident.file_entry = next_entry
+                next_entry.file_ident = file_ident
+
+                if file_ident.is_dir():
+                    subdirs.append(next_entry)
+                else:
+                    if next_entry.get_data_length() > 0:
+                        abs_file_data_extent = part_start + next_entry.alloc_descs[0][1]
+                    else:
+                        abs_file_data_extent = 0
+                    if self.eltorito_boot_catalog is not None and abs_file_data_extent == self.eltorito_boot_catalog.extent_location():
+                        self.eltorito_boot_catalog.add_dirrecord(next_entry)
+                    else:
+                        if abs_file_data_extent in extent_to_inode:
+                            ino = extent_to_inode[abs_file_data_extent]
+                            self._claim_lazy_eltorito_inode(ino,
+                                                            next_entry.get_data_length())
+                        else:
+                            ino = inode.Inode()
+                            ino.parse(abs_file_data_extent,
+                                      next_entry.get_data_length(), self._cdfp,
+                                      log_block_size)
+                            extent_to_inode[abs_file_data_extent] = ino
+                            self.inodes.append(ino)
+                            if self._stats is not None:
+                                self._stats.inodes_created += 1
+
+                        ino.linked_records.append(next_entry)
+                        next_entry.inode = ino
+            udf_file_entry.finish_directory_parse()
+
+        return subdirs
+
+    def _parse_udf_root(self):
+        '''
+        An internal method to parse the UDF File Entry of the root directory.
+
+        Parameters:
+         None.
         Returns:
          Nothing.
         '''
@@ -2227,80 +4097,49 @@ class PyCdlib(object):
                                                    self.udf_file_set.root_dir_icb,
                                                    None)
 
-        log_block_size = self.pvd.logical_block_size()
-        udf_file_entries = collections.deque([self.udf_root])
-        while udf_file_entries:
-            udf_file_entry = udf_file_entries.popleft()
-
-            for desc_len, desc_pos in udf_file_entry.alloc_descs:
-                abs_file_ident_extent = part_start + desc_pos
-                self._seek_to_extent(abs_file_ident_extent)
-                data = self._cdfp.read(desc_len)
-                offset = 0
-                while offset < len(data):
-                    current_extent = (abs_file_ident_extent * log_block_size + offset) // log_block_size
-
-                    desc_tag = udfmod.UDFTag()
-                    desc_tag.parse(data[offset:], current_extent - part_start)
-                    if desc_tag.tag_ident != 257:
-                        raise pycdlibexception.PyCdlibInvalidISO('UDF File Identifier Tag identifier not 257')
-                    file_ident = udfmod.UDFFileIdentifierDescriptor()
-                    offset += file_ident.parse(data[offset:],
-                                               current_extent,
-                                               desc_tag,
-                                               udf_file_entry)
-                    if file_ident.is_parent():
-                        # For a parent, no further work to do.
-                        udf_file_entry.track_file_ident_desc(file_ident)
-                        continue
+    def _walk_udf_directories(self, extent_to_inode):
+        '''
+        An internal method to walk a UDF filesystem and add all the metadata
+        to this object.
 
-                    abs_file_entry_extent = part_start + file_ident.icb.log_block_num
-                    next_entry = self._parse_udf_file_entry(abs_file_entry_extent,
-                                                            file_ident.icb,
-                                                            udf_file_entry)
+        Parameters:
+         extent_to_inode - A map from extent numbers to Inodes.
+        Returns:
+         Nothing.
+        '''
+        self._parse_udf_root()
 
-                    # For a non-parent, we delay adding this to the list of
-                    # fi_descs until after we check whether this is a valid
-                    # entry or not.
-                    udf_file_entry.track_file_ident_desc(file_ident)
+        udf_file_entries = collections.deque([self.udf_root])
+        while udf_file_entries:
+            udf_file_entries.extend(self._parse_udf_directory(udf_file_entries.popleft(),
+                                                              extent_to_inode))
 
-                    if next_entry is None:
-                        if file_ident.is_dir():
-                            raise pycdlibexception.PyCdlibInvalidISO('Empty UDF File Entry for directories are not allowed')
-                        else:
-                            # If the next_entry is None, then we just skip the
-                            # rest of the code dealing with the entry and the
-                            # Inode.
-                            continue
+    def _fix_space_size_from_lastbyte(self, lastbyte):
+        '''
+        An internal method to grow the space size recorded in the volume
+        descriptors if the last byte used by any file on the ISO lies beyond it.
 
-                    file_ident.file_entry = next_entry
-                    next_entry.file_ident = file_ident
+        Parameters:
+         lastbyte - The last byte used by any file on the ISO.
+        Returns:
+         Nothing.
+        '''
+        # We've seen ISOs in the wild (Office XP) that have a PVD space size
+        # that is smaller than the location of the last directory record
+        # extent + length.  If we see this, automatically update the size in the
+        # PVD (and any SVDs) so that subsequent operations will be correct.
+        log_block_size = self.pvd.logical_block_size()
+        if lastbyte > self.pvd.space_size * log_block_size:
+            new_pvd_size = utils.ceiling_div(lastbyte, log_block_size)
+            for pvd in self.pvds:
+                pvd.space_size = new_pvd_size
+            if self.joliet_vd is not None:
+                self.joliet_vd.space_size = new_pvd_size
+            if self.enhanced_vd is not None:
+                self.enhanced_vd.space_size = new_pvd_size
 
-                    if file_ident.is_dir():
-                        udf_file_entries.append(next_entry)
-                    else:
-                        if next_entry.get_data_length() > 0:
-                            abs_file_data_extent = part_start + next_entry.alloc_descs[0][1]
-                        else:
-                            abs_file_data_extent = 0
-                        if self.eltorito_boot_catalog is not None and abs_file_data_extent == self.eltorito_boot_catalog.extent_location():
-                            self.eltorito_boot_catalog.add_dirrecord(next_entry)
-                        else:
-                            if abs_file_data_extent in extent_to_inode:
-                                ino = extent_to_inode[abs_file_data_extent]
-                            else:
-                                ino = inode.Inode()
-                                ino.parse(abs_file_data_extent,
-                                          next_entry.get_data_length(), self._cdfp,
-                                          log_block_size)
-                                extent_to_inode[abs_file_data_extent] = ino
-                                self.inodes.append(ino)
-
-                            ino.linked_records.append(next_entry)
-                            next_entry.inode = ino
-                udf_file_entry.finish_directory_parse()
-
-    def _open_fp(self, fp):
+    def _open_fp(self, fp, lazy=False, snapshot=None, namespaces=None,
+                 verify_redundant=True):
         '''
         An internal method to open an existing ISO for inspection and
         modification.  Note that the file object passed in here must stay open
@@ -2309,49 +4148,78 @@ class PyCdlib(object):
 
         Parameters:
          fp - The file object containing the ISO to open up.
+         lazy - Whether to delay reading directories until they are needed.
+         snapshot - The name of a snapshot file to load the metadata from (and
+                    to save it to if it is missing or stale), or None.
+         namespaces - The namespaces to parse, or None to parse all of them.
+         verify_redundant - Whether to parse and check the redundant copies of
+                            the metadata.
         Returns:
          Nothing.
         '''
         if hasattr(fp, 'mode') and 'b' not in fp.mode:
             raise pycdlibexception.PyCdlibInvalidInput("The file to open must be in binary mode (add 'b' to the open flags)")
 
-        self._cdfp = fp
+        if lazy and snapshot is not None:
+            raise pycdlibexception.PyCdlibInvalidInput('Only one of lazy and snapshot can be used')
+
+        if namespaces is None:
+            namespaces = _NAMESPACES
+        for namespace in namespaces:
+            if namespace not in _NAMESPACES:
+                raise pycdlibexception.PyCdlibInvalidInput("Invalid namespace '%s'; must be one of 'iso9660', 'joliet', or 'udf'" % (namespace))
+        self._skipped_namespaces = frozenset(_NAMESPACES) - frozenset(namespaces)
 
-        # Get the Primary Volume Descriptor (pvd), the set of Supplementary
-        # Volume Descriptors (svds), the set of Volume Partition
-        # Descriptors (vpds), the set of Boot Records (brs), and the set of
-        # Volume Descriptor Set Terminators (vdsts)
-        self._parse_volume_descriptors()
+        self._cdfp = fp
+        if self._stats is not None:
+            self._cdfp = _StatsFile(fp, self._stats)
+
+        if snapshot is not None:
+            with self._phase('snapshot_load'):
+                snapshot_key = self._snapshot_key()
+                if self._skipped_namespaces or not verify_redundant:
+                    # A snapshot of part of an ISO must never be loaded by an
+                    # open that wants more of it.
+                    snapshot_key += ':%s:%s' % (','.join(sorted(self._skipped_namespaces)),
+                                                verify_redundant)
+                loaded = self._load_snapshot(snapshot, snapshot_key)
+            if loaded:
+                self._initialized = True
+                return
 
-        old = self._cdfp.tell()
-        self._cdfp.seek(0)
-        tmp_mbr = isohybrid.IsoHybrid()
-        if tmp_mbr.parse(self._cdfp.read(512)):
-            # We only save the object if it turns out to be a valid IsoHybrid
-            self.isohybrid_mbr = tmp_mbr
-        self._cdfp.seek(old)
+        with self._phase('volume_descriptors'):
+            # Get the Primary Volume Descriptor (pvd), the set of
+            # Supplementary Volume Descriptors (svds), the set of Volume
+            # Partition Descriptors (vpds), the set of Boot Records (brs), and
+            # the set of Volume Descriptor Set Terminators (vdsts)
+            self._parse_volume_descriptors()
+
+            old = self._cdfp.tell()
+            self._cdfp.seek(0)
+            tmp_mbr = isohybrid.IsoHybrid()
+            if tmp_mbr.parse(self._cdfp.read(512)):
+                # We only save the object if it turns out to be a valid
+                # IsoHybrid
+                self.isohybrid_mbr = tmp_mbr
+            self._cdfp.seek(old)
 
         if self.pvd.application_use[141:149] == b'CD-XA001':
             self.xa = True
 
-        for br in self.brs:
-            self._check_and_parse_eltorito(br)
-
-        # Now that we have the PVD, parse the Path Tables according to Ecma-119
-        # section 9.4.  We want to ensure that the big endian versions agree
-        # with the little endian ones (to make sure it is a valid ISO).
-
-        # Little Endian first
-        le_ptrs, extent_to_ptr = self._parse_path_table(self.pvd.path_table_size(),
-                                                        self.pvd.path_table_location_le)
-
-        # Big Endian next.
-        tmp_be_ptrs, e_unused = self._parse_path_table(self.pvd.path_table_size(),
-                                                       self.pvd.path_table_location_be)
-
-        for index, ptr in enumerate(le_ptrs):
-            if not ptr.equal_to_be(tmp_be_ptrs[index]):
-                raise pycdlibexception.PyCdlibInvalidISO('Little-endian and big-endian path table records do not agree')
+        with self._phase('eltorito'):
+            for br in self.brs:
+                self._check_and_parse_eltorito(br)
+
+        parse_iso9660 = 'iso9660' not in self._skipped_namespaces
+        if parse_iso9660:
+            # Now that we have the PVD, parse the Path Tables according to
+            # Ecma-119 section 9.4.  We want to ensure that the big endian
+            # versions agree with the little endian ones (to make sure it is a
+            # valid ISO).
+            with self._phase('path_tables'):
+                le_ptrs, extent_to_ptr = self._parse_path_table_pair(self.pvd,
+                                                                     verify_redundant,
+                                                                     'Little-endian and big-endian path table records do not agree')
 
         self.interchange_level = 1
         for svd in self.svds:
@@ -2361,16 +4229,32 @@ class PyCdlib(object):
 
         extent_to_inode = {}
 
-        # OK, so now that we have the PVD, we start at its root directory
-        # record and find all of the files
-        ic_level, lastbyte = self._walk_directories(self.pvd, extent_to_ptr,
-                                                    extent_to_inode, le_ptrs)
+        lastbyte = 0
+        if lazy:
+            self._lazy = self._LazyParseState(extent_to_inode)
+
+        if not parse_iso9660:
+            pass
+        elif lazy:
+            # In lazy mode we only read the root directory up front (so that
+            # we know whether this is a Rock Ridge ISO); everything else is
+            # read the first time it is looked at.
+            with self._phase('walk_iso9660'):
+                self._start_lazy_walk(self.pvd, extent_to_ptr, le_ptrs)
+                self._load_directory(self.pvd.root_directory_record())
+        else:
+            # OK, so now that we have the PVD, we start at its root directory
+            # record and find all of the files
+            with self._phase('walk_iso9660'):
+                ic_level, lastbyte = self._walk_directories(self.pvd, extent_to_ptr,
+                                                            extent_to_inode, le_ptrs)
 
-        self.interchange_level = max(self.interchange_level, ic_level)
+            self.interchange_level = max(self.interchange_level, ic_level)
 
         # On El Torito ISOs, after we have walked the directories we look
         # to see if all of the entries in El Torito have corresponding
-        # directory records.  If they don't, then it may be the case that
+        # directory records (in lazy mode, only the root directory has been
+        # walked at this point).  If they don't, then it may be the case that
         # the El Torito bits of the system are 'hidden' or 'unlinked',
         # meaning that they take up space but have no corresponding directory
         # record in the ISO filesystem.  In order to accommodate the rest
@@ -2382,15 +4266,9 @@ class PyCdlib(object):
         # parent might have.  This means that if we do ever want to unhide this
         # entry, we'll have to do some additional work to give it a real name
         # and link it to the appropriate parent.
-        if self.eltorito_boot_catalog is not None:
-            self._link_eltorito(extent_to_inode)
-
-            # Now that everything has a dirrecord, see if we have a boot
-            # info table.
-            self._check_for_eltorito_boot_info_table(self.eltorito_boot_catalog.initial_entry.inode)
-            for sec in self.eltorito_boot_catalog.sections:
-                for entry in sec.section_entries:
-                    self._check_for_eltorito_boot_info_table(entry.inode)
+        if self.eltorito_boot_catalog is not None and parse_iso9660:
+            with self._phase('eltorito'):
+                self._link_eltorito(extent_to_inode)
 
         # The PVD is finished.  Now look to see if we need to parse the SVD.
         for svd in self.svds:
@@ -2400,45 +4278,57 @@ class PyCdlib(object):
 
                 self.joliet_vd = svd
 
-                le_ptrs, joliet_extent_to_ptr = self._parse_path_table(svd.path_table_size(),
-                                                                       svd.path_table_location_le)
-
-                tmp_be_ptrs, j_unused = self._parse_path_table(svd.path_table_size(),
-                                                               svd.path_table_location_be)
+                if 'joliet' in self._skipped_namespaces:
+                    continue
 
-                for index, ptr in enumerate(le_ptrs):
-                    if not ptr.equal_to_be(tmp_be_ptrs[index]):
-                        raise pycdlibexception.PyCdlibInvalidISO('Joliet little-endian and big-endian path table records do not agree')
+                with self._phase('path_tables'):
+                    le_ptrs, joliet_extent_to_ptr = self._parse_path_table_pair(svd,
+                                                                                verify_redundant,
+                                                                                'Joliet little-endian and big-endian path table records do not agree')
 
-                self._walk_directories(svd, joliet_extent_to_ptr,
-                                       extent_to_inode, le_ptrs)
+                if lazy:
+                    self._start_lazy_walk(svd, joliet_extent_to_ptr, le_ptrs)
+                else:
+                    with self._phase('walk_joliet'):
+                        self._walk_directories(svd, joliet_extent_to_ptr,
+                                               extent_to_inode, le_ptrs)
             elif svd.version == 2 and svd.file_structure_version == 2:
                 if self.enhanced_vd is not None:
                     raise pycdlibexception.PyCdlibInvalidISO('Only a single enhanced VD is supported')
                 self.enhanced_vd = svd
 
-        # We've seen ISOs in the wild (Office XP) that have a PVD space size
-        # that is smaller than the location of the last directory record
-        # extent + length.  If we see this, automatically update the size in the
-        # PVD (and any SVDs) so that subsequent operations will be correct.
-        log_block_size = self.pvd.logical_block_size()
-        if lastbyte > self.pvd.space_size * log_block_size:
-            new_pvd_size = utils.ceiling_div(lastbyte, log_block_size)
-            for pvd in self.pvds:
-                pvd.space_size = new_pvd_size
-            if self.joliet_vd is not None:
-                self.joliet_vd.space_size = new_pvd_size
-            if self.enhanced_vd is not None:
-                self.enhanced_vd.space_size = new_pvd_size
-
         # Look to see if this is a UDF volume.  It is one if we have a UDF BEA,
         # UDF NSR, and UDF TEA, in which case we parse the UDF descriptors and
         # walk the filesystem.
         if self.udf_bea is not None and self.udf_nsr is not None and self.udf_tea is not None:
             self.udf_main_descs = self._UDFDescriptors()
             self.udf_reserve_descs = self._UDFDescriptors()
-            self._parse_udf_descriptors()
-            self._walk_udf_directories(extent_to_inode)
+            with self._phase('udf_descriptors'):
+                self._parse_udf_descriptors(verify_redundant)
+            if not verify_redundant:
+                # Without the reserve descriptors we can't write the ISO back
+                # out.
+                self._read_only = True
+            if 'udf' in self._skipped_namespaces:
+                pass
+            elif lazy:
+                with self._phase('walk_udf'):
+                    self._parse_udf_root()
+                self._lazy.udf_dirs[id(self.udf_root)] = self.udf_root
+            else:
+                with self._phase('walk_udf'):
+                    self._walk_udf_directories(extent_to_inode)
+
+        if self.eltorito_boot_catalog is not None and not parse_iso9660:
+            # Without the ISO9660 tree, the boot files can only be found
+            # through the Joliet and UDF trees, so wait for those.
+            with self._phase('eltorito'):
+                self._link_eltorito(extent_to_inode)
+
+        self._fix_space_size_from_lastbyte(lastbyte)
+
+        if self._skipped_namespaces:
+            self._read_only = True
 
         # Now we look for the 'version' volume descriptor, common on ISOs made
         # with genisoimage or mkisofs.  This volume descriptor doesn't have any
@@ -2451,11 +4341,16 @@ class PyCdlib(object):
         if self.udf_bea is not None and self.udf_nsr is not None and self.udf_tea is not None:
             version_vd_extent = self.udf_tea.extent_location() + 1
 
+        log_block_size = self.pvd.logical_block_size()
         version_vd = headervd.VersionVolumeDescriptor()
         self._cdfp.seek(version_vd_extent * log_block_size)
         if version_vd.parse(self._cdfp.read(log_block_size), version_vd_extent):
             self.version_vd = version_vd
 
+        if snapshot is not None:
+            with self._phase('snapshot_save'):
+                self._save_snapshot(snapshot, snapshot_key)
+
         self._initialized = True
 
     def _get_and_write_fp(self, iso_path, outfp, blocksize):
@@ -2657,9 +4552,23 @@ class PyCdlib(object):
 
         outfp.seek(ino.extent_location() * log_block_size)
         tmp_start = outfp.tell()
-        with inode.InodeOpenData(ino, log_block_size) as (data_fp, data_len):
-            utils.copy_data(data_len, blocksize, data_fp, outfp)
-            utils.zero_pad(outfp, data_len, log_block_size)
+
+        # The file objects that clones share with each other are positioned
+        # by seeking, so clones that are written out in parallel have to take
+        # turns copying from them.  Files that this object opened itself are
+        # not shared.
+        lock = self._data_lock
+        if ino.manage_fp or (self._managing_fp and ino.data_fp is self._cdfp):
+            lock = None
+        if lock is not None:
+            lock.acquire()
+        try:
+            with inode.InodeOpenData(ino, log_block_size) as (data_fp, data_len):
+                utils.copy_data(data_len, blocksize, data_fp, outfp)
+                utils.zero_pad(outfp, data_len, log_block_size)
+        finally:
+            if lock is not None:
+                lock.release()
 
         if self._track_writes:
             end = outfp.tell()
@@ -2783,6 +4692,7 @@ class PyCdlib(object):
         self._outfp_write_with_check(outfp, rec)
         progress.call(len(rec))
 
+    @_timed_phase('write')
     def _write_fp(self, outfp, blocksize, progress_cb, progress_opaque):
         '''
         Write a properly formatted ISO out to the file object passed in.  This
@@ -2801,7 +4711,9 @@ class PyCdlib(object):
         if hasattr(outfp, 'mode') and 'b' not in outfp.mode:
             raise pycdlibexception.PyCdlibInvalidInput("The file to write out must be in binary mode (add 'b' to the open flags)")
 
-        if self._needs_reshuffle:
+        self._materialize_directories()
+
+        if self._needs_reshuffle or self._incremental_layout:
             self._reshuffle_extents()
 
         self._write_check_list = []
@@ -3036,7 +4948,8 @@ class PyCdlib(object):
 
         return 0
 
-    def _finish_add(self, num_bytes_to_add, num_partition_bytes_to_add):
+    def _finish_add(self, num_bytes_to_add, num_partition_bytes_to_add,
+                    new_inodes=None):
         '''
         An internal method to do all of the accounting needed whenever
         something is added to the ISO.  This method should only be called by
@@ -3047,9 +4960,23 @@ class PyCdlib(object):
                             descriptors.
          num_partition_bytes_to_add - The number of additional bytes to add to
                                       the partition if this is a UDF file.
+         new_inodes - The Inodes of the files that were added, if the caller
+                      added nothing but files; this lets a consistent ISO
+                      place their data without being laid out again.
         Returns:
          Nothing.
         '''
+        if self._batch is not None:
+            log_block_size = self.pvd.logical_block_size()
+            self._batch.space_extents += utils.ceiling_div(num_bytes_to_add + num_partition_bytes_to_add,
+                                                           log_block_size)
+            if self.udf_root is not None:
+                self._batch.partition_extents += utils.ceiling_div(num_partition_bytes_to_add,
+                                                                   log_block_size)
+            self._batch.changed = True
+            self._needs_reshuffle = True
+            return
+
         for pvd in self.pvds:
             pvd.add_to_space_size(num_bytes_to_add + num_partition_bytes_to_add)
         if self.joliet_vd is not None:
@@ -3067,11 +4994,13 @@ class PyCdlib(object):
             self.udf_logical_volume_integrity.size_table += num_extents_to_add
 
         if self._always_consistent:
-            self._reshuffle_extents()
+            if not self._place_inodes(new_inodes, num_bytes_to_add + num_partition_bytes_to_add):
+                self._reshuffle_extents()
         else:
             self._needs_reshuffle = True
 
-    def _finish_remove(self, num_bytes_to_remove, is_partition):
+    def _finish_remove(self, num_bytes_to_remove, is_partition,
+                       freed_inodes=None):
         '''
         An internal method to do all of the accounting needed whenever
         something is removed from the ISO.  This method should only be called
@@ -3080,9 +5009,23 @@ class PyCdlib(object):
         Parameters:
          num_bytes_to_remove - The number of additional bytes to remove from the descriptors.
          is_partition - Whether these bytes are part of a UDF partition.
+         freed_inodes - The Inodes that are no longer used, if the caller
+                        removed nothing but files; this lets a consistent ISO
+                        give their extents back without being laid out again.
         Returns:
          Nothing.
         '''
+        if self._batch is not None:
+            log_block_size = self.pvd.logical_block_size()
+            self._batch.space_extents -= utils.ceiling_div(num_bytes_to_remove,
+                                                           log_block_size)
+            if self.udf_root is not None and is_partition:
+                self._batch.partition_extents -= utils.ceiling_div(num_bytes_to_remove,
+                                                                   log_block_size)
+            self._batch.changed = True
+            self._needs_reshuffle = True
+            return
+
         for pvd in self.pvds:
             pvd.remove_from_space_size(num_bytes_to_remove)
         if self.joliet_vd is not None:
@@ -3100,10 +5043,252 @@ class PyCdlib(object):
             self.udf_logical_volume_integrity.size_table -= num_extents_to_remove
 
         if self._always_consistent:
-            self._reshuffle_extents()
+            if not self._free_inodes(freed_inodes, num_bytes_to_remove):
+                self._reshuffle_extents()
         else:
             self._needs_reshuffle = True
 
+    def _can_lay_out_incrementally(self, inodes, num_bytes):
+        '''
+        An internal method to check whether a change to a consistent ISO can be
+        applied to its layout without laying out the whole ISO again.  That is
+        the case when the only space that the change added or removed is the
+        data of the given Inodes, so none of the metadata moves.
+
+        Parameters:
+         inodes - The Inodes whose data was added or removed, or None if the
+                  change was not limited to files.
+         num_bytes - The number of bytes that the change added or removed.
+        Returns:
+         True if the change can be applied incrementally, False otherwise.
+        '''
+        if inodes is None or self._extent_allocator is None:
+            return False
+
+        # UDF File Entries take up an extent each, and the last UDF anchor has
+        # to stay at the end of the ISO, so UDF ISOs are always laid out again.
+        if self.udf_root is not None:
+            return False
+
+        log_block_size = self.pvd.logical_block_size()
+        num_extents = sum([utils.ceiling_div(ino.get_data_length(), log_block_size) for ino in inodes])
+        return utils.ceiling_div(num_bytes, log_block_size) == num_extents
+
+    def _place_inodes(self, new_inodes, num_bytes_added):
+        '''
+        An internal method to give extents to the data of newly added files on
+        a consistent ISO, without laying out the whole ISO again.  The data is
+        put in the first free range that it fits in, or past the end of the
+        ISO, so the layout is not the one that _reshuffle_extents() would
+        produce; the ISO is laid out in full before it is written out.
+
+        Parameters:
+         new_inodes - The Inodes of the files that were added, or None.
+         num_bytes_added - The number of bytes that were added to the ISO.
+        Returns:
+         True if the Inodes were placed, False if the ISO has to be laid out
+         again.
+        '''
+        if not self._can_lay_out_incrementally(new_inodes, num_bytes_added):
+            return False
+
+        ce_records = []
+        for ino in new_inodes:
+            for rec in ino.linked_records:
+                if rec.rock_ridge is not None and rec.rock_ridge.dr_entries.ce_record is not None:
+                    if rec.rock_ridge.ce_block.extent_location() is None:
+                        # The continuation block has not been placed yet.
+                        return False
+                    ce_records.append(rec)
+
+        log_block_size = self.pvd.logical_block_size()
+        for ino in new_inodes:
+            if ino.get_data_length() == 0:
+                # Zero-length files don't take up any extents; see
+                # _reassign_vd_dirrecord_extents().
+                for rec in ino.linked_records:
+                    rec.set_data_location(0, 0)
+                continue
+
+            extent = self._extent_allocator.allocate(utils.ceiling_div(ino.get_data_length(),
+                                                                       log_block_size))
+            ino.set_location(extent)
+            for rec in ino.linked_records:
+                rec.set_data_location(extent, extent)
+
+        for rec in ce_records:
+            rec.rock_ridge.dr_entries.ce_record.update_extent(rec.rock_ridge.ce_block.extent_location())
+
+        self._incremental_layout = True
+        self._extent_index = None
+        return True
+
+    def _free_inodes(self, freed_inodes, num_bytes_removed):
+        '''
+        An internal method to give back the extents of the data of removed
+        files on a consistent ISO, without laying out the whole ISO again.
+
+        Parameters:
+         freed_inodes - The Inodes that are no longer used, or None.
+         num_bytes_removed - The number of bytes that were removed from the
+                             ISO.
+        Returns:
+         True if the extents were given back, False if the ISO has to be laid
+         out again.
+        '''
+        if not self._can_lay_out_incrementally(freed_inodes, num_bytes_removed):
+            return False
+
+        log_block_size = self.pvd.logical_block_size()
+        for ino in freed_inodes:
+            if ino.get_data_length() > 0:
+                self._extent_allocator.free(ino.extent_location(),
+                                            utils.ceiling_div(ino.get_data_length(),
+                                                              log_block_size))
+
+        self._incremental_layout = True
+        self._extent_index = None
+        return True
+
+    def _begin_batch(self, rollback):
+        '''
+        An internal method to start a batch of changes to the ISO.  If the
+        batch can be rolled back, a copy of the parsed metadata and of the
+        size accounting collected so far is saved (see _copy_metadata()).  A
+        batch started inside of another one becomes part of it, but keeps its
+        own saved state.
+
+        Parameters:
+         rollback - Whether to save the state so that the batch can be rolled
+                    back.
+        Returns:
+         Nothing.
+        '''
+        saved_state = None
+        if rollback:
+            # The state is saved in full, so every directory has to be in it.
+            self._materialize_directories()
+            saved_state = _copy_metadata(self._snapshot_state())
+
+        if self._batch is None:
+            self._batch = self._BatchState()
+
+        batch = self._batch
+        if saved_state is not None:
+            saved_state = (saved_state, batch.space_extents,
+                           batch.partition_extents, batch.changed)
+        batch.savepoints.append(saved_state)
+
+    def _apply_batch_accounting(self):
+        '''
+        An internal method to apply the size accounting that the changes in
+        the current batch have collected so far.
+
+        Parameters:
+         None.
+        Returns:
+         Nothing.
+        '''
+        batch = self._batch
+        log_block_size = self.pvd.logical_block_size()
+        vds = list(self.pvds)
+        if self.joliet_vd is not None:
+            vds.append(self.joliet_vd)
+        for vd in vds:
+            if batch.space_extents > 0:
+                vd.add_to_space_size(batch.space_extents * log_block_size)
+            elif batch.space_extents < 0:
+                vd.remove_from_space_size(-batch.space_extents * log_block_size)
+
+        if self.enhanced_vd is not None:
+            self.enhanced_vd.copy_sizes(self.pvd)
+
+        if self.udf_root is not None:
+            self.udf_main_descs.partition.part_length += batch.partition_extents
+            self.udf_reserve_descs.partition.part_length += batch.partition_extents
+            self.udf_logical_volume_integrity.size_table += batch.partition_extents
+
+        batch.space_extents = 0
+        batch.partition_extents = 0
+
+    def _end_batch(self, failed):
+        '''
+        An internal method to end a batch of changes to the ISO.  If the batch
+        failed and can be rolled back, the ISO is put back the way it was when
+        the batch started; if it can't, the changes that were made are kept.
+        When the outermost batch ends, the size accounting is applied and an
+        always consistent ISO is laid out once.
+
+        Parameters:
+         failed - Whether the batch ended with an exception.
+        Returns:
+         Nothing.
+        '''
+        batch = self._batch
+        if batch is None:
+            # The object was closed inside of the batch.
+            return
+
+        saved_state = batch.savepoints.pop()
+        rolled_back = failed and saved_state is not None
+        if rolled_back:
+            (state, batch.space_extents, batch.partition_extents,
+             batch.changed) = saved_state
+            self._restore_snapshot_state(state)
+            self._path_index.clear()
+            self._name_indices = {}
+            self._full_paths = {}
+            self._extent_index = None
+            self._extent_allocator = None
+            self._incremental_layout = False
+
+        if batch.savepoints:
+            return
+
+        self._apply_batch_accounting()
+        self._batch = None
+
+        if (batch.changed or rolled_back) and self._always_consistent:
+            self._reshuffle_extents()
+
+    def _add_udf_file_entry(self, data_ino, length, udf_name, udf_parent):
+        '''
+        An internal method to add a UDF File Entry for a file to the ISO.  The
+        caller is responsible for linking the new File Entry to the Inode.
+
+        Parameters:
+         data_ino - The Inode holding the data of the file, or None.
+         length - The length of the data of the file.
+         udf_name - The name of the new file.
+         udf_parent - The UDF File Entry of the directory to add the file to.
+        Returns:
+         A tuple containing the new UDF File Entry and the number of bytes to
+         add to the descriptors.
+        '''
+        log_block_size = self.pvd.logical_block_size()
+
+        num_bytes_to_add = 0
+        file_ident = udfmod.UDFFileIdentifierDescriptor()
+        file_ident.new(False, False, udf_name, udf_parent)
+        num_new_extents = udf_parent.add_file_ident_desc(file_ident, log_block_size)
+        num_bytes_to_add += num_new_extents * log_block_size
+        if 'udf' in self._name_indices:
+            self._name_index_add_udf(file_ident)
+
+        file_entry = udfmod.UDFFileEntry()
+        file_entry.new(length, 'file', udf_parent, log_block_size)
+        file_ident.file_entry = file_entry
+        file_entry.file_ident = file_ident
+        if data_ino is None or data_ino.num_udf == 0:
+            num_bytes_to_add += log_block_size
+
+        if data_ino is not None:
+            data_ino.num_udf += 1
+
+        self.udf_logical_volume_integrity.logical_volume_impl_use.num_files += 1
+
+        return file_entry, num_bytes_to_add
+
     def _add_hard_link_to_rec(self, old_rec, boot_catalog_old, **kwargs):
         '''
         Add a hard link to the ISO.  Hard links are alternate names for the
@@ -3185,30 +5370,12 @@ class PyCdlib(object):
             if self.udf_root is None:
                 raise pycdlibexception.PyCdlibInvalidInput('Can only specify a udf_path for a UDF ISO')
 
-            log_block_size = self.pvd.logical_block_size()
-
             # UDF new path
             (udf_name, udf_parent) = self._name_and_parent_from_path(udf_path=udf_new_path)
-
-            file_ident = udfmod.UDFFileIdentifierDescriptor()
-            file_ident.new(False, False, udf_name, udf_parent)
-            num_new_extents = udf_parent.add_file_ident_desc(file_ident, log_block_size)
-            num_bytes_to_add += num_new_extents * log_block_size
-
-            file_entry = udfmod.UDFFileEntry()
-            file_entry.new(old_rec.get_data_length(), 'file', udf_parent,
-                           log_block_size)
-            file_ident.file_entry = file_entry
-            file_entry.file_ident = file_ident
-            if data_ino is None or data_ino.num_udf == 0:
-                num_bytes_to_add += log_block_size
-
-            if data_ino is not None:
-                data_ino.num_udf += 1
-
-            new_rec = file_entry
-
-            self.udf_logical_volume_integrity.logical_volume_impl_use.num_files += 1
+            (new_rec, num_bytes) = self._add_udf_file_entry(data_ino,
+                                                            old_rec.get_data_length(),
+                                                            udf_name, udf_parent)
+            num_bytes_to_add += num_bytes
 
         if data_ino is not None:
             data_ino.linked_records.append(new_rec)
@@ -3219,34 +5386,24 @@ class PyCdlib(object):
 
         return num_bytes_to_add
 
-    def _add_fp(self, fp, length, manage_fp, iso_path, rr_name, joliet_path,
-                udf_path, file_mode, eltorito_catalog):
+    def _check_new_file(self, fp, iso_path, rr_name, joliet_path, udf_path,
+                        file_mode):
         '''
-        An internal method to add a file to the ISO.  If the ISO contains Rock
-        Ridge, then a Rock Ridge name must be provided.  If the ISO contains
-        Joliet, then a Joliet path is not required but is highly recommended.
-        Note that the caller must ensure that the file remains open for the
-        lifetime of the ISO object, as the PyCdlib class uses the file
-        descriptor internally when writing (mastering) the ISO.
-
-        Parameters:
-         fp - The file object to use for the contents of the new file.
-         length - The length of the data for the new file.
-         manage_fp - Whether or not pycdlib should internally manage the file
-                     pointer.  It is faster to manage the file pointer
-                     externally, but it is more convenient to have pycdlib do it
-                     internally.
+        An internal method to check the arguments for a file that is about to
+        be added to the ISO, and to look up where it goes.
+
+        Parameters:
+         fp - The file object (or file name) to use for the contents of the
+              new file.
          iso_path - The ISO9660 absolute path to the file destination on the ISO.
          rr_name - The Rock Ridge name of the file destination on the ISO.
          joliet_path - The Joliet absolute path to the file destination on the ISO.
          udf_path - The UDF absolute path to the file destination on the ISO.
-         file_mode - The POSIX file_mode to apply to this file.  This only
-                     applies if this is a Rock Ridge ISO.  If this is None (the
-                     default), the permissions from the original file are used.
+         file_mode - The POSIX file_mode to apply to this file.
         Returns:
-         The number of bytes to add to the descriptors.
+         A tuple containing the ISO9660 name of the new file, the parent
+         Directory Record, the checked Rock Ridge name, and the file mode.
         '''
-
         iso_path = utils.normpath(iso_path)
 
         rr_name = self._check_rr_name(rr_name)
@@ -3283,6 +5440,41 @@ class PyCdlib(object):
                     # a conservative 444
                     file_mode = 0o0100444
 
+        return name, parent, rr_name, file_mode
+
+    def _add_fp(self, fp, length, manage_fp, iso_path, rr_name, joliet_path,
+                udf_path, file_mode, eltorito_catalog):
+        '''
+        An internal method to add a file to the ISO.  If the ISO contains Rock
+        Ridge, then a Rock Ridge name must be provided.  If the ISO contains
+        Joliet, then a Joliet path is not required but is highly recommended.
+        Note that the caller must ensure that the file remains open for the
+        lifetime of the ISO object, as the PyCdlib class uses the file
+        descriptor internally when writing (mastering) the ISO.
+
+        Parameters:
+         fp - The file object to use for the contents of the new file.
+         length - The length of the data for the new file.
+         manage_fp - Whether or not pycdlib should internally manage the file
+                     pointer.  It is faster to manage the file pointer
+                     externally, but it is more convenient to have pycdlib do it
+                     internally.
+         iso_path - The ISO9660 absolute path to the file destination on the ISO.
+         rr_name - The Rock Ridge name of the file destination on the ISO.
+         joliet_path - The Joliet absolute path to the file destination on the ISO.
+         udf_path - The UDF absolute path to the file destination on the ISO.
+         file_mode - The POSIX file_mode to apply to this file.  This only
+                     applies if this is a Rock Ridge ISO.  If this is None (the
+                     default), the permissions from the original file are used.
+        Returns:
+         The number of bytes to add to the descriptors.
+        '''
+        (name, parent, rr_name, file_mode) = self._check_new_file(fp, iso_path,
+                                                                   rr_name,
+                                                                   joliet_path,
+                                                                   udf_path,
+                                                                   file_mode)
+
         left = length
         offset = 0
         done = False
@@ -3334,6 +5526,141 @@ class PyCdlib(object):
 
         return num_bytes_to_add
 
+    def _add_fps(self, entries, manage_fp):
+        '''
+        An internal method to add many files to the ISO at once.  The new
+        Directory Records are gathered up by parent, and each parent has all of
+        its new children added in one pass (see
+        DirectoryRecord.add_children()).  Everything is checked before the ISO
+        is changed, and the result is the same as calling _add_fp() for each
+        of the entries in turn.
+
+        Parameters:
+         entries - A list of tuples, one per file, of (fp, length, iso_path,
+                   rr_name, joliet_path, file_mode, udf_path).  The iso_path
+                   may be None for a file that is only on Joliet or UDF.
+         manage_fp - Whether or not pycdlib should internally manage the file
+                     pointers; see _add_fp().
+        Returns:
+         The number of bytes to add to the descriptors.
+        '''
+        # A mapping of id(parent) to the parent and its list of new children,
+        # in the order that the parents were first seen.
+        new_children = collections.OrderedDict()
+        new_names = {}
+        files = []
+        for (fp, length, iso_path, rr_name, joliet_path, file_mode, udf_path) in entries:
+            recs = []
+            new_recs = []
+            if iso_path is not None:
+                (name, parent, rr_name, file_mode) = self._check_new_file(fp, iso_path,
+                                                                           rr_name,
+                                                                           joliet_path,
+                                                                           udf_path,
+                                                                           file_mode)
+
+                # As for _add_fp(), files that are too large for one Directory
+                # Record are split across several with the same name.
+                left = length
+                offset = 0
+                while True:
+                    thislen = min(left, 0xfffff800)
+
+                    rec = dr.DirectoryRecord()
+                    rec.new_file(self.pvd, thislen, name, parent,
+                                 self.pvd.sequence_number(), self.rock_ridge,
+                                 rr_name, self.xa, file_mode)
+                    ino = inode.Inode()
+                    ino.new(thislen, fp, manage_fp, offset)
+                    ino.linked_records.append(rec)
+                    rec.inode = ino
+                    if recs:
+                        recs[-1].data_continuation = rec
+                    recs.append(rec)
+
+                    left -= thislen
+                    offset += thislen
+                    if left == 0:
+                        break
+
+                new_recs.append((parent, recs))
+                inodes = [rec.inode for rec in recs]
+                data_length = recs[0].get_data_length()
+            else:
+                if joliet_path is None and udf_path is None:
+                    raise pycdlibexception.PyCdlibInvalidInput('At least one of iso_path, joliet_path, or udf_path must be passed')
+                if udf_path is not None and self.udf_root is None:
+                    raise pycdlibexception.PyCdlibInvalidInput('Can only specify a UDF path for a UDF ISO')
+                if length > 0xfffff800:
+                    raise pycdlibexception.PyCdlibInvalidInput('Files larger than 4GB must have an ISO9660 path')
+                ino = inode.Inode()
+                ino.new(length, fp, manage_fp, 0)
+                inodes = [ino]
+                data_length = length
+
+            if self.joliet_vd is not None and joliet_path is not None:
+                (joliet_name, joliet_parent) = self._name_and_parent_from_path(joliet_path=self._normalize_joliet_path(joliet_path))
+                joliet_rec = dr.DirectoryRecord()
+                joliet_rec.new_file(self.joliet_vd, data_length, joliet_name,
+                                    joliet_parent,
+                                    self.joliet_vd.sequence_number(), None,
+                                    None, False, None)
+                inodes[0].linked_records.append(joliet_rec)
+                joliet_rec.inode = inodes[0]
+                new_recs.append((joliet_parent, [joliet_rec]))
+
+            for (new_parent, recs_in_parent) in new_recs:
+                new_name = (id(new_parent), recs_in_parent[0].file_ident)
+                if new_name in new_names or new_parent.lookup_child(new_name[1]) is not None:
+                    if not (new_parent.rock_ridge is not None and new_parent.file_identifier() == b'RR_MOVED'):
+                        raise pycdlibexception.PyCdlibInvalidInput('Failed adding duplicate name to parent')
+                new_names[new_name] = True
+                new_children.setdefault(id(new_parent), (new_parent, []))[1].extend(recs_in_parent)
+
+            # The UDF parent is looked up now too, so that a bad UDF path fails
+            # before any of the ISO9660 or Joliet parents have been changed.
+            udf_name_and_parent = None
+            if udf_path is not None:
+                udf_name_and_parent = self._name_and_parent_from_path(udf_path=utils.normpath(udf_path))
+                (udf_name, udf_parent) = udf_name_and_parent
+                if not udf_parent.is_dir():
+                    raise pycdlibexception.PyCdlibInvalidInput('Can only add a UDF File Identifier to a directory')
+                new_name = (id(udf_parent), udf_name)
+                if new_name in new_names or udf_parent.find_file_ident_desc_by_name(udf_name) is not None:
+                    raise pycdlibexception.PyCdlibInvalidInput('Failed adding duplicate name to parent')
+                new_names[new_name] = True
+
+            files.append((recs, inodes, data_length, udf_name_and_parent))
+
+        log_block_size = self.pvd.logical_block_size()
+        num_bytes_to_add = 0
+        for (parent, children) in new_children.values():
+            num_bytes_to_add += parent.add_children(children, parent.vd.logical_block_size()) * log_block_size
+            if self._name_indices:
+                for child in children:
+                    self._name_index_add_dr(child)
+
+        # The space for each file is rounded up to a whole number of extents
+        # separately, as each file starts on an extent of its own.
+        for (recs, inodes, data_length_unused, udf_name_and_parent_unused) in files:
+            for ino in inodes:
+                self.inodes.append(ino)
+                num_bytes_to_add += utils.ceiling_div(ino.get_data_length(),
+                                                      log_block_size) * log_block_size
+            for rec in recs:
+                num_bytes_to_add += self._update_rr_ce_entry(rec)
+
+        for (recs_unused, inodes, data_length, udf_name_and_parent) in files:
+            if udf_name_and_parent is not None:
+                (file_entry, num_bytes) = self._add_udf_file_entry(inodes[0],
+                                                                   data_length,
+                                                                   *udf_name_and_parent)
+                inodes[0].linked_records.append(file_entry)
+                file_entry.inode = inodes[0]
+                num_bytes_to_add += num_bytes
+
+        return num_bytes_to_add
+
     def _rm_dr_link(self, rec):
         '''
         An internal method to remove a Directory Record link given the record.
@@ -3390,6 +5717,248 @@ class PyCdlib(object):
 
         return num_bytes_to_remove
 
+    def _name_index_add_dr(self, child):
+        '''
+        An internal method to add a Directory Record to the name indices that
+        have been built.
+
+        Parameters:
+         child - The Directory Record to add.
+        Returns:
+         Nothing.
+        '''
+        if child.is_dot() or child.is_dotdot():
+            return
+
+        if self.joliet_vd is not None and id(child.vd) == id(self.joliet_vd):
+            if 'joliet' in self._name_indices:
+                self._name_indices['joliet'].add(_decode_ident(child.file_identifier(), 'utf-16_be'),
+                                                 child)
+            return
+
+        if 'iso9660' in self._name_indices:
+            self._name_indices['iso9660'].add(_decode_ident(child.file_identifier(), 'utf-8'),
+                                              child)
+        if 'rr' in self._name_indices and child.rock_ridge is not None:
+            self._name_indices['rr'].add(_decode_ident(child.rock_ridge.name(), 'utf-8'),
+                                         child)
+
+    def _name_index_add_udf(self, fi_desc):
+        '''
+        An internal method to add a UDF File Identifier Descriptor to the UDF
+        name index.
+
+        Parameters:
+         fi_desc - The UDF File Identifier Descriptor to add.
+        Returns:
+         Nothing.
+        '''
+        self._name_indices['udf'].add(_decode_ident(fi_desc.fi, fi_desc.encoding),
+                                      fi_desc)
+
+    def _get_name_index(self, namespace):
+        '''
+        An internal method to get the name index for a namespace, building it
+        (and reading any directories that have not been read yet) the first
+        time it is asked for.  Once built, the index is kept up to date as
+        records are added and removed.
+
+        Parameters:
+         namespace - The namespace to get the index for.
+        Returns:
+         The _NameIndex object for the namespace.
+        '''
+        name_index = self._name_indices.get(namespace)
+        if name_index is not None:
+            return name_index
+
+        name_index = _NameIndex()
+        if namespace == 'udf':
+            dirs = [self.udf_root]
+            while dirs:
+                file_entry = dirs.pop()
+                self._load_directory(file_entry)
+                for fi_desc in file_entry.fi_descs:
+                    if fi_desc.is_parent():
+                        continue
+                    name_index.add(_decode_ident(fi_desc.fi, fi_desc.encoding),
+                                   fi_desc)
+                    if fi_desc.file_entry is not None and fi_desc.is_dir():
+                        dirs.append(fi_desc.file_entry)
+        else:
+            if namespace == 'joliet':
+                dirs = [self.joliet_vd.root_directory_record()]
+                encoding = 'utf-16_be'
+            else:
+                dirs = [self.pvd.root_directory_record()]
+                encoding = 'utf-8'
+            while dirs:
+                dir_record = dirs.pop()
+                self._load_directory(dir_record)
+                for child in dir_record.children:
+                    if child.is_dot() or child.is_dotdot():
+                        continue
+                    if namespace == 'rr':
+                        if child.rock_ridge is not None:
+                            name_index.add(_decode_ident(child.rock_ridge.name(), encoding),
+                                           child)
+                    else:
+                        name_index.add(_decode_ident(child.file_identifier(), encoding),
+                                       child)
+                    if child.is_dir():
+                        dirs.append(child)
+
+        self._name_indices[namespace] = name_index
+        return name_index
+
+    def _get_extent_index(self):
+        '''
+        An internal method to get the index of the extents used by each of the
+        structures on the ISO, building it (and reading any directories that
+        have not been read yet) the first time it is asked for.  The index is
+        thrown away whenever the extents are reassigned.
+
+        Parameters:
+         None.
+        Returns:
+         The _ExtentIndex object for the ISO.
+        '''
+        if self._needs_reshuffle:
+            self._reshuffle_extents()
+
+        if self._extent_index is not None:
+            return self._extent_index
+
+        log_block_size = self.pvd.logical_block_size()
+        owners = [ExtentOwner(0, 16, 'system_area', None)]
+
+        def _add(start, num_extents, kind, owner):
+            '''
+            Internal function to add a structure to the list of owners.
+
+            Parameters:
+             start - The first extent of the structure.
+             num_extents - The number of extents that the structure uses.
+             kind - A string describing what the structure is.
+             owner - The object representing the structure.
+            Returns:
+             Nothing.
+            '''
+            if start is not None and num_extents > 0:
+                owners.append(ExtentOwner(start, start + num_extents, kind, owner))
+
+        for vd in self.pvds + self.brs + self.svds + self.vdsts:
+            _add(vd.extent_location(), 1, 'volume_descriptor', vd)
+        for vd in (self.udf_bea, self.udf_nsr, self.udf_tea, self.version_vd):
+            if vd is not None:
+                _add(vd.extent_location(), 1, 'volume_descriptor', vd)
+
+        if self.udf_root is not None:
+            for descs in (self.udf_main_descs, self.udf_reserve_descs):
+                for attr in self._UDFDescriptors.__slots__:
+                    desc = getattr(descs, attr)
+                    _add(desc.extent_location(), 1, 'udf_descriptor', desc)
+            for desc in (self.udf_logical_volume_integrity,
+                         self.udf_logical_volume_integrity_terminator,
+                         self.udf_file_set, self.udf_file_set_terminator):
+                _add(desc.extent_location(), 1, 'udf_descriptor', desc)
+            for anchor in self.udf_anchors:
+                _add(anchor.extent_location(), 1, 'udf_anchor', anchor)
+
+            part_start = self.udf_main_descs.partition.part_start_location
+            file_entry_extents = set()
+            file_entries = [self.udf_root]
+            while file_entries:
+                file_entry = file_entries.pop()
+                self._load_directory(file_entry)
+                extent = file_entry.extent_location()
+                if extent not in file_entry_extents:
+                    # Hard links share a File Entry extent; only count it once.
+                    file_entry_extents.add(extent)
+                    _add(extent, 1, 'udf_file_entry', file_entry)
+                if not file_entry.is_dir():
+                    continue
+                for length, pos in file_entry.alloc_descs:
+                    _add(part_start + pos, utils.ceiling_div(length, log_block_size),
+                         'udf_directory', file_entry)
+                for fi_desc in file_entry.fi_descs:
+                    if not fi_desc.is_parent() and fi_desc.file_entry is not None:
+                        file_entries.append(fi_desc.file_entry)
+
+        for vd in (self.pvd, self.joliet_vd):
+            if vd is None:
+                continue
+            _add(vd.path_table_location_le, vd.path_table_num_extents,
+                 'path_table', vd)
+            _add(vd.path_table_location_be, vd.path_table_num_extents,
+                 'path_table', vd)
+
+            dirs = [vd.root_directory_record()]
+            while dirs:
+                dir_record = dirs.pop()
+                self._load_directory(dir_record)
+                _add(dir_record.extent_location(),
+                     utils.ceiling_div(dir_record.get_data_length(), log_block_size),
+                     'directory', dir_record)
+                for child in dir_record.children:
+                    if child.is_dir() and not child.is_dot() and not child.is_dotdot():
+                        dirs.append(child)
+
+            for block in vd.rr_ce_blocks:
+                _add(block.extent_location(), 1, 'rr_continuation', block)
+
+            if vd is self.pvd and self.rock_ridge is not None:
+                # The Rock Ridge ER record has a sector of its own, which is
+                # not one of the continuation blocks.
+                root_dot = vd.root_directory_record().children[0]
+                if root_dot.rock_ridge.ce_block is None:
+                    ce_record = root_dot.rock_ridge.dr_entries.ce_record
+                    _add(ce_record.bl_cont_area, 1, 'rr_continuation', ce_record)
+
+        boot_inodes = set()
+        if self.eltorito_boot_catalog is not None:
+            _add(self.eltorito_boot_catalog.extent_location(),
+                 utils.ceiling_div(self.eltorito_boot_catalog.dirrecords[0].get_data_length(),
+                                   log_block_size),
+                 'boot_catalog', self.eltorito_boot_catalog)
+            entries = [self.eltorito_boot_catalog.initial_entry]
+            for sec in self.eltorito_boot_catalog.sections:
+                entries.extend(sec.section_entries)
+            for entry in entries:
+                if entry.inode is not None and id(entry.inode) not in boot_inodes:
+                    boot_inodes.add(id(entry.inode))
+                    _add(entry.inode.extent_location(),
+                         utils.ceiling_div(entry.inode.get_data_length(), log_block_size),
+                         'boot', entry.inode)
+
+        for ino in self.inodes:
+            if id(ino) not in boot_inodes:
+                _add(ino.extent_location(),
+                     utils.ceiling_div(ino.get_data_length(), log_block_size),
+                     'file', ino)
+
+        self._extent_index = _ExtentIndex(owners)
+        return self._extent_index
+
+    def _discard_udf_path_index(self, parent, fi):
+        '''
+        An internal method to drop a UDF File Identifier from the path and name
+        indices, before it is removed from its parent.
+
+        Parameters:
+         parent - The UDF File Entry that the File Identifier is in.
+         fi - The name of the File Identifier.
+        Returns:
+         Nothing.
+        '''
+        for fi_desc in parent.fi_descs:
+            if fi_desc.fi == fi:
+                self._path_index.discard(fi_desc)
+                if fi_desc.file_entry is not None:
+                    self._discard_full_paths(fi_desc.file_entry)
+                if 'udf' in self._name_indices:
+                    self._name_indices['udf'].discard(fi_desc)
+
     def _rm_udf_file_ident(self, parent, fi):
         '''
         An internal method to remove a UDF File Identifier from the parent
@@ -3402,12 +5971,11 @@ class PyCdlib(object):
          The number of bytes to remove from the ISO.
         '''
         logical_block_size = self.pvd.logical_block_size()
+        self._discard_udf_path_index(parent, fi)
         num_extents_to_remove = parent.remove_file_ident_desc_by_name(fi,
                                                                       logical_block_size)
         self.udf_logical_volume_integrity.logical_volume_impl_use.num_files -= 1
 
-        self._find_udf_record.cache_clear()  # pylint: disable=no-member
-
         return num_extents_to_remove * logical_block_size
 
     def _rm_udf_link(self, rec):
@@ -3595,8 +6163,11 @@ class PyCdlib(object):
 
 
 ########################### PUBLIC API #####################################
-    def __init__(self, always_consistent=False):
+    def __init__(self, always_consistent=False, stats=None,
+                 path_index_size=None):
         self._always_consistent = always_consistent
+        self._stats = stats
+        self._path_index = _PathIndex(path_index_size)
         self._track_writes = os.getenv('PYCDLIB_TRACK_WRITES', False)
         self._initialize()
 
@@ -3896,12 +6467,36 @@ class PyCdlib(object):
 
         self._initialized = True
 
-    def open(self, filename):
+    def open(self, filename, lazy=False, snapshot=None, namespaces=None,
+             verify_redundant=True):
         '''
-        Open up an existing ISO for inspection and modification.
+        Open up an existing ISO for inspection and modification.  If any
+        namespaces are skipped, or the UDF Reserve Volume Descriptor Sequence
+        is not read (see namespaces and verify_redundant), the ISO can only be
+        inspected; modifying or writing it out raises an error.
 
         Parameters:
          filename - The filename containing the ISO to open up.
+         lazy - If True, only the volume descriptors and path tables are
+                parsed up front, and each directory is read from the ISO the
+                first time it is looked up, listed, or walked.  The whole ISO
+                is read in before any modification or write.
+         snapshot - The name of a snapshot file.  If the file holds a snapshot
+                    of this ISO (as determined by a hash of the volume
+                    descriptors and the size of the ISO), the metadata is
+                    loaded from it instead of being parsed from the ISO;
+                    otherwise the ISO is parsed and the snapshot is written
+                    out for next time.  Snapshots are pickles, so only use
+                    snapshot files that come from a trusted location.  This
+                    cannot be combined with lazy.
+         namespaces - An iterable of the namespaces to parse, from 'iso9660'
+                      (which includes Rock Ridge), 'joliet', and 'udf'; None
+                      (the default) parses all of them.  Looking up a path
+                      in a namespace that was not parsed is an error.
+         verify_redundant - If False, skip reading the redundant copies of
+                            the metadata (the big-endian path tables and the
+                            UDF Reserve Volume Descriptor Sequence), and the
+                            checks that they agree with the main copies.
         Returns:
          Nothing.
         '''
@@ -3911,28 +6506,92 @@ class PyCdlib(object):
         fp = open(filename, 'r+b')
         self._managing_fp = True
         try:
-            self._open_fp(fp)
+            self._open_fp(fp, lazy, snapshot, namespaces, verify_redundant)
         except:
             fp.close()
             raise
 
-    def open_fp(self, fp):
+    def open_fp(self, fp, lazy=False, snapshot=None, namespaces=None,
+                verify_redundant=True):
         '''
         Open up an existing ISO for inspection and modification.  Note that the
         file object passed in here must stay open for the lifetime of this
         object, as the PyCdlib class uses it internally to do writing and reading
         operations.  If you want PyCdlib to manage this for you, use 'open'
-        instead.
+        instead.  If any namespaces are skipped, or the UDF Reserve Volume
+        Descriptor Sequence is not read (see namespaces and verify_redundant),
+        the ISO can only be inspected; modifying or writing it out raises an
+        error.
 
         Parameters:
          fp - The file object containing the ISO to open up.
+         lazy - If True, only the volume descriptors and path tables are
+                parsed up front, and each directory is read from the ISO the
+                first time it is looked up, listed, or walked.  The whole ISO
+                is read in before any modification or write.
+         snapshot - The name of a snapshot file.  If the file holds a snapshot
+                    of this ISO (as determined by a hash of the volume
+                    descriptors and the size of the ISO), the metadata is
+                    loaded from it instead of being parsed from the ISO;
+                    otherwise the ISO is parsed and the snapshot is written
+                    out for next time.  Snapshots are pickles, so only use
+                    snapshot files that come from a trusted location.  This
+                    cannot be combined with lazy.
+         namespaces - An iterable of the namespaces to parse, from 'iso9660'
+                      (which includes Rock Ridge), 'joliet', and 'udf'; None
+                      (the default) parses all of them.  Looking up a path
+                      in a namespace that was not parsed is an error.
+         verify_redundant - If False, skip reading the redundant copies of
+                            the metadata (the big-endian path tables and the
+                            UDF Reserve Volume Descriptor Sequence), and the
+                            checks that they agree with the main copies.
+        Returns:
+         Nothing.
+        '''
+        if self._initialized:
+            raise pycdlibexception.PyCdlibInvalidInput('This object already has an ISO; either close it or create a new object')
+
+        self._open_fp(fp, lazy, snapshot, namespaces, verify_redundant)
+
+    def open_reader(self, reader, block_size=65536, cache_blocks=256,
+                    read_ahead=16, lazy=False, snapshot=None, namespaces=None,
+                    verify_redundant=True):
+        '''
+        Open up an existing ISO that is read through a range-read backend
+        rather than a file object.  The backend is any object with a
+        read_at(offset, length) method, which returns up to length bytes of
+        the ISO starting at offset, and a size() method, which returns the
+        length of the ISO in bytes.  All reads of the ISO, both while parsing
+        and through open_file_from_iso(), go through a least recently used
+        cache of blocks in front of the backend, and runs of sequential reads
+        are fetched ahead.  The backend must stay usable for the lifetime of
+        this object.
+
+        Parameters:
+         reader - The backend to read the ISO from.
+         block_size - The number of bytes in each cached block; must be a
+                      power of 2 of at least 512.
+         cache_blocks - The maximum number of blocks to keep in the cache.
+         read_ahead - The maximum number of blocks to read ahead of a run of
+                      sequential reads, or 0 to disable read ahead.
+         lazy - As for open().
+         snapshot - As for open().
+         namespaces - As for open().
+         verify_redundant - As for open().
         Returns:
          Nothing.
         '''
         if self._initialized:
             raise pycdlibexception.PyCdlibInvalidInput('This object already has an ISO; either close it or create a new object')
 
-        self._open_fp(fp)
+        fp = backend.CachedRangeFile(reader, block_size, cache_blocks,
+                                     read_ahead)
+        self._managing_fp = True
+        try:
+            self._open_fp(fp, lazy, snapshot, namespaces, verify_redundant)
+        except:
+            fp.close()
+            raise
 
     def get_file_from_iso(self, local_path, **kwargs):
         '''
@@ -4066,6 +6725,96 @@ class PyCdlib(object):
 
         self._write_fp(outfp, blocksize, progress_cb, progress_opaque)
 
+    def batch(self, rollback=True):
+        '''
+        Group a series of changes to the ISO, for use in a with statement:
+
+            with iso.batch():
+                iso.add_fp(...)
+                iso.rm_file(...)
+
+        Inside the batch, the size accounting that each change does is
+        collected and applied once at the end, and an always consistent ISO is
+        only laid out again at the end (or when it is written out).  If an
+        exception leaves the batch, every change made inside of it is undone,
+        and the exception is passed on.  To do that, a copy of all of the
+        parsed metadata is saved when the batch starts, which takes a little
+        less time than opening the ISO again.  Without rollback no copy is
+        made, and the changes made before the exception are kept and accounted
+        for instead.  A batch started inside of another batch is part of the
+        outer one; if it can be rolled back, an exception that leaves it
+        undoes the changes made inside of it, even if the outer batch can't
+        be rolled back.
+
+        Parameters:
+         rollback - Whether to undo the changes made inside of the batch if an
+                    exception leaves it.
+        Returns:
+         A context manager for the batch.
+        '''
+        if not self._initialized:
+            raise pycdlibexception.PyCdlibInvalidInput('This object is not yet initialized; call either open() or new() to create an ISO')
+
+        return _Batch(self, rollback)
+
+    def clone(self):
+        '''
+        Make a copy of the ISO that can be changed and written out
+        independently of this object.  The ISO is not read or parsed again;
+        the parsed metadata is copied in memory, and the data of the files is
+        shared rather than copied.  If this object opened the ISO itself (with
+        open()), the clone opens the file again so that it does not depend on
+        this object staying open; otherwise the file objects passed in by the
+        caller are shared, and must stay open for as long as any clone uses
+        them.  Clones may be written out in parallel threads.
+
+        Parameters:
+         None.
+        Returns:
+         A new PyCdlib object holding a copy of the ISO.
+        '''
+        if not self._initialized:
+            raise pycdlibexception.PyCdlibInvalidInput('This object is not yet initialized; call either open() or new() to create an ISO')
+
+        if self._batch is not None:
+            raise pycdlibexception.PyCdlibInvalidInput('Cannot clone an ISO inside of a batch')
+
+        # The state is copied in full, so every directory has to be in it.
+        self._materialize_directories()
+
+        iso_fp = self._cdfp
+        if isinstance(iso_fp, _StatsFile):
+            # The statistics belong to this object, not to the clone.
+            iso_fp = iso_fp._fp  # pylint: disable=protected-access
+        if self._managing_fp:
+            iso_fp = open(iso_fp.name, 'rb')
+
+        try:
+            state = _copy_metadata(self._snapshot_state(),
+                                   {id(self._cdfp): iso_fp})
+        except:
+            if self._managing_fp:
+                iso_fp.close()
+            raise
+
+        new_iso = PyCdlib(self._always_consistent, None, self._path_index.maxsize)
+
+        # pylint: disable=protected-access
+        new_iso._restore_snapshot_state(state)
+        new_iso._cdfp = iso_fp
+        new_iso._managing_fp = self._managing_fp
+        new_iso._track_writes = self._track_writes
+        # Extents placed incrementally are only final once the ISO has been
+        # laid out in full, which the clone does not know to do on its own.
+        new_iso._needs_reshuffle = self._needs_reshuffle or self._incremental_layout
+        if self._data_lock is None:
+            self._data_lock = threading.Lock()
+        new_iso._data_lock = self._data_lock
+        new_iso._initialized = True
+        # pylint: enable=protected-access
+
+        return new_iso
+
     def add_fp(self, fp, length, iso_path, rr_name=None, joliet_path=None,
                file_mode=None, udf_path=None):
         '''
@@ -4093,13 +6842,16 @@ class PyCdlib(object):
         if not self._initialized:
             raise pycdlibexception.PyCdlibInvalidInput('This object is not yet initialized; call either open() or new() to create an ISO')
 
+        self._materialize_directories()
+
         if not utils.file_object_supports_binary(fp):
             raise pycdlibexception.PyCdlibInvalidInput('The fp argument must be in binary mode')
 
+        num_inodes = len(self.inodes)
         num_bytes_to_add = self._add_fp(fp, length, False, iso_path, rr_name,
                                         joliet_path, udf_path, file_mode, False)
 
-        self._finish_add(0, num_bytes_to_add)
+        self._finish_add(0, num_bytes_to_add, self.inodes[num_inodes:])
 
     def add_file(self, filename, iso_path, rr_name=None, joliet_path=None,
                  file_mode=None, udf_path=None):
@@ -4124,11 +6876,245 @@ class PyCdlib(object):
         if not self._initialized:
             raise pycdlibexception.PyCdlibInvalidInput('This object is not yet initialized; call either open() or new() to create an ISO')
 
+        self._materialize_directories()
+
+        num_inodes = len(self.inodes)
         num_bytes_to_add = self._add_fp(filename, os.stat(filename).st_size,
                                         True, iso_path, rr_name, joliet_path,
                                         udf_path, file_mode, False)
 
-        self._finish_add(0, num_bytes_to_add)
+        self._finish_add(0, num_bytes_to_add, self.inodes[num_inodes:])
+
+    def add_fps(self, entries):
+        '''
+        Add many files to the ISO at once.  This gives the same result as
+        calling add_fp() for each of the entries, but the new files are added
+        to each directory in one pass, and the accounting and layout are only
+        done once, which is much faster when adding many files to the same
+        directory.  All of the entries are checked before the ISO is changed.
+        As with add_fp(), the caller must ensure that the file objects remain
+        open for the lifetime of the PyCdlib object.
+
+        Parameters:
+         entries - An iterable of tuples, one per file, holding the arguments
+                   to add_fp(): (fp, length, iso_path), optionally followed by
+                   rr_name, joliet_path, file_mode, and udf_path.
+        Returns:
+         Nothing.
+        '''
+        if not self._initialized:
+            raise pycdlibexception.PyCdlibInvalidInput('This object is not yet initialized; call either open() or new() to create an ISO')
+
+        files = []
+        for entry in entries:
+            if len(entry) < 3 or len(entry) > 7:
+                raise pycdlibexception.PyCdlibInvalidInput('Each entry must have between 3 and 7 items')
+            if entry[2] is None:
+                raise pycdlibexception.PyCdlibInvalidInput('Each entry must have an iso_path')
+            if not utils.file_object_supports_binary(entry[0]):
+                raise pycdlibexception.PyCdlibInvalidInput('The fp argument must be in binary mode')
+            files.append(tuple(entry) + (None,) * (7 - len(entry)))
+
+        self._materialize_directories()
+
+        num_inodes = len(self.inodes)
+        num_bytes_to_add = self._add_fps(files, False)
+
+        self._finish_add(0, num_bytes_to_add, self.inodes[num_inodes:])
+
+    def add_files(self, entries):
+        '''
+        Add many files to the ISO at once.  This gives the same result as
+        calling add_file() for each of the entries; see add_fps().
+
+        Parameters:
+         entries - An iterable of tuples, one per file, holding the arguments
+                   to add_file(): (filename, iso_path), optionally followed by
+                   rr_name, joliet_path, file_mode, and udf_path.
+        Returns:
+         Nothing.
+        '''
+        if not self._initialized:
+            raise pycdlibexception.PyCdlibInvalidInput('This object is not yet initialized; call either open() or new() to create an ISO')
+
+        files = []
+        for entry in entries:
+            if len(entry) < 2 or len(entry) > 6:
+                raise pycdlibexception.PyCdlibInvalidInput('Each entry must have between 2 and 6 items')
+            if entry[1] is None:
+                raise pycdlibexception.PyCdlibInvalidInput('Each entry must have an iso_path')
+            entry = tuple(entry) + (None,) * (6 - len(entry))
+            files.append((entry[0], os.stat(entry[0]).st_size) + entry[1:])
+
+        self._materialize_directories()
+
+        num_inodes = len(self.inodes)
+        num_bytes_to_add = self._add_fps(files, True)
+
+        self._finish_add(0, num_bytes_to_add, self.inodes[num_inodes:])
+
+    def add_tree(self, local_root, iso_root=None, rr=None, joliet=None,
+                 udf=None, filters=None):
+        '''
+        Add everything below a local directory to the ISO.  The local names are
+        used as they are for Rock Ridge and UDF, and cut to 64 characters for
+        Joliet.  For ISO9660, they are mangled to fit the interchange level:
+        upper-cased, with disallowed characters replaced by underscores,
+        truncated, and numbered where two of them would clash.  The local tree
+        is scanned once.  The directories are added first, then all of the
+        files in one pass (see add_files()), and the accounting and layout are
+        done once at the end.  Everything that can be is checked before the
+        ISO is changed, and the changes are made in a batch that is rolled
+        back on error (see batch()), so if the tree can't be added, the ISO is
+        left as it was.  Symbolic links and special files are left out.
+
+        Parameters:
+         local_root - The local directory whose contents to add.
+         iso_root - The ISO9660 path of the directory to add the contents to.
+                    If neither this nor rr is given, the root directory is
+                    used.
+         rr - The Rock Ridge path of the directory to add the contents to, in
+              place of iso_root.
+         joliet - The Joliet path of the directory to add the contents to.  If
+                  this is None, nothing is added to Joliet.
+         udf - The UDF path of the directory to add the contents to.  If this
+               is None, nothing is added to UDF.
+         filters - A dictionary mapping 'iso9660', 'joliet', 'udf', or 'all' to
+                   a list of fnmatch-style patterns.  A local file or directory
+                   whose name matches one of the patterns is left out of that
+                   namespace (or out of all of them for 'all'), along with
+                   everything below it.  Rock Ridge follows ISO9660.
+        Returns:
+         Nothing.
+        '''
+        if not self._initialized:
+            raise pycdlibexception.PyCdlibInvalidInput('This object is not yet initialized; call either open() or new() to create an ISO')
+
+        if not os.path.isdir(local_root):
+            raise pycdlibexception.PyCdlibInvalidInput('The local root must be a directory')
+
+        if iso_root is not None and rr is not None:
+            raise pycdlibexception.PyCdlibInvalidInput('Only one of iso_root and rr can be passed')
+
+        if filters is None:
+            filters = {}
+        for namespace in filters:
+            if namespace not in ('all', 'iso9660', 'joliet', 'udf'):
+                raise pycdlibexception.PyCdlibInvalidInput("The filters can only be for 'all', 'iso9660', 'joliet', or 'udf'")
+
+        def _included(namespace, name):
+            for pattern in tuple(filters.get('all', ())) + tuple(filters.get(namespace, ())):
+                if fnmatch.fnmatch(name, pattern):
+                    return False
+            return True
+
+        def _join(parent_path, name):
+            if parent_path == '/':
+                return '/' + name
+            return parent_path + '/' + name
+
+        self._materialize_directories()
+
+        if rr is not None:
+            iso_rec = self.get_record(rr_path=rr)
+        else:
+            if iso_root is None:
+                iso_root = '/'
+            iso_rec = self.get_record(iso_path=iso_root)
+        if not iso_rec.is_dir():
+            raise pycdlibexception.PyCdlibInvalidInput('The ISO9660 root must be a directory')
+        iso_root = self.full_path_from_dirrecord(iso_rec)
+        used_names = set([_decode_ident(c.file_identifier(), 'utf-8') for c in iso_rec.children[2:]])
+
+        if joliet is not None:
+            if self.joliet_vd is None:
+                raise pycdlibexception.PyCdlibInvalidInput('A Joliet path can only be specified for a Joliet ISO')
+            if not self.get_record(joliet_path=joliet).is_dir():
+                raise pycdlibexception.PyCdlibInvalidInput('The Joliet root must be a directory')
+            joliet = utils.normpath(joliet).decode('utf-8')
+
+        if udf is not None:
+            if self.udf_root is None:
+                raise pycdlibexception.PyCdlibInvalidInput('A UDF path can only be specified for a UDF ISO')
+            if not self.get_record(udf_path=udf).is_dir():
+                raise pycdlibexception.PyCdlibInvalidInput('The UDF root must be a directory')
+            udf = utils.normpath(udf).decode('utf-8')
+
+        # Everything is worked out and checked before the ISO is changed, so
+        # that a failure leaves the ISO as it was.  The ISO9660 names are
+        # made up to be free, so only the Joliet names (which may clash once
+        # cut to 64 characters) and the names added to the existing Joliet and
+        # UDF directories need checking.
+        dirs = []
+        files = []
+        new_paths = set()
+
+        def _check_free(parent_path, path, key):
+            if (key, path) in new_paths:
+                raise pycdlibexception.PyCdlibInvalidInput('Failed adding duplicate name to parent')
+            new_paths.add((key, path))
+            if parent_path is not None:
+                return
+            if key == 'joliet':
+                (name, parent) = self._name_and_parent_from_path(joliet_path=path)
+                existing = parent.lookup_child(name)
+            else:
+                (name, parent) = self._name_and_parent_from_path(udf_path=path)
+                existing = parent.find_file_ident_desc_by_name(name)
+            if existing is not None:
+                raise pycdlibexception.PyCdlibInvalidInput('Failed adding duplicate name to parent')
+
+        levels = collections.deque([(local_root, iso_root, joliet, udf,
+                                     used_names, True)])
+        while levels:
+            (local_dir, iso_dir, joliet_dir, udf_dir, used_names, top) = levels.popleft()
+            for (name, is_dir, size) in _list_local_dir(local_dir):
+                local_path = os.path.join(local_dir, name)
+
+                iso_path = None
+                rr_name = None
+                if iso_dir is not None and _included('iso9660', name):
+                    iso_name = _mangle_iso9660_name(name, self.interchange_level,
+                                                    is_dir, used_names)
+                    if iso_name is None:
+                        raise pycdlibexception.PyCdlibInvalidInput('Could not find a free ISO9660 name for %s' % (local_path))
+                    iso_path = _join(iso_dir, iso_name)
+                    if self.rock_ridge is None and (not is_dir or self.enhanced_vd is None):
+                        _check_path_depth(utils.normpath(iso_path))
+                    if self.rock_ridge is not None:
+                        rr_name = name
+
+                joliet_path = None
+                if joliet_dir is not None and _included('joliet', name):
+                    joliet_path = _join(joliet_dir, name[:64])
+                    _check_free(None if top else joliet_dir, joliet_path, 'joliet')
+
+                udf_path = None
+                if udf_dir is not None and _included('udf', name):
+                    udf_path = _join(udf_dir, name)
+                    _check_free(None if top else udf_dir, udf_path, 'udf')
+
+                if iso_path is None and joliet_path is None and udf_path is None:
+                    continue
+
+                if is_dir:
+                    dirs.append((iso_path, rr_name, joliet_path, udf_path))
+                    levels.append((local_path, iso_path, joliet_path,
+                                   udf_path, set(), False))
+                else:
+                    files.append((local_path, size, iso_path, rr_name,
+                                  joliet_path, None, udf_path))
+
+        with self.batch():
+            num_bytes_to_add = 0
+            for (iso_path, rr_name, joliet_path, udf_path) in dirs:
+                num_bytes_to_add += self._add_directory(iso_path, rr_name,
+                                                        joliet_path, None,
+                                                        udf_path)
+
+            num_bytes_to_add += self._add_fps(files, True)
+
+            self._finish_add(0, num_bytes_to_add)
 
     def modify_file_in_place(self, fp, length, iso_path, rr_name=None,  # pylint: disable=unused-argument
                              joliet_path=None, udf_path=None):          # pylint: disable=unused-argument
@@ -4165,6 +7151,8 @@ class PyCdlib(object):
         if not self._initialized:
             raise pycdlibexception.PyCdlibInvalidInput('This object is not yet initialized; call either open() or new() to create an ISO')
 
+        self._materialize_directories()
+
         if hasattr(self._cdfp, 'mode') and not self._cdfp.mode.startswith(('r+', 'w', 'a', 'rb+')):
             raise pycdlibexception.PyCdlibInvalidInput('To modify a file in place, the original ISO must have been opened in a write mode (r+, w, or a)')
 
@@ -4282,6 +7270,8 @@ class PyCdlib(object):
         if not self._initialized:
             raise pycdlibexception.PyCdlibInvalidInput('This object is not yet initialized; call either open() or new() to create an ISO')
 
+        self._materialize_directories()
+
         num_old = 0
         iso_old_path = None
         joliet_old_path = None
@@ -4371,6 +7361,8 @@ class PyCdlib(object):
         if not self._initialized:
             raise pycdlibexception.PyCdlibInvalidInput('This object is not yet initialized; call either open() or new() to create an ISO')
 
+        self._materialize_directories()
+
         if len([x for x in (iso_path, joliet_path, udf_path) if x is not None]) != 1:
             raise pycdlibexception.PyCdlibInvalidInput('Must provide exactly one of iso_path, joliet_path, or udf_path')
 
@@ -4425,12 +7417,33 @@ class PyCdlib(object):
         if not self._initialized:
             raise pycdlibexception.PyCdlibInvalidInput('This object is not yet initialized; call either open() or new() to create an ISO')
 
+        self._materialize_directories()
+
         if iso_path is None and joliet_path is None and udf_path is None:
             raise pycdlibexception.PyCdlibInvalidInput('Either iso_path or joliet_path must be passed')
 
         if file_mode is not None and not self.rock_ridge:
             raise pycdlibexception.PyCdlibInvalidInput('A file mode can only be specified for Rock Ridge ISOs')
 
+        num_bytes_to_add = self._add_directory(iso_path, rr_name, joliet_path,
+                                               file_mode, udf_path)
+
+        self._finish_add(0, num_bytes_to_add)
+
+    def _add_directory(self, iso_path, rr_name, joliet_path, file_mode,
+                       udf_path):
+        '''
+        An internal method to add a directory to the ISO.
+
+        Parameters:
+         iso_path - The ISO9660 absolute path to use for the directory.
+         rr_name - The Rock Ridge name to use for the directory.
+         joliet_path - The Joliet absolute path to use for the directory.
+         file_mode - The POSIX file mode to use for the directory.
+         udf_path - The UDF absolute path to use for the directory.
+        Returns:
+         The number of bytes to add to the descriptors.
+        '''
         # For backwards-compatibility reasons, if the mode was not specified we
         # just assume 555.  We should probably eventually make file_mode
         # required for Rock Ridge and remove this assumption.
@@ -4548,6 +7561,8 @@ class PyCdlib(object):
             file_ident.new(True, False, name, parent)
             num_new_extents = parent.add_file_ident_desc(file_ident, log_block_size)
             num_bytes_to_add += num_new_extents * log_block_size
+            if 'udf' in self._name_indices:
+                self._name_index_add_udf(file_ident)
 
             file_entry = udfmod.UDFFileEntry()
             file_entry.new(0, 'dir', parent, log_block_size)
@@ -4562,7 +7577,7 @@ class PyCdlib(object):
 
             self.udf_logical_volume_integrity.logical_volume_impl_use.num_dirs += 1
 
-        self._finish_add(0, num_bytes_to_add)
+        return num_bytes_to_add
 
     def add_joliet_directory(self, joliet_path):
         '''
@@ -4596,6 +7611,8 @@ class PyCdlib(object):
         if not self._initialized:
             raise pycdlibexception.PyCdlibInvalidInput('This object is not yet initialized; call either open() or new() to create an ISO')
 
+        self._materialize_directories()
+
         iso_path = utils.normpath(iso_path)
 
         if not utils.starts_with_slash(iso_path):
@@ -4637,6 +7654,15 @@ class PyCdlib(object):
             udf_path = utils.normpath(udf_path)
             (udf_file_ident, udf_file_entry) = self._find_udf_record(udf_path)
 
+        # The Inodes of the file and of the rest of its data, if it is large
+        # enough to need more than one directory record.
+        inodes = []
+        rec = child
+        while rec is not None:
+            if rec.inode is not None:
+                inodes.append(rec.inode)
+            rec = rec.data_continuation
+
         # If the child is a Rock Ridge symlink, then it has no inode since
         # there is no data attached to it.
         if child.inode is None:
@@ -4665,7 +7691,8 @@ class PyCdlib(object):
             # else will.
             num_bytes_to_remove += self.pvd.logical_block_size()
 
-        self._finish_remove(num_bytes_to_remove, True)
+        self._finish_remove(num_bytes_to_remove, True,
+                            [ino for ino in inodes if not ino.linked_records])
 
     def rm_directory(self, iso_path=None, rr_name=None, joliet_path=None, udf_path=None):
         '''
@@ -4682,6 +7709,8 @@ class PyCdlib(object):
         if not self._initialized:
             raise pycdlibexception.PyCdlibInvalidInput('This object is not yet initialized; call either open() or new() to create an ISO')
 
+        self._materialize_directories()
+
         if iso_path is None and joliet_path is None and udf_path is None:
             raise pycdlibexception.PyCdlibInvalidInput('Either iso_path or joliet_path must be passed')
 
@@ -4763,6 +7792,7 @@ class PyCdlib(object):
 
             (udf_name, udf_parent) = self._name_and_parent_from_path(udf_path=udf_path)
 
+            self._discard_udf_path_index(udf_parent, udf_name)
             num_extents_to_remove = udf_parent.remove_file_ident_desc_by_name(udf_name,
                                                                               self.pvd.logical_block_size())
             # Remove space (if necessary) in the parent File Identifier
@@ -4775,8 +7805,6 @@ class PyCdlib(object):
 
             self.udf_logical_volume_integrity.logical_volume_impl_use.num_dirs -= 1
 
-            self._find_udf_record.cache_clear()  # pylint: disable=no-member
-
         self._finish_remove(num_bytes_to_remove, True)
 
     def rm_joliet_directory(self, joliet_path):
@@ -4828,6 +7856,8 @@ class PyCdlib(object):
         if not self._initialized:
             raise pycdlibexception.PyCdlibInvalidInput('This object is not yet initialized; call either open() or new() to create an ISO')
 
+        self._materialize_directories()
+
         # In order to add an El Torito boot, we need to do the following:
         # 1.  Find the boot file record (which must already exist).
         # 2.  Construct a BootRecord.
@@ -4932,6 +7962,8 @@ class PyCdlib(object):
         if not self._initialized:
             raise pycdlibexception.PyCdlibInvalidInput('This object is not yet initialized; call either open() or new() to create an ISO')
 
+        self._materialize_directories()
+
         if self.eltorito_boot_catalog is None:
             raise pycdlibexception.PyCdlibInvalidInput('This ISO does not have an El Torito Boot Record')
 
@@ -5005,6 +8037,8 @@ class PyCdlib(object):
         if not self._initialized:
             raise pycdlibexception.PyCdlibInvalidInput('This object is not yet initialized; call either open() or new() to create an ISO')
 
+        self._materialize_directories()
+
         # There are actually quite a few combinations and rules to think about
         # here.  Rules:
         #
@@ -5103,6 +8137,8 @@ class PyCdlib(object):
             file_ident.new(False, False, udf_name, udf_parent)
             num_new_extents = udf_parent.add_file_ident_desc(file_ident, log_block_size)
             num_bytes_to_add += num_new_extents * log_block_size
+            if 'udf' in self._name_indices:
+                self._name_index_add_udf(file_ident)
 
             # Generate the bytearry representing the symlink
             symlink_bytearray = udfmod.symlink_to_bytes(udf_target)
@@ -5176,6 +8212,7 @@ class PyCdlib(object):
             if try_rr:
                 rec = self._find_rr_record(utils.normpath(iso_path))
 
+        self._load_directory(rec)
         for c in _yield_children(rec):
             yield c
 
@@ -5214,6 +8251,7 @@ class PyCdlib(object):
             if not rec.is_dir():
                 raise pycdlibexception.PyCdlibInvalidInput('UDF File Entry is not a directory!')
 
+            self._load_directory(rec)
             for fi_desc in rec.fi_descs:
                 yield fi_desc.file_entry
         else:
@@ -5224,9 +8262,146 @@ class PyCdlib(object):
             else:
                 rec = self._get_entry(iso_path=kwargs['iso_path'])
 
+            self._load_directory(rec)
             for c in _yield_children(rec):
                 yield c
 
+    def list_children_batch(self, offset=0, count=1024, **kwargs):
+        '''
+        Get a batch of the directory records in a directory on the ISO,
+        starting at a byte offset into the directory.  If the ISO was opened
+        lazily and the directory has not been read yet, the records are decoded
+        straight from the directory's extents, so that a very large directory
+        can be listed a batch at a time without keeping it in memory.  Such
+        records are not part of the tree; they can be inspected, but have no
+        data attached and cannot be passed to the APIs that modify the ISO.
+        Unlike list_children(), Rock Ridge relocated directories are returned
+        as the records that link to them.  One, and only one, of iso_path,
+        rr_path, and joliet_path is allowed.
+
+        Parameters:
+         offset - The byte offset into the directory to start at; 0 (the
+                  default) for the start of the directory, or the next_offset
+                  of the previous batch.
+         count - The largest number of records to return.
+         iso_path - The absolute ISO path to the directory.
+         rr_path - The absolute Rock Ridge path to the directory.
+         joliet_path - The absolute Joliet path to the directory.
+        Returns:
+         A ChildrenBatch tuple of the list of records, and the offset to pass to
+         get the next batch (or None once the end of the directory is
+         reached).
+        '''
+        if not self._initialized:
+            raise pycdlibexception.PyCdlibInvalidInput('This object is not yet initialized; call either open() or new() to create an ISO')
+
+        num_paths = 0
+        for key in kwargs:
+            if key in ['joliet_path', 'rr_path', 'iso_path']:
+                if kwargs[key] is not None:
+                    num_paths += 1
+            else:
+                raise pycdlibexception.PyCdlibInvalidInput("Invalid keyword, must be one of 'iso_path', 'rr_path', or 'joliet_path'")
+
+        if num_paths != 1:
+            raise pycdlibexception.PyCdlibInvalidInput("Must specify one, and only one of 'iso_path', 'rr_path', or 'joliet_path'")
+
+        if offset < 0:
+            raise pycdlibexception.PyCdlibInvalidInput('The offset must not be negative')
+
+        if count < 1:
+            raise pycdlibexception.PyCdlibInvalidInput('The count must be at least 1')
+
+        rec = self._get_entry(**kwargs)
+        if not rec.is_dir():
+            raise pycdlibexception.PyCdlibInvalidInput('Record is not a directory!')
+
+        if self._lazy is not None and id(rec) in self._lazy.dirs:
+            records = self._decode_directory_records(rec, offset)
+        else:
+            records = self._loaded_directory_records(rec, offset)
+
+        children = []
+        next_offset = None
+        last = None
+        for child_offset, child in records:
+            # Skip the extra records of very large files with more than one
+            # directory entry, as list_children() does.
+            fi = child.file_identifier()
+            if fi == last:
+                continue
+            if len(children) == count:
+                next_offset = child_offset
+                break
+            last = fi
+            children.append(child)
+
+        return ChildrenBatch(children, next_offset)
+
+    def _loaded_directory_records(self, dir_record, offset):
+        '''
+        An internal method to generate the children of a directory that has
+        been read into memory, starting at a byte offset into the directory.
+
+        Parameters:
+         dir_record - The directory record to get the children of.
+         offset - The byte offset into the directory to start at.
+        Yields:
+         Tuples of the byte offset of each child into the directory, and the
+         child.
+        Returns:
+         Nothing.
+        '''
+        block_size = dir_record.vd.logical_block_size()
+
+        def _child_offset(child):
+            '''
+            Internal function to get the byte offset of a child into the
+            directory, from where the child ends.
+
+            Parameters:
+             child - The child to get the offset of.
+            Returns:
+             The byte offset of the child into the directory.
+            '''
+            return (child.extents_to_here - 1) * block_size + child.offset_to_here - child.dr_len
+
+        children = dir_record.children
+        lo = 0
+        hi = len(children)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if _child_offset(children[mid]) < offset:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        for index in range(lo, len(children)):
+            yield _child_offset(children[index]), children[index]
+
+    def _decode_directory_records(self, dir_record, offset):
+        '''
+        An internal method to decode the directory records of a directory
+        straight from its extents on the ISO, starting at a byte offset into
+        the directory.  The records are not tracked as children of the
+        directory, and the extents are read a few blocks at a time.
+
+        Parameters:
+         dir_record - The directory record to decode the children of.
+         offset - The byte offset into the directory to start at.
+        Yields:
+         Tuples of the byte offset of each record into the directory, and the
+         record.
+        Returns:
+         Nothing.
+        '''
+        state = self._lazy.dirs[id(dir_record)]
+        for record_offset, new_record, rr_unused in self._directory_records(state, dir_record,
+                                                                            offset,
+                                                                            _DIRECTORY_CHUNK_BLOCKS):
+            self._parse_ce_data(state, new_record)
+            yield record_offset, new_record
+
     def get_entry(self, iso_path, joliet=False):
         '''
         (deprecated) Get the directory record for a particular path.  It is
@@ -5285,6 +8460,114 @@ class PyCdlib(object):
             return self._get_entry(udf_path=kwargs['udf_path'])
         return self._get_entry(iso_path=kwargs['iso_path'])
 
+    def get_records(self, paths, namespace='iso9660'):
+        '''
+        Get the records for many paths in the same namespace at once.  The
+        paths are sorted first, so that the directories that they have in
+        common are only looked up once.
+
+        Parameters:
+         paths - An iterable of the absolute paths to get the records for.
+         namespace - The namespace that the paths are in; one of 'iso9660'
+                     (the default), 'rr', 'joliet', or 'udf'.
+        Returns:
+         A list with a RecordResult for each path, in the same order as the
+         paths.  If the path was found, the record is the same object that
+         get_record() returns and the error is None; otherwise the record is
+         None and the error is the PyCdlibException that get_record() would
+         have raised.
+        '''
+        if not self._initialized:
+            raise pycdlibexception.PyCdlibInvalidInput('This object is not yet initialized; call either open() or new() to create an ISO')
+
+        if namespace == 'udf':
+            self._check_namespace_parsed('udf')
+            if self.udf_root is None:
+                raise pycdlibexception.PyCdlibInvalidInput('Can only specify a udf_path for a UDF ISO')
+            root = (None, self.udf_root)
+        elif namespace == 'joliet':
+            self._check_namespace_parsed('joliet')
+            if self.joliet_vd is None:
+                raise pycdlibexception.PyCdlibInvalidInput('A Joliet path can only be specified for a Joliet ISO')
+            root = self.joliet_vd.root_directory_record()
+        elif namespace in ('iso9660', 'rr'):
+            self._check_namespace_parsed('iso9660')
+            root = self.pvd.root_directory_record()
+        else:
+            raise pycdlibexception.PyCdlibInvalidInput("Invalid namespace, must be one of 'iso9660', 'rr', 'joliet', or 'udf'")
+
+        if self._needs_reshuffle:
+            self._reshuffle_extents()
+
+        encoding = 'utf-8'
+        if namespace == 'joliet':
+            encoding = 'utf-16_be'
+
+        results = []
+        to_walk = []
+        for path in paths:
+            try:
+                normpath = utils.normpath(path)
+                if normpath == b'/':
+                    components = ()
+                else:
+                    components = tuple(utils.split_path(normpath))
+            except pycdlibexception.PyCdlibException as e:
+                results.append(RecordResult(path, None, e))
+                continue
+            if encoding != 'utf-8':
+                components = tuple([c.decode('utf-8').encode(encoding) for c in components])
+            results.append(None)
+            to_walk.append((components, len(results) - 1, path))
+
+        to_walk.sort(key=lambda item: item[0])
+
+        # resolved[i] is the record for the first i components of the last
+        # path that was walked, for as many components as could be found.
+        resolved = [root]
+        last_components = ()
+        for components, index, path in to_walk:
+            common = 0
+            for last, this in zip(last_components, components):
+                if last != this:
+                    break
+                common += 1
+            del resolved[min(common, len(resolved) - 1) + 1:]
+            last_components = components
+
+            while len(resolved) <= len(components):
+                parent = resolved[-1]
+                name = components[len(resolved) - 1]
+                if namespace == 'udf':
+                    if parent[1] is None or (parent[0] is not None and not parent[0].is_dir()):
+                        break
+                    self._load_directory(parent[1])
+                    child = parent[1].find_file_ident_desc_by_name(name)
+                    if child is None:
+                        break
+                    resolved.append((child, child.file_entry))
+                else:
+                    if not parent.is_dir():
+                        break
+                    child = self._find_child(parent, name, namespace == 'rr')
+                    if child is None:
+                        break
+                    resolved.append(child)
+
+            if len(resolved) <= len(components):
+                error = pycdlibexception.PyCdlibInvalidInput('Could not find path')
+                results[index] = RecordResult(path, None, error)
+            elif namespace == 'udf':
+                if resolved[-1][1] is None:
+                    error = pycdlibexception.PyCdlibInvalidInput('Cannot get entry for empty UDF File Entry')
+                    results[index] = RecordResult(path, None, error)
+                else:
+                    results[index] = RecordResult(path, resolved[-1][1], None)
+            else:
+                results[index] = RecordResult(path, resolved[-1], None)
+
+        return results
+
     def add_isohybrid(self, part_entry=1, mbr_id=None, part_offset=0,
                       geometry_sectors=32, geometry_heads=64, part_type=0x17,
                       mac=False):
@@ -5346,6 +8629,70 @@ class PyCdlib(object):
 
         self.isohybrid_mbr = None
 
+    def _full_path(self, rec, namespace):
+        '''
+        An internal method to get the absolute path of a record that is not the
+        root.  The path of each record is remembered, so only the names below
+        the closest ancestor whose path is already known have to be joined on.
+
+        Parameters:
+         rec - The directory record or UDF File Entry to get the path for.
+         namespace - The namespace to get the path in; one of 'iso9660', 'rr',
+                     'joliet', or 'udf'.
+        Returns:
+         A string representing the absolute path to the record.
+        '''
+        cached = self._full_paths.get((namespace, id(rec)))
+        if cached is not None and cached[0] is rec:
+            return cached[1]
+
+        names = []
+        prefix = ''
+        parent = rec
+        while parent is not None:
+            cached = self._full_paths.get((namespace, id(parent)))
+            if cached is not None and cached[0] is parent:
+                prefix = cached[1]
+                break
+
+            if namespace == 'udf':
+                if parent.file_ident is None:
+                    break
+                name = parent.file_ident.fi.decode(parent.file_ident.encoding)
+            elif parent.is_root:
+                break
+            elif namespace == 'joliet':
+                name = parent.file_identifier().decode('utf-16_be')
+            elif namespace == 'rr' and parent.rock_ridge is not None:
+                name = parent.rock_ridge.name().decode('utf-8')
+            else:
+                name = parent.file_identifier().decode('utf-8')
+
+            if sys.version_info < (3, 0):
+                # Python 2, return the UTF-8 encoded version.
+                name = name.encode('utf-8')
+
+            names.append(name)
+            parent = parent.parent
+
+        names.append(prefix)
+        path = '/'.join(reversed(names))
+        self._full_paths[(namespace, id(rec))] = (rec, path)
+        return path
+
+    def _discard_full_paths(self, rec):
+        '''
+        An internal method to forget the remembered paths of a record, because
+        the record is being removed.
+
+        Parameters:
+         rec - The directory record or UDF File Entry being removed.
+        Returns:
+         Nothing.
+        '''
+        for namespace in _NAMESPACE_PATH_KEYS:
+            self._full_paths.pop((namespace, id(rec)), None)
+
     def full_path_from_dirrecord(self, rec, rockridge=False):
         '''
         A method to get the absolute path of a directory record.
@@ -5360,11 +8707,6 @@ class PyCdlib(object):
             raise pycdlibexception.PyCdlibInvalidInput('This object is not yet initialized; call either open() or new() to create an ISO')
 
         if isinstance(rec, dr.DirectoryRecord):
-            encoding = 'utf-8'
-            if self.joliet_vd is not None and id(rec.vd) == id(self.joliet_vd):
-                encoding = 'utf-16_be'
-            slash = '/'.encode(encoding)
-
             # A root entry has no Rock Ridge entry, even on a Rock Ridge ISO.  Just
             # always return / here.
             if rec.is_root:
@@ -5373,34 +8715,18 @@ class PyCdlib(object):
             if rockridge and rec.rock_ridge is None:
                 raise pycdlibexception.PyCdlibInvalidInput('Cannot generate a Rock Ridge path on a non-Rock Ridge ISO')
 
-            parent = rec
-            ret = b''
-            while parent is not None:
-                if not parent.is_root:
-                    if rockridge and parent.rock_ridge is not None:
-                        ret = slash + parent.rock_ridge.name() + ret
-                    else:
-                        ret = slash + parent.file_identifier() + ret
-                parent = parent.parent
+            if self.joliet_vd is not None and id(rec.vd) == id(self.joliet_vd):
+                namespace = 'joliet'
+            elif rockridge:
+                namespace = 'rr'
+            else:
+                namespace = 'iso9660'
         else:
             if rec.parent is None:
                 return '/'
-            encoding = rec.file_ident.encoding
-            slash = '/'.encode(encoding)
-            parent = rec
-            ret = b''
-            while parent is not None:
-                ident = parent.file_identifier()
-                if ident != b'/':
-                    ret = slash + ident + ret
-                parent = parent.parent
-
-        if sys.version_info >= (3, 0):
-            # Python 3, just return the encoded version
-            return ret.decode(encoding)
+            namespace = 'udf'
 
-        # Python 2.
-        return ret.decode(encoding).encode('utf-8')
+        return self._full_path(rec, namespace)
 
     def duplicate_pvd(self):
         '''
@@ -5416,6 +8742,8 @@ class PyCdlib(object):
         if not self._initialized:
             raise pycdlibexception.PyCdlibInvalidInput('This object is not yet initialized; call either open() or new() to create an ISO')
 
+        self._materialize_directories()
+
         pvd = headervd.PrimaryOrSupplementaryVD(headervd.VOLUME_DESCRIPTOR_TYPE_PRIMARY)
         pvd.copy(self.pvd)
         self.pvds.append(pvd)
@@ -5497,6 +8825,8 @@ class PyCdlib(object):
         if not self._initialized:
             raise pycdlibexception.PyCdlibInvalidInput('This object is not yet initialized; call either open() or new() to create an ISO')
 
+        self._materialize_directories()
+
         self._reshuffle_extents()
 
     def set_relocated_name(self, name, rr_name):
@@ -5514,6 +8844,8 @@ class PyCdlib(object):
         if not self._initialized:
             raise pycdlibexception.PyCdlibInvalidInput('This object is not yet initialized; call either open() or new() to create an ISO')
 
+        self._materialize_directories()
+
         if self.rock_ridge is None:
             raise pycdlibexception.PyCdlibInvalidInput('Can only set the relocated name on a Rock Ridge ISO')
 
@@ -5625,6 +8957,301 @@ class PyCdlib(object):
             for name in dirlist:
                 dirs.appendleft(dirdict[name])
 
+    def walk_entries(self, **kwargs):
+        '''
+        Walk the entries on the ISO, starting at the given path.  One, and only
+        one, of iso_path, rr_path, joliet_path, and udf_path is allowed.  This
+        is like walk(), except that the path and record of each directory are
+        carried down the walk instead of being looked up again, and the entries
+        are PyCdlibEntry objects instead of names.  Similar to os.walk(), the
+        list of directory entries may be modified to prune the walk, and the
+        directories are visited top-down in the order they are on the ISO.
+
+        Parameters:
+         iso_path - The absolute ISO path to the starting entry on the ISO.
+         rr_path - The absolute Rock Ridge path to the starting entry on the ISO.
+         joliet_path - The absolute Joliet path to the starting entry on the ISO.
+         udf_path - The absolute UDF path to the starting entry on the ISO.
+        Yields:
+         3-tuples of (path-to-here, list of directory entries, list of file
+         entries).
+        Returns:
+         Nothing.
+        '''
+        if not self._initialized:
+            raise pycdlibexception.PyCdlibInvalidInput('This object is not yet initialized; call either open() or new() to create an ISO')
+
+        num_paths = 0
+        for key in kwargs:
+            if key in ['joliet_path', 'rr_path', 'iso_path', 'udf_path']:
+                if kwargs[key] is not None:
+                    num_paths += 1
+            else:
+                raise pycdlibexception.PyCdlibInvalidInput("Invalid keyword, must be one of 'iso_path', 'rr_path', 'joliet_path', or 'udf_path'")
+
+        if num_paths != 1:
+            raise pycdlibexception.PyCdlibInvalidInput("Must specify one, and only one of 'iso_path', 'rr_path', 'joliet_path', or 'udf_path'")
+
+        rr = False
+        if 'joliet_path' in kwargs:
+            path = self._normalize_joliet_path(kwargs['joliet_path'])
+            rec = self._get_entry(joliet_path=path)
+            encoding = 'utf-16_be'
+        elif 'udf_path' in kwargs:
+            if self.udf_root is None:
+                raise pycdlibexception.PyCdlibInvalidInput('Can only specify a UDF path for a UDF ISO')
+            path = utils.normpath(kwargs['udf_path'])
+            rec = self._get_entry(udf_path=path)
+            if not rec.is_dir():
+                raise pycdlibexception.PyCdlibInvalidInput('UDF File Entry is not a directory!')
+            encoding = None
+        elif 'rr_path' in kwargs:
+            if self.rock_ridge is None:
+                raise pycdlibexception.PyCdlibInvalidInput('Cannot fetch a rr_path from a non-Rock Ridge ISO')
+            path = utils.normpath(kwargs['rr_path'])
+            rec = self._get_entry(rr_path=path)
+            rr = True
+            encoding = 'utf-8'
+        else:
+            path = utils.normpath(kwargs['iso_path'])
+            rec = self._get_entry(iso_path=path)
+            encoding = 'utf-8'
+
+        if not rec.is_dir():
+            raise pycdlibexception.PyCdlibInvalidInput('Record is not a directory!')
+
+        if sys.version_info >= (3, 0):
+            path = path.decode('utf-8')
+
+        dirs = [(path, rec)]
+        while dirs:
+            (dirpath, dir_record) = dirs.pop()
+            prefix = dirpath.rstrip('/') + '/'
+
+            self._load_directory(dir_record)
+            dirlist = []
+            filelist = []
+            if encoding is None:
+                for fi_desc in dir_record.fi_descs:
+                    if fi_desc.is_parent() or fi_desc.file_entry is None:
+                        continue
+
+                    name = _decode_ident(fi_desc.fi, fi_desc.encoding)
+                    entry = _udf_entry(fi_desc.file_entry, name, prefix + name)
+                    if entry.is_dir():
+                        dirlist.append(entry)
+                    else:
+                        filelist.append(entry)
+            else:
+                for child in _yield_children(dir_record):
+                    if child.is_dot() or child.is_dotdot():
+                        continue
+
+                    if rr:
+                        name = _decode_ident(child.rock_ridge.name(), encoding)
+                    else:
+                        name = _decode_ident(child.file_identifier(), encoding)
+
+                    entry = _dr_entry(child, name, prefix + name)
+                    if entry.is_dir():
+                        dirlist.append(entry)
+                    else:
+                        filelist.append(entry)
+
+            yield dirpath, dirlist, filelist
+
+            # We allow the user to modify dirlist along the way, so we add the
+            # children to dirs *after* yield returns.
+            for entry in reversed(dirlist):
+                dirs.append((entry.path, entry.record))
+
+    def find(self, pattern, namespace='iso9660'):
+        '''
+        Find the entries on the ISO whose names match a shell-style pattern,
+        such as '*.rpm'.  Only the name of each entry is matched, wherever it
+        is in the directory tree; ISO9660 names include the version (as in
+        'FOO.;1').  The first call for a namespace builds an index of the names
+        in it, which is kept up to date after that; patterns that start with
+        literal characters only look at the names that start with them.
+
+        Parameters:
+         pattern - The pattern to match, as for fnmatch.fnmatchcase().
+         namespace - The namespace to search; one of 'iso9660' (the default),
+                     'rr', 'joliet', or 'udf'.
+        Returns:
+         A sorted list of the absolute paths of the matching entries.
+        '''
+        if not self._initialized:
+            raise pycdlibexception.PyCdlibInvalidInput('This object is not yet initialized; call either open() or new() to create an ISO')
+
+        if namespace == 'udf':
+            self._check_namespace_parsed('udf')
+            if self.udf_root is None:
+                raise pycdlibexception.PyCdlibInvalidInput('Can only specify a udf_path for a UDF ISO')
+        elif namespace == 'joliet':
+            self._check_namespace_parsed('joliet')
+            if self.joliet_vd is None:
+                raise pycdlibexception.PyCdlibInvalidInput('A Joliet path can only be specified for a Joliet ISO')
+        elif namespace == 'rr':
+            self._check_namespace_parsed('iso9660')
+            if self.rock_ridge is None:
+                raise pycdlibexception.PyCdlibInvalidInput('Cannot fetch a rr_path from a non-Rock Ridge ISO')
+        elif namespace == 'iso9660':
+            self._check_namespace_parsed('iso9660')
+        else:
+            raise pycdlibexception.PyCdlibInvalidInput("Invalid namespace, must be one of 'iso9660', 'rr', 'joliet', or 'udf'")
+
+        paths = set()
+        for rec in self._get_name_index(namespace).match(pattern):
+            if namespace == 'udf':
+                rec = rec.file_entry
+                if rec is None:
+                    continue
+            elif namespace == 'rr' and rec.rock_ridge.child_link_record_exists():
+                # The relocated directory is found under its real parent.
+                continue
+            # A set, since a file larger than 4GB has several Directory
+            # Records with the same name.
+            paths.add(self.full_path_from_dirrecord(rec, rockridge=namespace == 'rr'))
+
+        return sorted(paths)
+
+    def glob(self, pattern, namespace='iso9660'):
+        '''
+        Find the entries on the ISO whose absolute paths match a shell-style
+        pattern, such as '/Packages/*.rpm'.  Unlike find(), each component of
+        the pattern only matches one component of the path.
+
+        Parameters:
+         pattern - The absolute pattern to match; each component is matched
+                   as for fnmatch.fnmatchcase().
+         namespace - The namespace to search; one of 'iso9660' (the default),
+                     'rr', 'joliet', or 'udf'.
+        Returns:
+         A sorted list of the absolute paths of the matching entries.
+        '''
+        if not pattern.startswith('/'):
+            raise pycdlibexception.PyCdlibInvalidInput('Must be a path starting with /')
+
+        components = pattern.split('/')[1:]
+        ret = []
+        for path in self.find(components[-1], namespace):
+            path_components = path.split('/')[1:]
+            if len(path_components) != len(components):
+                continue
+            for name, component in zip(path_components[:-1], components[:-1]):
+                if not fnmatch.fnmatchcase(name, component):
+                    break
+            else:
+                ret.append(path)
+
+        return ret
+
+    def owner_of_extent(self, extent):
+        '''
+        Find the structure on the ISO that occupies an extent.  The kind of the
+        structure is one of 'system_area', 'volume_descriptor',
+        'udf_descriptor', 'udf_anchor', 'udf_file_entry', 'udf_directory',
+        'path_table', 'directory', 'rr_continuation', 'boot_catalog', 'boot',
+        or 'file'.
+
+        Parameters:
+         extent - The extent to look up.
+        Returns:
+         An ExtentOwner tuple of the first extent, the extent just past the
+         last one, the kind, and the object of the structure, or None if
+         nothing occupies the extent.
+        '''
+        if not self._initialized:
+            raise pycdlibexception.PyCdlibInvalidInput('This object is not yet initialized; call either open() or new() to create an ISO')
+
+        owners = self._get_extent_index().owners_in_range(extent, extent + 1)
+        if not owners:
+            return None
+        return owners[-1]
+
+    def owners_in_range(self, start, end):
+        '''
+        Find the structures on the ISO that occupy any of a range of extents;
+        see owner_of_extent() for the kinds of structures.
+
+        Parameters:
+         start - The first extent of the range.
+         end - The extent just past the end of the range.
+        Returns:
+         A list of ExtentOwner tuples for the structures that overlap the
+         range, in extent order.
+        '''
+        if not self._initialized:
+            raise pycdlibexception.PyCdlibInvalidInput('This object is not yet initialized; call either open() or new() to create an ISO')
+
+        if start > end:
+            raise pycdlibexception.PyCdlibInvalidInput('The start of the range must not be past the end')
+
+        return self._get_extent_index().owners_in_range(start, end)
+
+    def scandir(self, path='/', recursive=True, namespace='iso9660',
+                columnar=False):
+        '''
+        Get the entries below a directory on the ISO, with their sizes, modes,
+        owners, dates, link counts, symlink targets, and extents filled in, in
+        a single pass over the directories.  The entries of each directory are
+        listed directories first, then files.
+
+        Parameters:
+         path - The absolute path of the directory to start at; '/' by
+                default.
+         recursive - Whether to list the entries of all of the directories
+                     below the path (the default), or just the entries of the
+                     directory itself.
+         namespace - The namespace that the path is in; one of 'iso9660' (the
+                     default), 'rr', 'joliet', or 'udf'.
+         columnar - If False (the default), return a generator of PyCdlibEntry
+                    objects.  If True, return a dictionary mapping each of
+                    PyCdlibEntry.FIELDS, plus 'is_dir' and 'is_symlink', to a
+                    list of the values for all of the entries.
+        Returns:
+         A generator of PyCdlibEntry objects, or a dictionary of lists.
+        '''
+        if namespace not in _NAMESPACE_PATH_KEYS:
+            raise pycdlibexception.PyCdlibInvalidInput("Invalid namespace, must be one of 'iso9660', 'rr', 'joliet', or 'udf'")
+
+        entries = self._scandir(path, recursive, _NAMESPACE_PATH_KEYS[namespace])
+        if not columnar:
+            return entries
+
+        columns = collections.OrderedDict()
+        for field in PyCdlibEntry.FIELDS + ('is_dir', 'is_symlink'):
+            columns[field] = []
+        for entry in entries:
+            for field in PyCdlibEntry.FIELDS:
+                columns[field].append(getattr(entry, field))
+            columns['is_dir'].append(entry.is_dir())
+            columns['is_symlink'].append(entry.is_symlink())
+
+        return columns
+
+    def _scandir(self, path, recursive, path_key):
+        '''
+        An internal method to generate the entries for scandir().
+
+        Parameters:
+         path - The absolute path of the directory to start at.
+         recursive - Whether to list the directories below the path too.
+         path_key - The keyword to pass the path to walk_entries() as.
+        Yields:
+         PyCdlibEntry objects.
+        Returns:
+         Nothing.
+        '''
+        for dirpath_unused, dirs, files in self.walk_entries(**{path_key: path}):
+            for entry in dirs:
+                yield entry
+            for entry in files:
+                yield entry
+            if not recursive:
+                break
+
     def open_file_from_iso(self, **kwargs):
         '''
         Open a file for reading in a context manager.  This allows the user to
@@ -5677,6 +9304,19 @@ class PyCdlib(object):
 
         return PyCdlibIO(rec.inode, self.pvd.logical_block_size())
 
+    def path_index_info(self):
+        '''
+        Get the statistics for the index of paths that have been looked up on
+        this ISO.
+
+        Parameters:
+         None.
+        Returns:
+         A PathIndexInfo tuple of the hits, misses, maximum size (None if
+         unbounded) and current size of the index.
+        '''
+        return self._path_index.info()
+
     def close(self):
         '''
         Close the PyCdlib object, and re-initialize the object to the defaults.
@@ -1947,31 +1947,133 @@ class RRPDRecord(object):
 class RockRidgeEntries(object):
     '''
     A simple class container to hold a long list of possible Rock Ridge
-    records.
+    records.  The PX, PN, SL, and TF records are not needed to work out the
+    structure of the ISO, so when parsing they are kept as raw bytes and only
+    decoded the first time they are looked at.
     '''
-    __slots__ = ('sp_record', 'rr_record', 'ce_record', 'px_record',
-                 'er_record', 'es_records', 'pn_record', 'sl_records',
-                 'nm_records', 'cl_record', 'pl_record', 'tf_record',
+    __slots__ = ('sp_record', 'rr_record', 'ce_record', '_px_record',
+                 'er_record', 'es_records', '_pn_record', '_sl_records',
+                 'nm_records', 'cl_record', 'pl_record', '_tf_record',
                  'sf_record', 're_record', 'st_record', 'pd_records')
 
     def __init__(self):
         self.sp_record = None
         self.rr_record = None
         self.ce_record = None
-        self.px_record = None
+        self._px_record = None
         self.er_record = None
         self.es_records = []
-        self.pn_record = None
-        self.sl_records = []
+        self._pn_record = None
+        self._sl_records = []
         self.nm_records = []
         self.cl_record = None
         self.pl_record = None
-        self.tf_record = None
+        self._tf_record = None
         self.sf_record = None
         self.re_record = None
         self.st_record = None
         self.pd_records = []
 
+    def add_undecoded(self, rtype, rrstr):
+        '''
+        Save the raw bytes of a record to be decoded the first time it is
+        looked at.
+
+        Parameters:
+         rtype - The two byte type of the record (one of PX, PN, SL, or TF).
+         rrstr - The bytes of the record.
+        Returns:
+         Nothing.
+        '''
+        if rtype == b'PX':
+            self._px_record = rrstr
+        elif rtype == b'PN':
+            self._pn_record = rrstr
+        elif rtype == b'SL':
+            self._sl_records.append(rrstr)
+        elif rtype == b'TF':
+            self._tf_record = rrstr
+
+    def has_record(self, name):
+        '''
+        Determine whether there is a record of the named type, without
+        decoding it.
+
+        Parameters:
+         name - The name of the attribute holding the record (e.g. 'px_record').
+        Returns:
+         True if there is a record of the named type, False otherwise.
+        '''
+        if name in ('px_record', 'pn_record', 'sl_records', 'tf_record'):
+            name = '_' + name
+        return bool(getattr(self, name))
+
+    @property
+    def px_record(self):
+        '''
+        The Rock Ridge POSIX Entry record, or None.
+        '''
+        if isinstance(self._px_record, bytes):
+            px_record = RRPXRecord()
+            px_record.parse(self._px_record)
+            self._px_record = px_record
+        return self._px_record
+
+    @px_record.setter
+    def px_record(self, value):
+        self._px_record = value
+
+    @property
+    def pn_record(self):
+        '''
+        The Rock Ridge POSIX Device Number record, or None.
+        '''
+        if isinstance(self._pn_record, bytes):
+            pn_record = RRPNRecord()
+            pn_record.parse(self._pn_record)
+            self._pn_record = pn_record
+        return self._pn_record
+
+    @pn_record.setter
+    def pn_record(self, value):
+        self._pn_record = value
+
+    @property
+    def sl_records(self):
+        '''
+        The list of Rock Ridge Symbolic Link records.
+        '''
+        if self._sl_records and isinstance(self._sl_records[0], bytes):
+            sl_records = []
+            for rrstr in self._sl_records:
+                new_sl_record = RRSLRecord()
+                previous_continued = False
+                if sl_records:
+                    previous_continued = sl_records[-1].last_component_continued()
+                new_sl_record.parse(rrstr, previous_continued)
+                sl_records.append(new_sl_record)
+            self._sl_records = sl_records
+        return self._sl_records
+
+    @sl_records.setter
+    def sl_records(self, value):
+        self._sl_records = value
+
+    @property
+    def tf_record(self):
+        '''
+        The Rock Ridge Time Stamp record, or None.
+        '''
+        if isinstance(self._tf_record, bytes):
+            tf_record = RRTFRecord()
+            tf_record.parse(self._tf_record)
+            self._tf_record = tf_record
+        return self._tf_record
+
+    @tf_record.setter
+    def tf_record(self, value):
+        self._tf_record = value
+
 
 # This is the class that implements the Rock Ridge extensions for PyCdlib.  The
 # Rock Ridge extensions are a set of extensions for embedding POSIX semantics
@@ -2014,7 +2116,7 @@ class RockRidge(object):
         Returns:
          True if we have already parsed an entry of the named type, False otherwise.
         '''
-        return getattr(self.dr_entries, name) or getattr(self.ce_entries, name)
+        return self.dr_entries.has_record(name) or self.ce_entries.has_record(name)
 
     def parse(self, record, is_first_dir_record_of_root, bytes_to_skip, continuation):
         '''
@@ -2092,8 +2194,12 @@ class RockRidge(object):
                 entry_list.ce_record = RRCERecord()
                 entry_list.ce_record.parse(recslice)
             elif rtype == b'PX':
-                entry_list.px_record = RRPXRecord()
-                px_record_length = entry_list.px_record.parse(recslice)
+                # The length of the PX record tells us the Rock Ridge version,
+                # so check it now; the rest of the record is decoded later.
+                if su_len not in (36, 44):
+                    raise pycdlibexception.PyCdlibInvalidISO('Invalid length on Rock Ridge PX record')
+                entry_list.add_undecoded(rtype, record[offset:offset + su_len])
+                px_record_length = su_len
             elif rtype == b'PD':
                 pd = RRPDRecord()
                 pd.parse(recslice)
@@ -2114,16 +2220,8 @@ class RockRidge(object):
                 es.parse(recslice)
                 entry_list.es_records.append(es)
                 has_es_record = True
-            elif rtype == b'PN':
-                entry_list.pn_record = RRPNRecord()
-                entry_list.pn_record.parse(recslice)
-            elif rtype == b'SL':
-                new_sl_record = RRSLRecord()
-                previous_continued = False
-                if entry_list.sl_records:
-                    previous_continued = entry_list.sl_records[-1].last_component_continued()
-                new_sl_record.parse(recslice, previous_continued)
-                entry_list.sl_records.append(new_sl_record)
+            elif rtype in (b'PN', b'SL', b'TF'):
+                entry_list.add_undecoded(rtype, record[offset:offset + su_len])
             elif rtype == b'NM':
                 new_nm_record = RRNMRecord()
                 new_nm_record.parse(recslice)
@@ -2137,9 +2235,6 @@ class RockRidge(object):
             elif rtype == b'RE':
                 entry_list.re_record = RRRERecord()
                 entry_list.re_record.parse(recslice)
-            elif rtype == b'TF':
-                entry_list.tf_record = RRTFRecord()
-                entry_list.tf_record.parse(recslice)
             elif rtype == b'SF':
                 entry_list.sf_record = RRSFRecord()
                 sf_record_length = entry_list.sf_record.parse(recslice)
@@ -2752,7 +2847,7 @@ class RockRidge(object):
         '''
         Internal method to determine whether this Rock Ridge entry is a symlink.
         '''
-        return len(self.dr_entries.sl_records) > 0 or len(self.ce_entries.sl_records) > 0
+        return self.dr_entries.has_record('sl_records') or self.ce_entries.has_record('sl_records')
 
     def is_symlink(self):
         '''
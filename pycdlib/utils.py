@@ -24,9 +24,11 @@ try:
     import cStringIO  # pylint: disable=import-error
 except ImportError:
     pass
+import calendar
 import io
 import os
 import socket
+import stat
 import sys
 import time
 
@@ -312,3 +314,67 @@ def file_object_supports_binary(fp):
 
     # Python 2
     return isinstance(fp, (cStringIO.OutputType, cStringIO.InputType, io.RawIOBase, io.BufferedIOBase))
+
+
+def dr_date_to_epoch(date):
+    '''
+    A function to convert a Directory Record date into seconds since the
+    epoch.
+
+    Parameters:
+     date - The DirectoryRecordDate to convert.
+    Returns:
+     The number of seconds since the epoch, or None if the date is not valid.
+    '''
+    try:
+        return calendar.timegm((date.years_since_1900 + 1900, date.month,
+                                date.day_of_month, date.hour, date.minute,
+                                date.second, 0, 0, 0)) - date.gmtoffset * 15 * 60
+    except (ValueError, OverflowError):
+        return None
+
+
+def udf_timestamp_to_epoch(timestamp):
+    '''
+    A function to convert a UDF Timestamp into seconds since the epoch.
+
+    Parameters:
+     timestamp - The UDFTimestamp to convert.
+    Returns:
+     The number of seconds since the epoch, or None if the date is not valid.
+    '''
+    try:
+        mtime = calendar.timegm((timestamp.year, timestamp.month, timestamp.day,
+                                 timestamp.hour, timestamp.minute,
+                                 timestamp.second, 0, 0, 0))
+    except (ValueError, OverflowError):
+        return None
+
+    if timestamp.tz != -2047:
+        mtime -= timestamp.tz * 60
+    return mtime
+
+
+def udf_file_entry_mode(file_entry):
+    '''
+    A function to convert the type and permissions of a UDF File Entry into
+    a POSIX mode, as described in ECMA-167 Part 4, 14.9.5.
+
+    Parameters:
+     file_entry - The UDFFileEntry to get the mode of.
+    Returns:
+     The POSIX mode.
+    '''
+    if file_entry.is_dir():
+        mode = stat.S_IFDIR
+    elif file_entry.is_symlink():
+        mode = stat.S_IFLNK
+    else:
+        mode = stat.S_IFREG
+
+    # UDF keeps 5 bits (execute, write, read, change attribute, and delete)
+    # for each of other, group, and owner; POSIX wants the low 3 of each.
+    for shift in (0, 1, 2):
+        mode |= ((file_entry.perms >> (shift * 5)) & 0x7) << (shift * 3)
+
+    return mode
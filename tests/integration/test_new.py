@@ -10,7 +10,11 @@ try:
     from cStringIO import StringIO as BytesIO
 except ImportError:
     from io import BytesIO
+import stat
+import threading
+import time
 import struct
+import pickle
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
@@ -6098,3 +6102,1601 @@ def test_new_open_file_from_iso_readinto_past_eof():
         assert(arr == b'\x00\x00')
 
     iso.close()
+
+def test_new_open_lazy():
+    iso = pycdlib.PyCdlib()
+    iso.new(rock_ridge='1.09', joliet=3, udf='2.60')
+
+    iso.add_directory('/DIR1', rr_name='dir1', joliet_path='/dir1', udf_path='/dir1')
+    foostr = b'foo\n'
+    iso.add_fp(BytesIO(foostr), len(foostr), '/DIR1/FOO.;1', rr_name='foo',
+               joliet_path='/dir1/foo', udf_path='/dir1/foo')
+    barstr = b'bar\n'
+    iso.add_fp(BytesIO(barstr), len(barstr), '/BAR.;1', rr_name='bar',
+               joliet_path='/bar', udf_path='/bar')
+
+    out = BytesIO()
+    iso.write_fp(out)
+    iso.close()
+
+    iso.open_fp(out, lazy=True)
+
+    for kwargs in ({'iso_path': '/DIR1/FOO.;1'}, {'rr_path': '/dir1/foo'},
+                   {'joliet_path': '/dir1/foo'}, {'udf_path': '/dir1/foo'}):
+        with iso.open_file_from_iso(**kwargs) as infp:
+            assert(infp.read() == foostr)
+
+    names = [c.file_identifier() for c in iso.list_children(iso_path='/DIR1')]
+    assert(names == [b'.', b'..', b'FOO.;1'])
+
+    walked = list(iso.walk(rr_path='/'))
+    assert(walked == [('/', ['dir1'], ['bar']), ('/dir1', [], ['foo'])])
+
+    out2 = BytesIO()
+    iso.write_fp(out2)
+    assert(len(out2.getvalue()) == len(out.getvalue()))
+    iso.close()
+
+    iso.open_fp(out2)
+    with iso.open_file_from_iso(udf_path='/bar') as infp:
+        assert(infp.read() == barstr)
+
+    iso.close()
+
+def test_new_open_lazy_rr_deep():
+    iso = pycdlib.PyCdlib()
+    iso.new(rock_ridge='1.09')
+
+    iso.add_directory('/DIR1', rr_name='dir1')
+    iso.add_directory('/DIR1/DIR2', rr_name='dir2')
+    iso.add_directory('/DIR1/DIR2/DIR3', rr_name='dir3')
+    iso.add_directory('/DIR1/DIR2/DIR3/DIR4', rr_name='dir4')
+    iso.add_directory('/DIR1/DIR2/DIR3/DIR4/DIR5', rr_name='dir5')
+    iso.add_directory('/DIR1/DIR2/DIR3/DIR4/DIR5/DIR6', rr_name='dir6')
+    iso.add_directory('/DIR1/DIR2/DIR3/DIR4/DIR5/DIR6/DIR7', rr_name='dir7')
+    iso.add_directory('/DIR1/DIR2/DIR3/DIR4/DIR5/DIR6/DIR7/DIR8', rr_name='dir8')
+
+    out = BytesIO()
+    iso.write_fp(out)
+    iso.close()
+
+    iso.open_fp(out, lazy=True)
+
+    rec = iso.get_record(rr_path='/dir1/dir2/dir3/dir4/dir5/dir6/dir7/dir8')
+    assert(rec.rock_ridge.name() == b'dir8')
+    assert(rec.rock_ridge.moved_to_cl_dr is not None)
+
+    out2 = BytesIO()
+    iso.write_fp(out2)
+    iso.close()
+
+    iso.open_fp(out2)
+    check_rr_deep_dir(iso, len(out2.getvalue()))
+
+    iso.close()
+
+def test_new_open_lazy_modify():
+    iso = pycdlib.PyCdlib()
+    iso.new(joliet=3)
+
+    iso.add_directory('/DIR1', joliet_path='/dir1')
+
+    out = BytesIO()
+    iso.write_fp(out)
+    iso.close()
+
+    iso.open_fp(out, lazy=True)
+
+    foostr = b'foo\n'
+    iso.add_fp(BytesIO(foostr), len(foostr), '/DIR1/FOO.;1',
+               joliet_path='/dir1/foo')
+
+    out2 = BytesIO()
+    iso.write_fp(out2)
+    iso.close()
+
+    iso.open_fp(out2)
+    with iso.open_file_from_iso(joliet_path='/dir1/foo') as infp:
+        assert(infp.read() == foostr)
+
+    iso.close()
+
+def test_new_open_lazy_eltorito_subdir():
+    iso = pycdlib.PyCdlib()
+    iso.new(rock_ridge='1.09', joliet=3)
+
+    iso.add_directory('/DIR1', rr_name='dir1', joliet_path='/dir1')
+    bootstr = b'boot\n'
+    iso.add_fp(BytesIO(bootstr), len(bootstr), '/DIR1/BOOT.;1', rr_name='boot',
+               joliet_path='/dir1/boot')
+    iso.add_eltorito('/DIR1/BOOT.;1', '/BOOT.CAT;1')
+
+    out = BytesIO()
+    iso.write_fp(out)
+    iso.close()
+
+    iso.open_fp(out, lazy=True)
+
+    with iso.open_file_from_iso(iso_path='/DIR1/BOOT.;1') as infp:
+        assert(infp.read() == bootstr)
+
+    rec = iso.get_record(joliet_path='/dir1/boot')
+    assert(rec.inode is iso.eltorito_boot_catalog.initial_entry.inode)
+
+    out2 = BytesIO()
+    iso.write_fp(out2)
+    assert(len(out2.getvalue()) == len(out.getvalue()))
+    iso.close()
+
+    iso.open_fp(out2)
+    with iso.open_file_from_iso(iso_path='/DIR1/BOOT.;1') as infp:
+        assert(infp.read() == bootstr)
+
+    iso.close()
+
+def test_new_open_snapshot(tmpdir, monkeypatch):
+    iso = pycdlib.PyCdlib()
+    iso.new(rock_ridge='1.09', joliet=3, udf='2.60')
+
+    iso.add_directory('/DIR1', rr_name='dir1', joliet_path='/dir1', udf_path='/dir1')
+    foostr = b'foo\n'
+    iso.add_fp(BytesIO(foostr), len(foostr), '/DIR1/FOO.;1', rr_name='foo',
+               joliet_path='/dir1/foo', udf_path='/dir1/foo')
+    bootstr = b'boot\n'
+    iso.add_fp(BytesIO(bootstr), len(bootstr), '/BOOT.;1', rr_name='boot',
+               joliet_path='/boot', udf_path='/boot')
+    iso.add_eltorito('/BOOT.;1', '/BOOT.CAT;1')
+
+    testout = tmpdir.join('snapshot.iso')
+    iso.write(str(testout))
+    iso.close()
+
+    snapshot = str(tmpdir.join('snapshot.iso.snap'))
+    iso.open(str(testout), snapshot=snapshot)
+    iso.close()
+    assert(os.path.exists(snapshot))
+
+    def _no_walk(*args):
+        raise Exception('The directories should not be walked')
+    monkeypatch.setattr(pycdlib.PyCdlib, '_walk_directories', _no_walk)
+
+    iso.open(str(testout), snapshot=snapshot)
+
+    iso_rec = iso.get_record(iso_path='/DIR1/FOO.;1')
+    assert(iso_rec.inode is iso.get_record(joliet_path='/dir1/foo').inode)
+    assert(iso_rec.inode is iso.get_record(udf_path='/dir1/foo').inode)
+    boot_rec = iso.get_record(iso_path='/BOOT.;1')
+    assert(iso.eltorito_boot_catalog.initial_entry.inode is boot_rec.inode)
+
+    with iso.open_file_from_iso(rr_path='/dir1/foo') as infp:
+        assert(infp.read() == foostr)
+
+    barstr = b'bar\n'
+    iso.add_fp(BytesIO(barstr), len(barstr), '/BAR.;1', rr_name='bar',
+               joliet_path='/bar', udf_path='/bar')
+    testout2 = tmpdir.join('snapshot2.iso')
+    iso.write(str(testout2))
+    iso.close()
+
+    # A snapshot of a different ISO must not be used.
+    monkeypatch.undo()
+    iso.open(str(testout2), snapshot=snapshot)
+    with iso.open_file_from_iso(udf_path='/bar') as infp:
+        assert(infp.read() == barstr)
+    iso.close()
+
+def test_new_open_snapshot_not_allowed(tmpdir):
+    iso = pycdlib.PyCdlib()
+    iso.new()
+    testout = tmpdir.join('snapshot.iso')
+    iso.write(str(testout))
+    iso.close()
+
+    snapshot = str(tmpdir.join('snapshot.iso.snap'))
+    iso.open(str(testout), snapshot=snapshot)
+    iso.close()
+
+    # A snapshot with a valid header that would call a function when loaded.
+    marker = tmpdir.join('marker')
+    marker.write('marker')
+
+    class Remove(object):
+        def __reduce__(self):
+            return (os.remove, (str(marker),))
+
+    with open(snapshot, 'rb') as infp:
+        header = pickle.load(infp)
+    with open(snapshot, 'wb') as outfp:
+        pickle.dump(header, outfp)
+        pickle.dump({'pvd': Remove()}, outfp)
+
+    iso.open(str(testout), snapshot=snapshot)
+    assert(marker.check())
+    assert(iso.pvd is not None)
+    iso.close()
+
+def test_new_open_snapshot_not_picklable(tmpdir, monkeypatch):
+    iso = pycdlib.PyCdlib()
+    iso.new()
+    testout = tmpdir.join('snapshot.iso')
+    iso.write(str(testout))
+    iso.close()
+
+    snapshot_state = pycdlib.PyCdlib._snapshot_state
+    def _unpicklable_state(self):
+        state = snapshot_state(self)
+        state['xa'] = lambda: None
+        return state
+    monkeypatch.setattr(pycdlib.PyCdlib, '_snapshot_state', _unpicklable_state)
+
+    # The snapshot is skipped, but the ISO is still opened.
+    snapshot = tmpdir.join('snapshot.iso.snap')
+    iso.open(str(testout), snapshot=str(snapshot))
+    assert(not snapshot.check())
+    assert(tmpdir.listdir() == [testout])
+    iso.close()
+
+def test_new_open_snapshot_lazy():
+    iso = pycdlib.PyCdlib()
+    iso.new()
+
+    out = BytesIO()
+    iso.write_fp(out)
+    iso.close()
+
+    with pytest.raises(pycdlib.pycdlibexception.PyCdlibInvalidInput) as excinfo:
+        iso.open_fp(out, lazy=True, snapshot='unused')
+    assert(str(excinfo.value) == 'Only one of lazy and snapshot can be used')
+
+def test_new_open_read_ahead():
+    class CountingBytesIO(BytesIO):
+        def __init__(self, data):
+            BytesIO.__init__(self, data)
+            self.reads = 0
+
+        def read(self, *args):
+            self.reads += 1
+            return BytesIO.read(self, *args)
+
+    iso = pycdlib.PyCdlib()
+    iso.new(rock_ridge='1.09')
+
+    for d in range(20):
+        iso.add_directory('/DIR%d' % (d), rr_name='dir%d' % (d))
+        for f in range(5):
+            iso.add_fp(BytesIO(b'foo\n'), 4, '/DIR%d/FOO%d.;1' % (d, f),
+                       rr_name='foo%d' % (f) + 'x' * 200)
+
+    out = BytesIO()
+    iso.write_fp(out)
+    iso.close()
+
+    counting = CountingBytesIO(out.getvalue())
+    iso.open_fp(counting)
+
+    # Each of the 21 directories and 100 continuation areas would need its
+    # own read without read-ahead.
+    assert(counting.reads < 21)
+    rec = iso.get_record(rr_path='/dir19/foo4' + 'x' * 200)
+    assert(rec.rock_ridge.name() == b'foo4' + b'x' * 200)
+
+    iso.close()
+
+def test_new_open_lazy_read_ahead_bounded(monkeypatch):
+    monkeypatch.setattr(pycdlib.pycdlib, '_LAZY_READ_AHEAD_MAX_BYTES', 4 * 2048)
+
+    iso = pycdlib.PyCdlib()
+    iso.new(rock_ridge='1.09')
+
+    for d in range(20):
+        iso.add_directory('/DIR%d' % (d), rr_name='dir%d' % (d))
+        for f in range(5):
+            iso.add_fp(BytesIO(b'foo\n'), 4, '/DIR%d/FOO%d.;1' % (d, f),
+                       rr_name='foo%d' % (f) + 'x' * 200)
+
+    out = BytesIO()
+    iso.write_fp(out)
+    iso.close()
+
+    # Browsing every directory of a lazily opened ISO reads all of the
+    # continuation areas, but only the most recent ones stay cached.
+    iso.open_fp(out, lazy=True)
+    for d in range(20):
+        names = [c.rock_ridge.name() for c in iso.list_children(rr_path='/dir%d' % (d))
+                 if c.rock_ridge is not None and not c.is_dot() and not c.is_dotdot()]
+        assert(sorted(names) == [b'foo%d' % (f) + b'x' * 200 for f in range(5)])
+        for state in iso._lazy.walk_states:
+            assert(state.read_ahead.size() <= 4 * 2048)
+
+    iso.close()
+
+def test_new_rr_deferred_decode():
+    iso = pycdlib.PyCdlib()
+    iso.new(rock_ridge='1.09')
+
+    foostr = b'foo\n'
+    iso.add_fp(BytesIO(foostr), len(foostr), '/FOO.;1', rr_name='foo')
+    iso.add_symlink('/SYM.;1', 'sym', 'foo')
+
+    out = BytesIO()
+    iso.write_fp(out)
+    iso.close()
+
+    iso.open_fp(out)
+
+    rec = iso.get_record(rr_path='/sym')
+    assert(rec.rock_ridge.is_symlink())
+    assert(isinstance(rec.rock_ridge.dr_entries._tf_record, bytes))
+    assert(isinstance(rec.rock_ridge.dr_entries._sl_records[0], bytes))
+    assert(rec.rock_ridge.dr_entries.tf_record.modification_time is not None)
+    assert(rec.rock_ridge.symlink_path() == b'foo')
+    assert(isinstance(rec.rock_ridge.dr_entries._sl_records[0], pycdlib.rockridge.RRSLRecord))
+
+    rec = iso.get_record(rr_path='/foo')
+    assert(rec.rock_ridge.get_file_mode() == 0o100444)
+
+    out2 = BytesIO()
+    iso.write_fp(out2)
+    assert(len(out2.getvalue()) == len(out.getvalue()))
+
+    iso.close()
+
+def test_new_open_namespaces():
+    iso = pycdlib.PyCdlib()
+    iso.new(rock_ridge='1.09', joliet=3, udf='2.60')
+
+    iso.add_directory('/DIR1', rr_name='dir1', joliet_path='/dir1', udf_path='/dir1')
+    foostr = b'foo\n'
+    iso.add_fp(BytesIO(foostr), len(foostr), '/DIR1/FOO.;1', rr_name='foo',
+               joliet_path='/dir1/foo', udf_path='/dir1/foo')
+
+    out = BytesIO()
+    iso.write_fp(out)
+    iso.close()
+
+    iso.open_fp(out, namespaces=['joliet'])
+    with iso.open_file_from_iso(joliet_path='/dir1/foo') as infp:
+        assert(infp.read() == foostr)
+    assert(iso.pvd.root_directory_record().children == [])
+
+    with pytest.raises(pycdlib.pycdlibexception.PyCdlibInvalidInput) as excinfo:
+        iso.get_record(iso_path='/DIR1/FOO.;1')
+    assert(str(excinfo.value) == "The 'iso9660' namespace was not parsed when this ISO was opened")
+
+    with pytest.raises(pycdlib.pycdlibexception.PyCdlibInvalidInput) as excinfo:
+        iso.write_fp(BytesIO())
+    assert(str(excinfo.value) == 'This ISO was opened without parsing all of it, so it cannot be modified or written out')
+    iso.close()
+
+    iso.open_fp(out, namespaces=['udf'], verify_redundant=False)
+    with iso.open_file_from_iso(udf_path='/dir1/foo') as infp:
+        assert(infp.read() == foostr)
+
+    with pytest.raises(pycdlib.pycdlibexception.PyCdlibInvalidInput) as excinfo:
+        iso.get_record(joliet_path='/dir1/foo')
+    assert(str(excinfo.value) == "The 'joliet' namespace was not parsed when this ISO was opened")
+
+    with pytest.raises(pycdlib.pycdlibexception.PyCdlibInvalidInput) as excinfo:
+        iso.add_fp(BytesIO(foostr), len(foostr), '/BAR.;1', udf_path='/bar')
+    assert(str(excinfo.value) == 'This ISO was opened without parsing all of it, so it cannot be modified or written out')
+    iso.close()
+
+    # Skipping only the big-endian path tables still allows writing.
+    iso.open_fp(out, verify_redundant=False)
+    iso.close()
+
+    iso.open_fp(out, namespaces=['iso9660', 'joliet'])
+    with iso.open_file_from_iso(rr_path='/dir1/foo') as infp:
+        assert(infp.read() == foostr)
+    iso.close()
+
+def test_new_open_namespaces_invalid():
+    iso = pycdlib.PyCdlib()
+    iso.new()
+
+    out = BytesIO()
+    iso.write_fp(out)
+    iso.close()
+
+    with pytest.raises(pycdlib.pycdlibexception.PyCdlibInvalidInput) as excinfo:
+        iso.open_fp(out, namespaces=['rr'])
+    assert(str(excinfo.value) == "Invalid namespace 'rr'; must be one of 'iso9660', 'joliet', or 'udf'")
+
+class SlowRangeReader(pycdlib.backend.FileRangeReader):
+    def __init__(self, fp):
+        super(SlowRangeReader, self).__init__(fp)
+        self.calls = 0
+
+    def read_at(self, offset, length):
+        self.calls += 1
+        return super(SlowRangeReader, self).read_at(offset, length)
+
+def test_new_open_reader():
+    iso = pycdlib.PyCdlib()
+    iso.new(rock_ridge='1.09', joliet=3, udf='2.60')
+
+    for d in range(5):
+        iso.add_directory('/DIR%d' % (d), rr_name='dir%d' % (d),
+                          joliet_path='/dir%d' % (d), udf_path='/dir%d' % (d))
+        for f in range(10):
+            data = b'file %d %d\n' % (d, f)
+            iso.add_fp(BytesIO(data), len(data), '/DIR%d/FILE%d.;1' % (d, f),
+                       rr_name='file%d' % (f), joliet_path='/dir%d/file%d' % (d, f),
+                       udf_path='/dir%d/file%d' % (d, f))
+    bigstr = b'big\n' * 100000
+    iso.add_fp(BytesIO(bigstr), len(bigstr), '/BIG.;1', rr_name='big',
+               joliet_path='/big', udf_path='/big')
+
+    out = BytesIO()
+    iso.write_fp(out)
+    iso.close()
+
+    reader = SlowRangeReader(out)
+    iso.open_reader(reader)
+    assert(reader.calls < 10)
+
+    with iso.open_file_from_iso(udf_path='/dir3/file7') as infp:
+        assert(infp.read() == b'file 3 7\n')
+
+    calls = reader.calls
+    data = b''
+    with iso.open_file_from_iso(rr_path='/big') as infp:
+        while True:
+            chunk = infp.read(2048)
+            if not chunk:
+                break
+            data += chunk
+    assert(data == bigstr)
+    assert(reader.calls - calls < 10)
+
+    out2 = BytesIO()
+    iso.write_fp(out2)
+    assert(len(out2.getvalue()) == len(out.getvalue()))
+    iso.close()
+
+    iso.open_fp(out2)
+    with iso.open_file_from_iso(joliet_path='/dir3/file7') as infp:
+        assert(infp.read() == b'file 3 7\n')
+
+    iso.close()
+
+def test_new_open_reader_invalid_block_size():
+    iso = pycdlib.PyCdlib()
+    iso.new()
+
+    out = BytesIO()
+    iso.write_fp(out)
+    iso.close()
+
+    with pytest.raises(pycdlib.pycdlibexception.PyCdlibInvalidInput) as excinfo:
+        iso.open_reader(pycdlib.backend.FileRangeReader(out), block_size=1000)
+    assert(str(excinfo.value) == 'The block size must be a power of 2 of at least 512')
+
+def test_new_cached_range_file_read_at():
+    data = bytes(bytearray(i % 251 for i in range(10000)))
+    fp = pycdlib.backend.CachedRangeFile(pycdlib.backend.FileRangeReader(BytesIO(data)),
+                                         block_size=512, cache_blocks=4)
+
+    # Reads inside one block, across block boundaries, over more blocks than
+    # the cache holds, and off of the end of the file.
+    for offset, length in ((0, 10), (500, 12), (512, 512), (1000, 3000),
+                           (100, 9900), (9990, 100), (10000, 10)):
+        assert(fp.read_at(offset, length) == data[offset:offset + length])
+        assert(fp.read_at(offset, length) == data[offset:offset + length])
+
+def test_new_cached_range_file_read_at_evicted():
+    data = bytes(bytearray(i % 251 for i in range(10000)))
+    fp = pycdlib.backend.CachedRangeFile(pycdlib.backend.FileRangeReader(BytesIO(data)),
+                                         block_size=512, cache_blocks=2,
+                                         read_ahead=0)
+
+    # Fetching the missing block 0 pushes the cached block 1 out of the cache
+    # before it is used.
+    assert(fp.read_at(512, 1) == data[512:513])
+    assert(fp.read_at(2560, 1) == data[2560:2561])
+    assert(fp.read_at(0, 1536) == data[0:1536])
+
+def test_new_index_many(tmpdir):
+    import pycdlib.index
+
+    isos = []
+    for i in range(3):
+        iso = pycdlib.PyCdlib()
+        iso.new(rock_ridge='1.09', joliet=3, udf='2.60')
+
+        iso.add_directory('/DIR1', rr_name='dir1', joliet_path='/dir1', udf_path='/dir1')
+        foostr = b'foo%d\n' % (i)
+        iso.add_fp(BytesIO(foostr), len(foostr), '/DIR1/FOO.;1', rr_name='foo',
+                   joliet_path='/dir1/foo', udf_path='/dir1/foo')
+
+        outfile = str(tmpdir.join('index%d.iso' % (i)))
+        iso.write(outfile)
+        iso.close()
+        isos.append(outfile)
+    missing = str(tmpdir.join('missing.iso'))
+    isos.append(missing)
+
+    results = list(pycdlib.index.index_many(isos, processes=2))
+    assert([r.filename for r in results] == isos)
+
+    for result in results[:3]:
+        assert(result.error is None)
+        assert(result.size == os.path.getsize(result.filename))
+        listing = [(e.namespace, e.path, e.is_dir, e.size) for e in result.entries]
+        assert(listing == [('rr', '/dir1', True, 2048),
+                           ('rr', '/dir1/foo', False, 5),
+                           ('joliet', '/dir1', True, 2048),
+                           ('joliet', '/dir1/foo', False, 5),
+                           ('udf', '/dir1', True, 84),
+                           ('udf', '/dir1/foo', False, 5)])
+        files = [e for e in result.entries if not e.is_dir]
+        assert(len(set(e.extent for e in files)) == 1)
+        for e in files:
+            assert(e.mtime is not None)
+        assert(files[0].mode == 0o100444)
+        assert(files[2].mode == 0o100444)
+
+    assert(results[3].entries == ())
+    assert(results[3].error is not None)
+
+    results = list(pycdlib.index.index_many(isos[:1], processes=1,
+                                            namespaces=['joliet']))
+    assert([e.path for e in results[0].entries] == ['/dir1', '/dir1/foo'])
+    assert(results[0].entries[0].namespace == 'joliet')
+
+    # Bad arguments are rejected when index_many() is called, not when the
+    # results are first asked for.
+    with pytest.raises(pycdlib.pycdlibexception.PyCdlibInvalidInput):
+        pycdlib.index.index_many(isos, processes=0)
+
+def test_new_index_iso_relocated(tmpdir):
+    import pycdlib.index
+
+    iso = pycdlib.PyCdlib()
+    iso.new(rock_ridge='1.09')
+    path = ''
+    for i in range(1, 9):
+        path += '/DIR%d' % (i)
+        iso.add_directory(path, rr_name='dir%d' % (i))
+    foostr = b'foo\n'
+    iso.add_fp(BytesIO(foostr), len(foostr), path + '/FOO.;1', rr_name='foo')
+
+    outfile = str(tmpdir.join('reloc.iso'))
+    iso.write(outfile)
+    iso.close()
+
+    result = pycdlib.index.index_iso(outfile)
+    assert(result.error is None)
+    entries = dict((e.path, e) for e in result.entries)
+
+    # The deepest directory is relocated, and is listed at its Rock Ridge
+    # path along with its contents.
+    deep = '/dir1/dir2/dir3/dir4/dir5/dir6/dir7/dir8'
+    iso.open(outfile)
+    assert(entries[deep].is_dir)
+    assert(entries[deep].extent == iso.get_record(rr_path=deep).extent_location())
+    assert(entries[deep + '/foo'].size == len(foostr))
+    iso.close()
+
+def test_new_index_iso_bad_name(tmpdir):
+    import pycdlib.index
+
+    iso = pycdlib.PyCdlib()
+    iso.new(rock_ridge='1.09')
+    foostr = b'foo\n'
+    iso.add_fp(BytesIO(foostr), len(foostr), '/FOO.;1', rr_name='abcname')
+    out = BytesIO()
+    iso.write_fp(out)
+    iso.close()
+
+    # A Rock Ridge name that is not valid UTF-8 still gets listed.
+    outfile = str(tmpdir.join('badname.iso'))
+    with open(outfile, 'wb') as fp:
+        fp.write(out.getvalue().replace(b'abcname', b'abc\xffame'))
+
+    result = pycdlib.index.index_iso(outfile)
+    assert(result.error is None)
+    expected = u'/abc\ufffdame'
+    if sys.version_info < (3, 0):
+        expected = expected.encode('utf-8')
+    assert([e.path for e in result.entries] == [expected])
+
+def test_new_stats():
+    iso = pycdlib.PyCdlib()
+    iso.new(rock_ridge='1.09', joliet=3, udf='2.60')
+
+    iso.add_directory('/DIR1', rr_name='dir1', joliet_path='/dir1', udf_path='/dir1')
+    foostr = b'foo\n'
+    iso.add_fp(BytesIO(foostr), len(foostr), '/DIR1/FOO.;1', rr_name='foo',
+               joliet_path='/dir1/foo', udf_path='/dir1/foo')
+
+    out = BytesIO()
+    iso.write_fp(out)
+    iso.close()
+
+    finished = []
+    stats = pycdlib.PyCdlibStats(callback=lambda phase, seconds: finished.append(phase))
+    iso = pycdlib.PyCdlib(stats=stats)
+    iso.open_fp(out)
+
+    for phase in ('volume_descriptors', 'path_tables', 'walk_iso9660',
+                  'walk_joliet', 'udf_descriptors', 'walk_udf'):
+        assert(phase in stats.phases)
+        assert(phase in finished)
+        assert(stats.phases[phase] >= 0.0)
+    assert(stats.seeks > 0)
+    assert(stats.reads > 0)
+    assert(stats.bytes_read > 0)
+    # The dot, dotdot, and one child records of the root and DIR1 in both the
+    # ISO9660 and Joliet trees, plus the two UDF File Entries.
+    assert(stats.records_parsed == 3 * 2 * 2 + 2)
+    assert(stats.inodes_created == 1)
+
+    stats.reset()
+    iso.rm_file('/DIR1/FOO.;1', rr_name='foo')
+
+    out2 = BytesIO()
+    iso.write_fp(out2)
+    assert(list(stats.phases) == ['reshuffle', 'write'])
+    assert(finished[-2:] == ['reshuffle', 'write'])
+    assert(stats.phases['write'] >= stats.phases['reshuffle'])
+
+    iso.close()
+
+def test_new_lookup_child_index():
+    iso = pycdlib.PyCdlib()
+    iso.new(rock_ridge='1.09', joliet=3)
+
+    iso.add_directory('/DIR1', rr_name='dir1', joliet_path='/dir1')
+    foostr = b'foo\n'
+    iso.add_fp(BytesIO(foostr), len(foostr), '/DIR1/FOO.;1', rr_name='foo',
+               joliet_path='/dir1/foo')
+
+    # Build the indices, then make sure they follow later adds and removes.
+    assert(iso.get_record(iso_path='/DIR1/FOO.;1').file_identifier() == b'FOO.;1')
+    assert(iso.get_record(rr_path='/dir1/foo').file_identifier() == b'FOO.;1')
+    assert(iso.get_record(joliet_path='/dir1/foo').file_identifier() == 'foo'.encode('utf-16_be'))
+
+    iso.add_fp(BytesIO(foostr), len(foostr), '/DIR1/BAR.;1', rr_name='bar',
+               joliet_path='/dir1/bar')
+    assert(iso.get_record(iso_path='/DIR1/BAR.;1').file_identifier() == b'BAR.;1')
+    assert(iso.get_record(rr_path='/dir1/bar').file_identifier() == b'BAR.;1')
+    assert(iso.get_record(joliet_path='/dir1/bar').file_identifier() == 'bar'.encode('utf-16_be'))
+
+    iso.rm_file('/DIR1/FOO.;1', rr_name='foo', joliet_path='/dir1/foo')
+    for kwargs in ({'iso_path': '/DIR1/FOO.;1'}, {'rr_path': '/dir1/foo'},
+                   {'joliet_path': '/dir1/foo'}):
+        with pytest.raises(pycdlib.pycdlibexception.PyCdlibInvalidInput):
+            iso.get_record(**kwargs)
+
+    iso.close()
+
+def test_new_path_index():
+    iso = pycdlib.PyCdlib()
+    iso.new(rock_ridge='1.09', joliet=3, udf='2.60')
+
+    iso.add_directory('/DIR1', rr_name='dir1', joliet_path='/dir1', udf_path='/dir1')
+    foostr = b'foo\n'
+    iso.add_fp(BytesIO(foostr), len(foostr), '/DIR1/FOO.;1', rr_name='foo',
+               joliet_path='/dir1/foo', udf_path='/dir1/foo')
+    iso.add_fp(BytesIO(foostr), len(foostr), '/BAR.;1', rr_name='bar',
+               joliet_path='/bar', udf_path='/bar')
+
+    for kwargs in ({'iso_path': '/DIR1/FOO.;1'}, {'rr_path': '/dir1/foo'},
+                   {'joliet_path': '/dir1/foo'}, {'udf_path': '/dir1/foo'},
+                   {'iso_path': '/BAR.;1'}):
+        iso.get_record(**kwargs)
+    before = iso.path_index_info()
+    iso.get_record(iso_path='/DIR1/FOO.;1')
+    iso.get_record(udf_path='/dir1/foo')
+    after = iso.path_index_info()
+    assert(after.hits == before.hits + 2)
+    assert(after.misses == before.misses)
+    assert(after.maxsize is None)
+
+    # Removing a file only drops the paths that lead to it.
+    iso.rm_file('/DIR1/FOO.;1', rr_name='foo', joliet_path='/dir1/foo',
+                udf_path='/dir1/foo')
+    for kwargs in ({'iso_path': '/DIR1/FOO.;1'}, {'rr_path': '/dir1/foo'},
+                   {'joliet_path': '/dir1/foo'}, {'udf_path': '/dir1/foo'}):
+        with pytest.raises(pycdlib.pycdlibexception.PyCdlibInvalidInput):
+            iso.get_record(**kwargs)
+    before = iso.path_index_info()
+    iso.get_record(iso_path='/BAR.;1')
+    assert(iso.path_index_info().hits == before.hits + 1)
+
+    iso.close()
+    assert(iso.path_index_info().currsize == 0)
+
+def test_new_path_index_bounded():
+    iso = pycdlib.PyCdlib(path_index_size=2)
+    iso.new()
+
+    foostr = b'foo\n'
+    for name in ('/A.;1', '/B.;1', '/C.;1'):
+        iso.add_fp(BytesIO(foostr), len(foostr), name)
+        iso.get_record(iso_path=name)
+
+    info = iso.path_index_info()
+    assert(info.maxsize == 2)
+    assert(info.currsize == 2)
+
+    # The least recently used path was dropped.
+    iso.get_record(iso_path='/A.;1')
+    assert(iso.path_index_info().misses == info.misses + 1)
+    iso.get_record(iso_path='/C.;1')
+    assert(iso.path_index_info().hits == info.hits + 1)
+
+    iso.close()
+
+def test_new_get_records():
+    iso = pycdlib.PyCdlib()
+    iso.new(rock_ridge='1.09', joliet=3, udf='2.60')
+
+    iso.add_directory('/DIR1', rr_name='dir1', joliet_path='/dir1', udf_path='/dir1')
+    foostr = b'foo\n'
+    for name in ('foo', 'bar'):
+        iso.add_fp(BytesIO(foostr), len(foostr), '/DIR1/%s.;1' % (name.upper()),
+                   rr_name=name, joliet_path='/dir1/' + name,
+                   udf_path='/dir1/' + name)
+
+    paths = ['/DIR1/FOO.;1', '/', '/DIR1/BAR.;1', '/DIR1/BAZ.;1',
+             '/DIR1/FOO.;1/X', 'DIR1']
+    results = iso.get_records(paths)
+    assert([r.path for r in results] == paths)
+    for result in results[:3]:
+        assert(result.error is None)
+    assert(results[0].record is iso.get_record(iso_path='/DIR1/FOO.;1'))
+    assert(results[1].record is iso.get_record(iso_path='/'))
+    assert(results[2].record is iso.get_record(iso_path='/DIR1/BAR.;1'))
+    for result in results[3:]:
+        assert(result.record is None)
+        assert(isinstance(result.error, pycdlib.pycdlibexception.PyCdlibInvalidInput))
+
+    results = iso.get_records(['/dir1/foo', '/dir1/baz'], 'rr')
+    assert(results[0].record is iso.get_record(rr_path='/dir1/foo'))
+    assert(results[1].error is not None)
+
+    results = iso.get_records(['/dir1/bar', '/dir1'], 'joliet')
+    assert(results[0].record is iso.get_record(joliet_path='/dir1/bar'))
+    assert(results[1].record is iso.get_record(joliet_path='/dir1'))
+
+    results = iso.get_records(['/dir1/foo', '/dir1/foo/x'], 'udf')
+    assert(results[0].record is iso.get_record(udf_path='/dir1/foo'))
+    assert(results[1].error is not None)
+
+    with pytest.raises(pycdlib.pycdlibexception.PyCdlibInvalidInput):
+        iso.get_records(['/'], 'bogus')
+
+    iso.close()
+
+def test_new_walk_entries():
+    iso = pycdlib.PyCdlib()
+    iso.new(rock_ridge='1.09', joliet=3, udf='2.60')
+
+    iso.add_directory('/DIR1', rr_name='dir1', joliet_path='/dir1', udf_path='/dir1')
+    iso.add_directory('/DIR1/SUBDIR1', rr_name='subdir1',
+                      joliet_path='/dir1/subdir1', udf_path='/dir1/subdir1')
+    iso.add_directory('/DIR2', rr_name='dir2', joliet_path='/dir2', udf_path='/dir2')
+    foostr = b'foo\n'
+    iso.add_fp(BytesIO(foostr), len(foostr), '/DIR1/FOO.;1', rr_name='foo',
+               joliet_path='/dir1/foo', udf_path='/dir1/foo')
+    iso.add_symlink('/SYM.;1', 'sym', 'dir1/foo')
+
+    walked = [(path, [d.path for d in dirs], [f.path for f in files])
+              for path, dirs, files in iso.walk_entries(rr_path='/')]
+    assert(walked == [('/', ['/dir1', '/dir2'], ['/sym']),
+                      ('/dir1', ['/dir1/subdir1'], ['/dir1/foo']),
+                      ('/dir1/subdir1', [], []),
+                      ('/dir2', [], [])])
+
+    for kwargs, name in (({'iso_path': '/DIR1'}, 'FOO.;1'),
+                         ({'rr_path': '/dir1'}, 'foo'),
+                         ({'joliet_path': '/dir1'}, 'foo'),
+                         ({'udf_path': '/dir1'}, 'foo')):
+        (path_unused, dirs, files) = next(iso.walk_entries(**kwargs))
+        assert(len(dirs) == 1)
+        assert(dirs[0].is_dir())
+        assert(len(files) == 1)
+        foo = files[0]
+        assert(foo.name == name)
+        assert(foo.is_file())
+        assert(foo.size == len(foostr))
+        assert(foo.extent == foo.inode.extent_location())
+        assert(foo.mtime is not None)
+        if 'joliet_path' in kwargs:
+            assert(foo.mode is None)
+        else:
+            assert(stat.S_ISREG(foo.mode))
+
+    (path_unused, dirs, files) = next(iso.walk_entries(rr_path='/'))
+    assert(files[0].is_symlink())
+    assert(not files[0].is_file())
+
+    # Pruning the directories stops the walk from going into them.
+    walked = []
+    for path, dirs, files in iso.walk_entries(iso_path='/'):
+        walked.append(path)
+        dirs[:] = [d for d in dirs if d.name != 'DIR1']
+    assert(walked == ['/', '/DIR2'])
+
+    with pytest.raises(pycdlib.pycdlibexception.PyCdlibInvalidInput) as excinfo:
+        next(iso.walk_entries(iso_path='/DIR1/FOO.;1'))
+    assert(str(excinfo.value) == 'Record is not a directory!')
+
+    iso.close()
+
+def test_new_scandir():
+    iso = pycdlib.PyCdlib()
+    iso.new(rock_ridge='1.09', joliet=3, udf='2.60')
+
+    iso.add_directory('/DIR1', rr_name='dir1', joliet_path='/dir1', udf_path='/dir1')
+    foostr = b'foo\n'
+    iso.add_fp(BytesIO(foostr), len(foostr), '/DIR1/FOO.;1', rr_name='foo',
+               joliet_path='/dir1/foo', udf_path='/dir1/foo')
+    iso.add_symlink('/SYM.;1', 'sym', 'dir1/foo')
+    iso.add_hard_link(iso_old_path='/DIR1/FOO.;1', iso_new_path='/BAR.;1',
+                      rr_name='bar')
+
+    entries = list(iso.scandir(namespace='rr'))
+    assert([e.path for e in entries] == ['/dir1', '/bar', '/sym', '/dir1/foo'])
+    (dir1, bar, sym, foo) = entries
+    assert(dir1.is_dir())
+    assert(foo.size == len(foostr))
+    assert(stat.S_ISREG(foo.mode))
+    assert(foo.uid == 0)
+    assert(foo.gid == 0)
+    assert(foo.nlink == 1)
+    assert(foo.inode is bar.inode)
+    assert(sym.is_symlink())
+    assert(sym.symlink_target == 'dir1/foo')
+    assert(foo.symlink_target is None)
+
+    entries = list(iso.scandir('/dir1', recursive=False, namespace='udf'))
+    assert([e.path for e in entries] == ['/dir1/foo'])
+    assert(entries[0].nlink == 1)
+    assert(entries[0].uid is None)
+
+    columns = iso.scandir(recursive=False, columnar=True)
+    assert(columns['name'] == ['DIR1', 'BAR.;1', 'SYM.;1'])
+    assert(columns['is_dir'] == [True, False, False])
+    assert(columns['is_symlink'] == [False, False, True])
+    assert(columns['size'][1] == len(foostr))
+
+    with pytest.raises(pycdlib.pycdlibexception.PyCdlibInvalidInput):
+        iso.scandir(namespace='bogus')
+
+    iso.close()
+
+def test_new_find_glob():
+    iso = pycdlib.PyCdlib()
+    iso.new(rock_ridge='1.09', joliet=3, udf='2.60')
+
+    iso.add_directory('/DIR1', rr_name='dir1', joliet_path='/dir1', udf_path='/dir1')
+    foostr = b'foo\n'
+    for name in ('foo', 'bar'):
+        iso.add_fp(BytesIO(foostr), len(foostr), '/DIR1/%s.;1' % (name.upper()),
+                   rr_name=name + '.rpm', joliet_path='/dir1/%s.rpm' % (name),
+                   udf_path='/dir1/%s.rpm' % (name))
+
+    assert(iso.find('*.;1') == ['/DIR1/BAR.;1', '/DIR1/FOO.;1'])
+    assert(iso.find('FOO.;1') == ['/DIR1/FOO.;1'])
+    assert(iso.find('foo*') == [])
+    for namespace in ('rr', 'joliet', 'udf'):
+        assert(iso.find('*.rpm', namespace) == ['/dir1/bar.rpm', '/dir1/foo.rpm'])
+        assert(iso.find('f*', namespace) == ['/dir1/foo.rpm'])
+        assert(iso.glob('/*/b*.rpm', namespace) == ['/dir1/bar.rpm'])
+        assert(iso.glob('/*.rpm', namespace) == [])
+
+    # The indices follow adds and removes once they are built.
+    iso.add_fp(BytesIO(foostr), len(foostr), '/FOO.;1', rr_name='foo.rpm',
+               joliet_path='/foo.rpm', udf_path='/foo.rpm')
+    iso.rm_file('/DIR1/FOO.;1', rr_name='foo.rpm', joliet_path='/dir1/foo.rpm',
+                udf_path='/dir1/foo.rpm')
+    assert(iso.find('FOO.;1') == ['/FOO.;1'])
+    for namespace in ('rr', 'joliet', 'udf'):
+        assert(iso.find('f*', namespace) == ['/foo.rpm'])
+        assert(iso.glob('/*.rpm', namespace) == ['/foo.rpm'])
+
+    with pytest.raises(pycdlib.pycdlibexception.PyCdlibInvalidInput):
+        iso.find('*', 'bogus')
+    with pytest.raises(pycdlib.pycdlibexception.PyCdlibInvalidInput):
+        iso.glob('*.rpm')
+
+    iso.close()
+
+def test_new_extent_owners():
+    iso = pycdlib.PyCdlib()
+    iso.new(rock_ridge='1.09', joliet=3, udf='2.60')
+
+    iso.add_directory('/DIR1', rr_name='dir1', joliet_path='/dir1', udf_path='/dir1')
+    foostr = b'foo\n' * 1024
+    iso.add_fp(BytesIO(foostr), len(foostr), '/DIR1/FOO.;1', rr_name='foo',
+               joliet_path='/dir1/foo', udf_path='/dir1/foo')
+    iso.add_fp(BytesIO(b'boot\n'), 5, '/BOOT.;1', rr_name='boot')
+    iso.add_eltorito('/BOOT.;1', '/BOOT.CAT;1', rr_bootcatname='boot.cat')
+
+    assert(iso.owner_of_extent(0).kind == 'system_area')
+    assert(iso.owner_of_extent(16).owner is iso.pvd)
+    assert(iso.owner_of_extent(257).kind == 'udf_descriptor')
+
+    rec = iso.get_record(iso_path='/DIR1/FOO.;1')
+    owner = iso.owner_of_extent(rec.extent_location() + 1)
+    assert(owner.kind == 'file')
+    assert(owner.owner is rec.inode)
+    assert(owner.start == rec.extent_location())
+    assert(owner.end == rec.extent_location() + 2)
+
+    dir_rec = iso.get_record(iso_path='/DIR1')
+    assert(iso.owner_of_extent(dir_rec.extent_location()) ==
+           (dir_rec.extent_location(), dir_rec.extent_location() + 1,
+            'directory', dir_rec))
+    udf_dir = iso.get_record(udf_path='/dir1')
+    assert(iso.owner_of_extent(udf_dir.extent_location()).owner is udf_dir)
+
+    kinds = set(owner.kind for owner in iso.owners_in_range(0, iso.pvd.space_size))
+    assert(kinds == set(['system_area', 'volume_descriptor', 'udf_descriptor',
+                         'udf_anchor', 'udf_file_entry', 'udf_directory',
+                         'path_table', 'directory', 'rr_continuation',
+                         'boot_catalog', 'boot', 'file']))
+    owners = iso.owners_in_range(0, iso.pvd.space_size)
+    for prev, owner in zip(owners, owners[1:]):
+        assert(prev.end <= owner.start)
+    assert(iso.owners_in_range(5, 5) == [])
+    assert(iso.owner_of_extent(iso.pvd.space_size) is None)
+
+    # The index is rebuilt once the extents move.
+    iso.rm_file('/DIR1/FOO.;1', rr_name='foo', joliet_path='/dir1/foo',
+                udf_path='/dir1/foo')
+    for owner in iso.owners_in_range(0, iso.pvd.space_size):
+        assert(owner.owner is not rec.inode)
+
+    with pytest.raises(pycdlib.pycdlibexception.PyCdlibInvalidInput):
+        iso.owners_in_range(2, 1)
+
+    iso.close()
+
+def test_new_full_path_cache():
+    iso = pycdlib.PyCdlib()
+    iso.new(rock_ridge='1.09', joliet=3, udf='2.60')
+
+    iso.add_directory('/DIR1', rr_name='dir1', joliet_path='/dir1', udf_path='/dir1')
+    iso.add_directory('/DIR1/SUBDIR1', rr_name='subdir1',
+                      joliet_path='/dir1/subdir1', udf_path='/dir1/subdir1')
+    foostr = b'foo\n'
+    iso.add_fp(BytesIO(foostr), len(foostr), '/DIR1/SUBDIR1/FOO.;1',
+               rr_name='foo', joliet_path='/dir1/subdir1/foo',
+               udf_path='/dir1/subdir1/foo')
+
+    rec = iso.get_record(iso_path='/DIR1/SUBDIR1/FOO.;1')
+    for i_unused in range(2):
+        assert(iso.full_path_from_dirrecord(rec) == '/DIR1/SUBDIR1/FOO.;1')
+        assert(iso.full_path_from_dirrecord(rec, rockridge=True) == '/dir1/subdir1/foo')
+    joliet_rec = iso.get_record(joliet_path='/dir1/subdir1/foo')
+    assert(iso.full_path_from_dirrecord(joliet_rec) == '/dir1/subdir1/foo')
+    udf_rec = iso.get_record(udf_path='/dir1/subdir1/foo')
+    assert(iso.full_path_from_dirrecord(udf_rec) == '/dir1/subdir1/foo')
+
+    # A record added in place of a removed one gets its own path.
+    iso.rm_file('/DIR1/SUBDIR1/FOO.;1', rr_name='foo',
+                joliet_path='/dir1/subdir1/foo', udf_path='/dir1/subdir1/foo')
+    iso.add_fp(BytesIO(foostr), len(foostr), '/DIR1/BAR.;1', rr_name='bar',
+               joliet_path='/dir1/bar', udf_path='/dir1/bar')
+    rec = iso.get_record(iso_path='/DIR1/BAR.;1')
+    assert(iso.full_path_from_dirrecord(rec) == '/DIR1/BAR.;1')
+    assert(iso.full_path_from_dirrecord(rec, rockridge=True) == '/dir1/bar')
+    udf_rec = iso.get_record(udf_path='/dir1/bar')
+    assert(iso.full_path_from_dirrecord(udf_rec) == '/dir1/bar')
+    assert(iso.full_path_from_dirrecord(iso.get_record(udf_path='/')) == '/')
+
+    iso.close()
+
+def test_new_collation_keys():
+    iso = pycdlib.PyCdlib()
+    iso.new(rock_ridge='1.09', joliet=3)
+
+    foostr = b'foo\n'
+    for name in ('ZZZ', 'AAA', 'MMM'):
+        iso.add_fp(BytesIO(foostr), len(foostr), '/%s.;1' % (name),
+                   rr_name=name.lower(), joliet_path='/%s' % (name.lower()))
+
+    for vd in (iso.pvd, iso.joliet_vd):
+        root = vd.root_directory_record()
+        assert(root.children == sorted(root.children))
+        assert([c.sort_key for c in root.children] ==
+               sorted(c.sort_key for c in root.children))
+        assert(root.children[0].is_dot())
+        assert(root.children[1].is_dotdot())
+
+    root = iso.pvd.root_directory_record()
+    assert([c.rock_ridge.name() for c in root.rr_children] == [b'aaa', b'mmm', b'zzz'])
+
+    iso.rm_file('/MMM.;1', rr_name='mmm', joliet_path='/mmm')
+    assert([c.rock_ridge.name() for c in root.rr_children] == [b'aaa', b'zzz'])
+    assert(iso.get_record(rr_path='/zzz').file_identifier() == b'ZZZ.;1')
+
+    iso.close()
+
+def test_new_list_children_batch():
+    iso = pycdlib.PyCdlib()
+    iso.new(rock_ridge='1.09', joliet=3)
+
+    iso.add_directory('/POOL', rr_name='pool', joliet_path='/pool')
+    foostr = b'foo\n'
+    for i in range(60):
+        rr_name = 'package-%d' % (i)
+        if i % 10 == 0:
+            # Long enough to need a Rock Ridge continuation area.
+            rr_name += 'x' * 200
+        iso.add_fp(BytesIO(foostr), len(foostr), '/POOL/P%d.;1' % (i),
+                   rr_name=rr_name, joliet_path='/pool/p%d' % (i))
+        iso.add_fp(BytesIO(foostr), len(foostr), '/R%d.;1' % (i),
+                   rr_name='root-%d' % (i))
+
+    out = BytesIO()
+    iso.write_fp(out)
+    iso.close()
+
+    def _pages(iso, count, **kwargs):
+        pages = []
+        offset = 0
+        while offset is not None:
+            batch = iso.list_children_batch(offset, count, **kwargs)
+            pages.append([(c.file_identifier(), c.rock_ridge and c.rock_ridge.name(),
+                           c.get_data_length()) for c in batch.children])
+            offset = batch.next_offset
+        return pages
+
+    for kwargs in ({'iso_path': '/POOL'}, {'rr_path': '/pool'},
+                   {'joliet_path': '/pool'}, {'iso_path': '/'}):
+        iso.open_fp(out)
+        expected = _pages(iso, 7, **kwargs)
+        full = [(c.file_identifier(), c.rock_ridge and c.rock_ridge.name(),
+                 c.get_data_length()) for c in iso.list_children(**kwargs)]
+        assert([entry for page in expected for entry in page] == full)
+        assert(len(expected) == (len(full) + 6) // 7)
+        iso.close()
+
+        # Reading the directory from the ISO gives the same pages, without
+        # reading the directory into the tree.
+        iso.open_fp(out, lazy=True)
+        assert(_pages(iso, 7, **kwargs) == expected)
+        if 'iso_path' in kwargs and kwargs['iso_path'] == '/POOL':
+            assert(len(iso.get_record(iso_path='/POOL').children) == 0)
+        iso.close()
+
+    iso.open_fp(out)
+    assert(iso.list_children_batch(1000000, iso_path='/POOL') == ([], None))
+    with pytest.raises(pycdlib.pycdlibexception.PyCdlibInvalidInput):
+        iso.list_children_batch(iso_path='/POOL/P1.;1')
+    with pytest.raises(pycdlib.pycdlibexception.PyCdlibInvalidInput):
+        iso.list_children_batch(0, 0, iso_path='/POOL')
+    with pytest.raises(pycdlib.pycdlibexception.PyCdlibInvalidInput):
+        iso.list_children_batch(udf_path='/pool')
+    iso.close()
+
+def test_new_list_children_batch_bad_padding():
+    iso = pycdlib.PyCdlib()
+    iso.new()
+
+    iso.add_directory('/POOL')
+    foostr = b'foo\n'
+    for i in range(3):
+        iso.add_fp(BytesIO(foostr), len(foostr), '/POOL/P%d.;1' % (i))
+
+    out = BytesIO()
+    iso.write_fp(out)
+    pool = iso.get_record(iso_path='/POOL')
+    pool_offset = pool.extent_location() * 2048
+    last = list(iso.list_children(iso_path='/POOL'))[-1]
+    pad_offset = pool_offset + last.offset_to_here + 4
+    iso.close()
+
+    # Put garbage in the padding after the last record of the directory.
+    data = bytearray(out.getvalue())
+    data[pad_offset] = 0x41
+    out = BytesIO(bytes(data))
+
+    iso.open_fp(out, lazy=True)
+    with pytest.raises(pycdlib.pycdlibexception.PyCdlibInvalidISO) as excinfo:
+        iso.list_children_batch(iso_path='/POOL')
+    assert(str(excinfo.value) == 'Invalid padding on ISO')
+    iso.close()
+
+def test_new_incremental_layout():
+    def _build(always_consistent):
+        iso = pycdlib.PyCdlib(always_consistent=always_consistent)
+        iso.new(rock_ridge='1.09', joliet=3)
+        iso.add_directory('/DIR1', rr_name='dir1', joliet_path='/dir1')
+        for i in range(20):
+            data = b'x' * (i * 1000)
+            iso.add_fp(BytesIO(data), len(data), '/DIR1/F%d.;1' % (i),
+                       rr_name='f%d' % (i), joliet_path='/dir1/f%d' % (i))
+        return iso
+
+    def _change(iso):
+        # Replacing files with others of the same name length keeps the
+        # directories the same size, so only the file data moves.
+        for i in (1, 4, 7):
+            iso.rm_file('/DIR1/F%d.;1' % (i), rr_name='f%d' % (i),
+                        joliet_path='/dir1/f%d' % (i))
+        for i in (1, 4, 7):
+            data = b'y' * (i * 700)
+            iso.add_fp(BytesIO(data), len(data), '/DIR1/G%d.;1' % (i),
+                       rr_name='g%d' % (i), joliet_path='/dir1/g%d' % (i))
+
+    iso = _build(True)
+    before = {}
+    for i in range(20):
+        rec = iso.get_record(iso_path='/DIR1/F%d.;1' % (i))
+        before[i] = rec.extent_location()
+    end = iso.pvd.space_size
+
+    _change(iso)
+
+    # None of the files that were left alone moved, and the new files went
+    # into the space given back by the removed ones.
+    for i in range(20):
+        if i not in (1, 4, 7):
+            rec = iso.get_record(iso_path='/DIR1/F%d.;1' % (i))
+            assert(rec.extent_location() == before[i])
+    assert(iso.get_record(iso_path='/DIR1/G1.;1').extent_location() == before[1])
+    assert(iso.pvd.space_size < end)
+
+    owners = iso.owners_in_range(0, 1000000)
+    for index in range(1, len(owners)):
+        assert(owners[index - 1].end <= owners[index].start)
+
+    out = BytesIO()
+    iso.write_fp(out)
+    iso.close()
+
+    # Writing lays the ISO out the same way as if it had never been
+    # consistent.
+    iso = _build(False)
+    _change(iso)
+    expected = BytesIO()
+    iso.write_fp(expected)
+    iso.close()
+
+    assert(out.getvalue() == expected.getvalue())
+
+    iso.open_fp(out)
+    data = BytesIO()
+    iso.get_file_from_iso_fp(data, iso_path='/DIR1/G7.;1')
+    assert(data.getvalue() == b'y' * 4900)
+    iso.close()
+
+def test_new_batch(monkeypatch):
+    # Every record is stamped with the current time, so keep it still.
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now)
+
+    def _add(iso):
+        iso.add_directory('/DIR1', rr_name='dir1', joliet_path='/dir1')
+        for i in range(30):
+            data = b'x' * (i * 300)
+            iso.add_fp(BytesIO(data), len(data), '/DIR1/F%d.;1' % (i),
+                       rr_name='f%d' % (i), joliet_path='/dir1/f%d' % (i))
+
+    def _remove(iso):
+        for i in range(0, 30, 4):
+            iso.rm_file('/DIR1/F%d.;1' % (i), rr_name='f%d' % (i),
+                        joliet_path='/dir1/f%d' % (i))
+
+    base = BytesIO()
+    iso = pycdlib.PyCdlib()
+    iso.new(rock_ridge='1.09', joliet=3, udf='2.60')
+    iso.write_fp(base)
+    iso.close()
+
+    expected = BytesIO()
+    iso.open_fp(base)
+    _add(iso)
+    _remove(iso)
+    iso.write_fp(expected)
+    iso.close()
+
+    for always_consistent in (False, True):
+        iso = pycdlib.PyCdlib(always_consistent=always_consistent)
+        iso.open_fp(base)
+        with iso.batch():
+            _add(iso)
+            with iso.batch():
+                _remove(iso)
+        out = BytesIO()
+        iso.write_fp(out)
+        assert(out.getvalue() == expected.getvalue())
+
+        # A batch that fails leaves the ISO as it was when the batch started.
+        with pytest.raises(pycdlib.pycdlibexception.PyCdlibInvalidInput):
+            with iso.batch():
+                data = b'y' * 5000
+                iso.add_fp(BytesIO(data), len(data), '/DIR1/NEW.;1',
+                           rr_name='new', joliet_path='/dir1/new')
+                iso.rm_file('/DIR1/F1.;1', rr_name='f1', joliet_path='/dir1/f1')
+                iso.add_directory('/DIR1', rr_name='dir1', joliet_path='/dir1')
+        with pytest.raises(pycdlib.pycdlibexception.PyCdlibInvalidInput):
+            iso.get_record(iso_path='/DIR1/NEW.;1')
+        assert(iso.get_record(joliet_path='/dir1/f1').get_data_length() == 300)
+        out = BytesIO()
+        iso.write_fp(out)
+        assert(out.getvalue() == expected.getvalue())
+
+        data = BytesIO()
+        iso.get_file_from_iso_fp(data, iso_path='/DIR1/F29.;1')
+        assert(data.getvalue() == b'x' * 8700)
+
+        # A batch that fails without rollback keeps, and accounts for, the
+        # changes made before the failure, except for those made in a batch
+        # inside of it that is rolled back.
+        with pytest.raises(ValueError):
+            with iso.batch(rollback=False):
+                data = b'y' * 5000
+                iso.add_fp(BytesIO(data), len(data), '/DIR1/NEW.;1',
+                           rr_name='new', joliet_path='/dir1/new')
+                with pytest.raises(ValueError):
+                    with iso.batch():
+                        iso.add_fp(BytesIO(data), len(data), '/DIR1/NEW2.;1',
+                                   rr_name='new2', joliet_path='/dir1/new2')
+                        raise ValueError('inner')
+                raise ValueError('stop')
+        with pytest.raises(pycdlib.pycdlibexception.PyCdlibInvalidInput):
+            iso.get_record(iso_path='/DIR1/NEW2.;1')
+        out = BytesIO()
+        iso.write_fp(out)
+        iso.close()
+
+        unbatched = pycdlib.PyCdlib(always_consistent=always_consistent)
+        unbatched.open_fp(base)
+        _add(unbatched)
+        _remove(unbatched)
+        unbatched.add_fp(BytesIO(data), len(data), '/DIR1/NEW.;1',
+                         rr_name='new', joliet_path='/dir1/new')
+        out2 = BytesIO()
+        unbatched.write_fp(out2)
+        unbatched.close()
+        assert(out.getvalue() == out2.getvalue())
+
+    iso = pycdlib.PyCdlib()
+    with pytest.raises(pycdlib.pycdlibexception.PyCdlibInvalidInput):
+        iso.batch()
+
+def test_new_add_fps(tmpdir, monkeypatch):
+    # Every record is stamped with the current time, so keep it still.
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now)
+
+    base = BytesIO()
+    iso = pycdlib.PyCdlib()
+    iso.new(rock_ridge='1.09', joliet=3, udf='2.60')
+    iso.add_directory('/DIR1', rr_name='dir1', joliet_path='/dir1',
+                      udf_path='/dir1')
+    iso.add_fp(BytesIO(b'old\n'), 4, '/DIR1/F50.;1', rr_name='f50',
+               joliet_path='/dir1/f50', udf_path='/dir1/f50')
+    iso.write_fp(base)
+    iso.close()
+
+    entries = []
+    for i in range(100):
+        data = b'x' * ((i * 37) % 3000)
+        rr_name = 'file-%d' % (i)
+        if i % 20 == 0:
+            # Long enough to need a Rock Ridge continuation area.
+            rr_name += 'y' * 200
+        entries.append((BytesIO(data), len(data), '/DIR1/F%d.;1' % (i * 7 % 101),
+                        rr_name, '/dir1/f%d' % (i * 7 % 101), None,
+                        '/dir1/f%d' % (i * 7 % 101)))
+    entries.append((BytesIO(b'root'), 4, '/ROOT.;1', 'root'))
+    entries = [entry for entry in entries if entry[2] != '/DIR1/F50.;1']
+
+    expected = BytesIO()
+    iso.open_fp(base)
+    for entry in entries:
+        entry[0].seek(0)
+        iso.add_fp(*entry)
+    iso.write_fp(expected)
+    iso.close()
+
+    for always_consistent in (False, True):
+        iso = pycdlib.PyCdlib(always_consistent=always_consistent)
+        iso.open_fp(base)
+        iso.add_fps(entries)
+        out = BytesIO()
+        iso.write_fp(out)
+        assert(out.getvalue() == expected.getvalue())
+
+        names = [c.file_identifier() for c in iso.list_children(iso_path='/DIR1')]
+        assert(names == sorted(names, key=lambda n: (n not in (b'.', b'..'), n)))
+        data = BytesIO()
+        iso.get_file_from_iso_fp(data, rr_path='/dir1/file-99')
+        assert(data.getvalue() == b'x' * (99 * 37 % 3000))
+
+        # Duplicates (against existing files or within the entries) are
+        # found before anything is added.
+        for dups in ([(BytesIO(b'a'), 1, '/DIR1/NEW.;1', 'new'),
+                      (BytesIO(b'b'), 1, '/DIR1/F50.;1', 'dup')],
+                     [(BytesIO(b'a'), 1, '/DIR1/NEW.;1', 'new'),
+                      (BytesIO(b'b'), 1, '/DIR1/NEW.;1', 'new2')],
+                     [(BytesIO(b'a'), 1, '/DIR1/NEW.;1', 'new', '/dir1/f50')],
+                     [(BytesIO(b'a'), 1, '/DIR1/NEW.;1', 'new', None, None,
+                       '/dir1/f50')],
+                     [(BytesIO(b'a'), 1, '/DIR1/NEW.;1', 'new', None, None,
+                       '/dir1/new'),
+                      (BytesIO(b'b'), 1, '/DIR1/NEW2.;1', 'new2', None, None,
+                       '/dir1/new')]):
+            with pytest.raises(pycdlib.pycdlibexception.PyCdlibInvalidInput):
+                iso.add_fps(dups)
+            with pytest.raises(pycdlib.pycdlibexception.PyCdlibInvalidInput):
+                iso.get_record(iso_path='/DIR1/NEW.;1')
+        iso.close()
+
+    with pytest.raises(pycdlib.pycdlibexception.PyCdlibInvalidInput):
+        iso.add_fps([])
+
+    # A UDF path that can't be added is found before any of the ISO9660 or
+    # Joliet directories are changed.
+    iso.new(udf='2.60', joliet=3)
+    with pytest.raises(pycdlib.pycdlibexception.PyCdlibInvalidInput):
+        iso.add_fps([(BytesIO(b'a'), 1, '/A.;1', None, '/a', None, '/a'),
+                     (BytesIO(b'b'), 1, '/B.;1', None, '/b', None, '/nodir/b')])
+    assert(len(list(iso.list_children(iso_path='/'))) == 2)
+    assert(len(list(iso.list_children(joliet_path='/'))) == 2)
+    iso.add_fps([(BytesIO(b'a'), 1, '/A.;1', None, '/a', None, '/a')])
+    out = BytesIO()
+    iso.write_fp(out)
+    iso.close()
+    iso.open_fp(out)
+    data = BytesIO()
+    iso.get_file_from_iso_fp(data, udf_path='/a')
+    assert(data.getvalue() == b'a')
+    iso.close()
+
+    indir = tmpdir.mkdir('addfiles')
+    for i in range(5):
+        indir.join('file%d' % (i)).write('data%d\n' % (i))
+    iso.new(joliet=3)
+    iso.add_files([(str(indir.join('file%d' % (i))), '/FILE%d.;1' % (i), None,
+                    '/file%d' % (i)) for i in reversed(range(5))])
+    data = BytesIO()
+    iso.get_file_from_iso_fp(data, joliet_path='/file3')
+    assert(data.getvalue() == b'data3\n')
+    with pytest.raises(pycdlib.pycdlibexception.PyCdlibInvalidInput):
+        iso.add_files([(str(indir.join('file0')),)])
+    iso.close()
+
+def test_new_add_tree(tmpdir, monkeypatch):
+    indir = tmpdir.mkdir('tree')
+    indir.join('README').write('readme\n')
+    indir.join('notes.txt').write('notes\n')
+    indir.join('Notes.TXT').write('other notes\n')
+    indir.join('build.log').write('log\n')
+    indir.join('secret.key').write('key\n')
+    sub = indir.mkdir('sub dir')
+    sub.join('a-very-long-file-name-that-needs-truncating.data').write('long\n')
+    sub.mkdir('.hidden').join('inside').write('inside\n')
+    deeper = sub.mkdir('deeper')
+    for i in range(3):
+        deeper.join('file%d.bin' % (i)).write('x' * (i * 1000))
+    os.symlink('README', str(indir.join('link')))
+
+    iso = pycdlib.PyCdlib()
+    iso.new(interchange_level=3, rock_ridge='1.09', joliet=3, udf='2.60')
+    iso.add_directory('/IMPORT', rr_name='import', joliet_path='/import',
+                      udf_path='/import')
+    iso.add_tree(str(indir), rr='/import', joliet='/import', udf='/import',
+                 filters={'all': ['*.log'], 'iso9660': ['secret.*'],
+                          'joliet': ['.hidden']})
+
+    assert(sorted([c.file_identifier() for c in iso.list_children(iso_path='/IMPORT')][2:]) ==
+           [b'NOTES.TXT;1', b'NOTES000.TXT;1', b'README.;1', b'SUB_DIR'])
+    assert(sorted([name for (name, is_dir, size) in pycdlib.pycdlib._list_local_dir(str(indir))]) ==
+           ['Notes.TXT', 'README', 'build.log', 'notes.txt', 'secret.key', 'sub dir'])
+
+    def _read(**kwargs):
+        out = BytesIO()
+        iso.get_file_from_iso_fp(out, **kwargs)
+        return out.getvalue()
+
+    assert(_read(rr_path='/import/Notes.TXT') == b'other notes\n')
+    assert(_read(iso_path='/IMPORT/NOTES000.TXT;1') == b'notes\n')
+    assert(_read(rr_path='/import/sub dir/deeper/file2.bin') == b'x' * 2000)
+    assert(_read(joliet_path='/import/sub dir/deeper/file1.bin') == b'x' * 1000)
+    assert(_read(udf_path='/import/sub dir/.hidden/inside') == b'inside\n')
+    assert(_read(rr_path='/import/sub dir/.hidden/inside') == b'inside\n')
+    assert(_read(iso_path='/IMPORT/SUB_DIR/A_VERY_LONG_FILE_NAME_THAT_NEE.;1') == b'long\n')
+
+    # The filtered entries are left out of just the namespaces they are
+    # filtered from.
+    assert(_read(joliet_path='/import/secret.key') == b'key\n')
+    assert(_read(udf_path='/import/secret.key') == b'key\n')
+    for kwargs in ({'rr_path': '/import/secret.key'},
+                   {'udf_path': '/import/build.log'},
+                   {'joliet_path': '/import/sub dir/.hidden'},
+                   {'rr_path': '/import/link'}):
+        with pytest.raises(pycdlib.pycdlibexception.PyCdlibInvalidInput):
+            iso.get_record(**kwargs)
+
+    out = BytesIO()
+    iso.write_fp(out)
+    iso.close()
+
+    iso.open_fp(out)
+    assert(_read(joliet_path='/import/README') == b'readme\n')
+    assert(_read(udf_path='/import/sub dir/deeper/file2.bin') == b'x' * 2000)
+    iso.close()
+
+    # Interchange level 1 names are 8.3, ISO9660 names are numbered to avoid
+    # the ones already in use, and a failure leaves the ISO as it was.
+    iso.new(joliet=3)
+    iso.add_tree(str(sub), joliet='/')
+    assert(sorted([c.file_identifier() for c in iso.list_children(iso_path='/')][2:]) ==
+           [b'A_VERY_L.;1', b'DEEPER', b'_HIDDEN'])
+    iso.rm_file('/A_VERY_L.;1', joliet_path='/a-very-long-file-name-that-needs-truncating.data')
+    iso.add_tree(str(deeper))
+    assert(sorted([c.file_identifier() for c in iso.list_children(iso_path='/')][2:]) ==
+           [b'DEEPER', b'FILE0.BIN;1', b'FILE1.BIN;1', b'FILE2.BIN;1', b'_HIDDEN'])
+    with pytest.raises(pycdlib.pycdlibexception.PyCdlibInvalidInput):
+        iso.add_tree(str(sub), joliet='/')
+    assert(sorted([c.file_identifier() for c in iso.list_children(iso_path='/')][2:]) ==
+           [b'DEEPER', b'FILE0.BIN;1', b'FILE1.BIN;1', b'FILE2.BIN;1', b'_HIDDEN'])
+    with pytest.raises(pycdlib.pycdlibexception.PyCdlibInvalidInput):
+        iso.get_record(joliet_path='/a-very-long-file-name-that-needs-truncating.data')
+    with pytest.raises(pycdlib.pycdlibexception.PyCdlibInvalidInput):
+        iso.add_tree(str(sub), udf='/')
+    with pytest.raises(pycdlib.pycdlibexception.PyCdlibInvalidInput):
+        iso.add_tree(str(deeper.join('file0.bin')))
+    with pytest.raises(pycdlib.pycdlibexception.PyCdlibInvalidInput):
+        iso.add_tree(str(sub), filters={'rr': ['*']})
+    iso.close()
+
+    # At interchange levels 2 and 3, the name and the extension together are
+    # at most 30 characters.
+    longdir = tmpdir.mkdir('long')
+    longdir.join('b' * 40 + '.txt').write('long\n')
+    iso.new(interchange_level=3)
+    iso.add_tree(str(longdir))
+    assert([c.file_identifier() for c in iso.list_children(iso_path='/')][2:] ==
+           [b'B' * 27 + b'.TXT;1'])
+    iso.close()
+
+    # A name that clashes deep in the tree is found before anything is added,
+    # without saving the ISO to roll it back.
+    clash = tmpdir.mkdir('clash')
+    clash.join('first').write('first\n')
+    inner = clash.mkdir('inner')
+    inner.join('c' * 64 + '1').write('one\n')
+    inner.join('c' * 64 + '2').write('two\n')
+    copy_metadata = pycdlib.pycdlib._copy_metadata
+    monkeypatch.setattr(pycdlib.pycdlib, '_copy_metadata', None)
+    iso.new(joliet=3)
+    with pytest.raises(pycdlib.pycdlibexception.PyCdlibInvalidInput):
+        iso.add_tree(str(clash), joliet='/')
+    assert(len(list(iso.list_children(iso_path='/'))) == 2)
+    assert(len(list(iso.list_children(joliet_path='/'))) == 2)
+    monkeypatch.setattr(pycdlib.pycdlib, '_copy_metadata', copy_metadata)
+
+    # A failure after some of the tree has been added is rolled back.
+    def _fail(*args):
+        raise ValueError('stop')
+    with monkeypatch.context() as m:
+        m.setattr(pycdlib.PyCdlib, '_add_fps', _fail)
+        with pytest.raises(ValueError):
+            iso.add_tree(str(clash))
+    assert(len(list(iso.list_children(iso_path='/'))) == 2)
+    assert(len(list(iso.list_children(joliet_path='/'))) == 2)
+
+    iso.add_tree(str(clash))
+    assert(len(list(iso.list_children(iso_path='/INNER'))) == 4)
+    iso.close()
+
+
+def test_new_clone(tmpdir, monkeypatch):
+    # The variants are compared byte for byte, so don't let the timestamps of
+    # the records that they add differ.
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now)
+
+    base = BytesIO()
+    iso = pycdlib.PyCdlib()
+    iso.new(interchange_level=3, rock_ridge='1.09', joliet=3, udf='2.60')
+    for name in ('CONFIG', 'OTHER'):
+        data = name.encode('utf-8') * 1000
+        iso.add_fp(BytesIO(data), len(data), '/%s.TXT;1' % (name),
+                   rr_name=name.lower(), joliet_path='/%s' % (name.lower()),
+                   udf_path='/%s' % (name.lower()))
+    iso.write_fp(base)
+    iso.close()
+
+    def _customize(variant, customer):
+        data = b'customer %d\n' % (customer)
+        variant.rm_file('/CONFIG.TXT;1', rr_name='config',
+                        joliet_path='/config', udf_path='/config')
+        variant.add_fp(BytesIO(data), len(data), '/CONFIG.TXT;1',
+                       rr_name='config', joliet_path='/config',
+                       udf_path='/config')
+
+    def _write(variant):
+        out = BytesIO()
+        variant.write_fp(out)
+        return out.getvalue()
+
+    # What each variant should come out as, opening the base every time.
+    expected = []
+    for customer in range(4):
+        iso.open_fp(BytesIO(base.getvalue()))
+        _customize(iso, customer)
+        expected.append(_write(iso))
+        iso.close()
+
+    iso.open_fp(BytesIO(base.getvalue()))
+    clones = [iso.clone() for i_unused in range(4)]
+    for customer, variant in enumerate(clones):
+        _customize(variant, customer)
+
+    results = [None] * len(clones)
+
+    def _run(index):
+        results[index] = _write(clones[index])
+
+    threads = [threading.Thread(target=_run, args=(i,)) for i in range(len(clones))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert(results == expected)
+
+    # The original is left alone by the changes to its clones.
+    out = BytesIO()
+    iso.get_file_from_iso_fp(out, udf_path='/config')
+    assert(out.getvalue() == b'CONFIG' * 1000)
+    assert(_write(iso) == _write(iso.clone()))
+    iso.close()
+
+    # A clone of an ISO that the object opened itself has its own copy of the
+    # file, so it keeps working once the original is closed.
+    isofile = str(tmpdir.join('base.iso'))
+    with open(isofile, 'wb') as fp:
+        fp.write(base.getvalue())
+    iso.open(isofile)
+    variant = iso.clone()
+    iso.close()
+    _customize(variant, 0)
+    assert(_write(variant) == expected[0])
+    variant.close()
+
+    with pytest.raises(pycdlib.pycdlibexception.PyCdlibInvalidInput):
+        iso.clone()
+    iso.new()
+    with pytest.raises(pycdlib.pycdlibexception.PyCdlibInvalidInput):
+        with iso.batch():
+            iso.clone()
+    iso.close()
+
+def test_new_clone_no_parse():
+    iso = pycdlib.PyCdlib()
+    iso.new(rock_ridge='1.09', joliet=3, udf='2.60')
+    for d in range(10):
+        iso.add_directory('/D%d' % (d), rr_name='d%d' % (d),
+                          joliet_path='/d%d' % (d), udf_path='/d%d' % (d))
+    iso.add_fps([(BytesIO(b'x'), 1, '/D%d/F%d.;1' % (i % 10, i), 'f%d' % (i),
+                  '/d%d/f%d' % (i % 10, i), None, '/d%d/f%d' % (i % 10, i))
+                 for i in range(1000)])
+    out = BytesIO()
+    iso.write_fp(out)
+    iso.close()
+
+    # Opening the ISO reads and parses all of it; a clone neither reads nor
+    # parses anything.
+    stats = pycdlib.PyCdlibStats()
+    iso = pycdlib.PyCdlib(stats=stats)
+    iso.open_fp(out)
+    assert(stats.reads > 0)
+    assert(stats.records_parsed > 2000)
+    assert(stats.inodes_created == 1000)
+    stats.reset()
+    clone = iso.clone()
+    assert((stats.seeks, stats.reads, stats.records_parsed, stats.inodes_created) == (0, 0, 0, 0))
+    assert(len(clone.inodes) == len(iso.inodes))
+    clone.close()
+    iso.close()